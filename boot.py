@@ -1,2 +1,25 @@
+import board
+import digitalio
+import os
+import storage
 import supervisor
-supervisor.runtime.autoreload = False
\ No newline at end of file
+
+supervisor.runtime.autoreload = False
+
+# The schedule caches in /cache (lib/schedule_cache.py, lib/season_schedule.py) need a
+# writable filesystem, and the MatrixPortal S3 has no SD card slot, so CIRCUITPY is made
+# writable for code.py. It is then read-only over USB: hold UP while the board resets to
+# keep it writable from the computer instead (the caches then only live in memory).
+CACHE_DIR = "/cache"
+
+up_button = digitalio.DigitalInOut(board.BUTTON_UP)
+up_button.switch_to_input(pull=digitalio.Pull.UP)
+if up_button.value:
+    storage.remount("/", readonly=False)
+    try:
+        os.mkdir(CACHE_DIR)
+    except OSError:
+        pass  # already there
+else:
+    print("UP held: CIRCUITPY stays writable over USB, schedule caches will not be saved")
+up_button.deinit()
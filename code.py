@@ -4,6 +4,7 @@ Adafruit Scoreboard for 64 pixel LED
 """
 
 import time
+import asyncio
 import wifi
 import microcontroller
 import board
@@ -12,9 +13,12 @@ import keypad
 from logo_bitmaps import *
 from API_Connection import *
 from draw_tools import *
-from logos import *
 from buffer_frame import *
 from controller_server import *
+from scene import *
+from poll_scheduler import *
+from game_state import *
+from metrics import *
 
 
 # WiFi credentials.
@@ -41,9 +45,21 @@ if not sync_time(pool):
 
 server, server_state = run_server()
 
-DELAY_SECS = 30
-LIVE_POLL_SECS = 20
-SCHED_POLL_SECS = 300
+DELAY_SECS = 30              # default stream delay; /delay on the control server changes it
+SYNC_INTERVAL = 3600  # 1 hour
+SYNC_RETRIES = 3
+SYNC_RETRY_SECS = 2
+
+# UP and DOWN move the menu highlight; holding either for MENU_HOLD_SECS picks the team.
+buttons = keypad.Keys((board.BUTTON_UP, board.BUTTON_DOWN), value_when_pressed=False, pull=True)
+BUTTON_UP_KEY = 0
+MENU_HOLD_SECS = 1.0
+
+# Task timing
+FRAME_SECS = 0.1             # renderer frame budget
+CLOCK_SECS = 0.1             # how often the clock task reads the game clock
+CONTROL_SECS = 0.05          # control server poll interval
+NETWORK_IDLE_SECS = 0.25     # how often the network task checks for a due poll
 
 # Debug controls
 DEBUG = True
@@ -65,262 +81,235 @@ class TimeFrame:
         self.period = period
 
 
-# Draws the current TimeFrame using the draw_tools methods.
-def draw_frame(frame: TimeFrame):
-    home = frame.team
-    draw_logo(home, 0, 0, 0)
-    opp = team_from_string(frame.opponent.lower())
-    if opp is not None:
-        draw_logo(opp, 0, 0, 1)
-
-    draw_score(frame.home_score, frame.away_score)
-    draw_clock(frame.clock)
-
-    draw_columns(background_bitmap, 0, 32, 64, 4)   # type: ignore
-    draw_columns(background_bitmap, 32, 32, 64, 3)  # type: ignore
-    draw_row_singular(decal_bitmap, 64, 46, 2)      # type: ignore
-
-    draw_quarter(frame.period)
-
-TEAM_ABBRS = [
-    "ATL","BKN","BOS","CHA","CHI","CLE","DAL","DEN","DET",
-    "GSW","HOU","IND","LAC","LAL","MEM","MIA","MIL","MIN",
-    "NOP","NYK","OKC","ORL","PHI","PHX","POR","SAC","SAS",
-    "TOR","UTA","WAS"
-]
-
-ABBR_TO_TEAMKEY = {
-    "ATL": hawks,
-    "BKN": nets,
-    "BOS": celtics,
-    "CHA": hornets,
-    "CHI": bulls,
-    "CLE": cavaliers,
-    "DAL": mavericks,
-    "DEN": nuggets,
-    "DET": pistons,
-    "GSW": warriors,
-    "HOU": rockets,
-    "IND": pacers,
-    "LAC": clippers,
-    "LAL": lakers,
-    "MEM": grizzlies,
-    "MIA": heat,
-    "MIL": bucks,
-    "MIN": timberwolves,
-    "NOP": pelicans,
-    "NYK": knicks,
-    "OKC": thunder,
-    "ORL": magic,
-    "PHI": sixers,
-    "PHX": suns,
-    "POR": trail_blazers,
-    "SAC": kings,
-    "SAS": spurs,
-    "TOR": raptors,
-    "UTA": jazz,
-    "WAS": wizards,
-}
-
-# Main loop for displaying team schedules and active games.
-team_name = ""
-menu_active = False
-
-# hibernate mode that reactivates when the API request comes in.
-server.poll()
-hibernate = True
-
-if server_state["power"] == "on":
-    hibernate = False
-    menu_active = True
-
-while hibernate:
-    response = server.poll()
-    if server_state["power"] == "on":
-        hibernate = False
-        menu_active = True
-        break
-    else:
-        hibernate = True
-
-while menu_active:
-    server.poll()
-
-    if server_state["team"] != None:
-        team_key = server_state["team"]
-        if team_key:
-            team = ABBR_TO_TEAMKEY[team_key]
-            server_state["team"] = None
-            break
-
-    if server_state["power"] == "off":
-        microcontroller.reset()
-    draw_city_menu()
-
-clear_area(letter_bitmap, 0, 0, 64, 64)
+# Draws the current TimeFrame through the scene, which only repaints the widgets that changed.
+board_scene = scene()
 
-last_api_call = 0.0
-last_tick = time.monotonic()
-last_dbg = 0.0
-
-latest_frame = None
-target_secs = None
-display_secs = None
-
-home_score = None
-away_score = None
-opponent_str = None 
-clock_str = None
-game_time = None
-game_status = None 
-period = None
-in_game = None
-
-date_str = None
-time_str = None
-next_team_full = None
-next_opp_full = None
-
-frame_present = False
-
-next_tick = time.monotonic() + 1.0
-
-# Initial fetch
-t0 = time.monotonic()
-print("break-point: 1")
-try:
-    if team == sixers:
-        team.team_name = "76ers"
-    home_score, away_score, opponent_str, clock_str, game_time, game_status, period = fetch_game(team.team_name)
-    print("break-point: 2")
-    t1 = time.monotonic()
-    print("Fetched game, values gathered: ", home_score, away_score, opponent_str, clock_str, game_time, game_status, period)
-
-    latest_frame = TimeFrame(team, home_score, away_score, opponent_str, clock_str, game_time, game_status, period)
-    print(latest_frame.team.team_name)
-    target_secs = clock_str_to_secs(clock_str)
-except Exception as e:
-    print("Live fetch had no games", e)
-
-if target_secs is not None:
-    display_secs = target_secs
-
-if latest_frame == None:
-    print("Falling back to next scheduled game:")
-    date_str, time_str, next_team_full, next_opp_full = get_next_game(team.team_name)
-    in_game = False
-elif latest_frame.game_status in (1, 2):
-    in_game = True
-else:
-    in_game = False
-    date_str = get_current_date()
-    time_str = latest_frame.game_time
-    next_team_full = latest_frame.team.team_name
-    next_opp_full = latest_frame.opponent
-
-last_sync = time.monotonic()
-SYNC_INTERVAL = 3600  # 1 hour
-
-while True:
-    if time.monotonic() - last_sync > SYNC_INTERVAL:
-        sync_time(pool)
-        last_sync = time.monotonic()
-    server.poll()        
-    now = time.monotonic()
+def draw_frame(frame: TimeFrame):
+    start_ns = time.monotonic_ns()
+    drawn = board_scene.draw_frame(frame)
+    timers["draw_frame"].stop(start_ns)
+    return drawn
+
+# Picks the time of the next scoreboard poll from the state fetch_game() just returned.
+poller = poll_scheduler()
+
+def next_poll_time(now, game_status, period, clock_str):
+    delay = poller.next_poll_in(game_status, period, clock_str_to_secs(clock_str),
+                                last_scoreboard["game_time_utc"], last_scoreboard["meta_time"], now_utc())
+    if DBG_EVERY_API:
+        print("next poll in", delay, "s:", poller.reason)
+        print("scoreboard requests:", fetch_stats["requests"], "body bytes:", fetch_stats["body_bytes"],
+              "parses skipped:", fetch_stats["parses_skipped"])
+        print("connects:", http.stats["connects"], "reuses:", http.stats["reuses"],
+              "reconnects:", http.stats["reconnects"], "handshake s:", http.stats["handshake_secs"],
+              "transfer s:", http.stats["transfer_secs"])
+    return now + delay
+
+# Shared by the tasks below.
+state = game_state(DELAY_SECS)
+
+# Control server and buttons: power, team selection, broadcast delay. Responds every
+# CONTROL_SECS, even mid-game.
+async def control_task(state):
+    # When each button went down, None while it is up.
+    pressed_at = [None, None]
+    while True:
+        start_ns = time.monotonic_ns()
+        server.poll()
+        timers["server_poll"].stop(start_ns)
+
+        event = buttons.events.get()
+        while event is not None:
+            held_since = pressed_at[event.key_number]
+            if event.pressed:
+                pressed_at[event.key_number] = time.monotonic()
+            else:
+                pressed_at[event.key_number] = None
+                if held_since is not None and state.mode == MODE_MENU:
+                    if time.monotonic() - held_since >= MENU_HOLD_SECS:
+                        state.select_team(find_team(TEAM_ABBRS[state.menu_idx]))
+                    else:
+                        step = -1 if event.key_number == BUTTON_UP_KEY else 1
+                        state.highlight((state.menu_idx + step) % len(TEAM_ABBRS))
+            event = buttons.events.get()
+
+        if server_state["power"] == "off":
+            if state.mode != MODE_OFF:
+                microcontroller.reset()
+        elif state.mode == MODE_OFF:
+            state.set_mode(MODE_MENU)
 
-    if now - last_sync > 14400:  # 4 hours
-        microcontroller.reset()
+        if server_state["delay"] is not None:
+            state.set_delay(server_state["delay"])
+            server_state["delay"] = None
 
-    if in_game:
-        # Poll API occasionally
-        if now - last_api_call > LIVE_POLL_SECS:
-            last_api_call = now
-            if server_state["power"] == "off":
-                microcontroller.reset()
-            if latest_frame.team == sixers:
-                latest_frame.team.team_name = "76ers"
-            fetch_start = time.monotonic()
-            home_score, away_score, opponent_str, clock_str, game_time, game_status, period = fetch_game(latest_frame.team.team_name)
-            fetch_end = time.monotonic()
-            fetch_dt = fetch_end - fetch_start
-
-            latest_frame = TimeFrame(team, home_score, away_score, opponent_str, clock_str, game_time, game_status, period)
-            last_api_call = now
-
-            api_secs = clock_str_to_secs(clock_str)
-            if api_secs is not None:
-                old_target = target_secs
-                target_secs = api_secs
-                if display_secs is None:
-                    display_secs = target_secs + DELAY_SECS
-
-            if game_status < 1:
-                in_game = False
-                date_str, time_str, next_team_full, next_opp_full = get_next_game(latest_frame.team.team_name)
-
-        # Local 1Hz tick
-        if display_secs is not None and target_secs is not None:
-            # If behind the scheduled tick time, only decrement by 1 per loop iteration.
-            if now >= next_tick:
-                if display_secs > (target_secs):
-                    display_secs -= 1
-                next_tick += 1.0
-
-                # If we were stalled for a long time, don't try to "burn down" multiple seconds instantly.
-                # Instead, re-anchor next_tick close to now to prevent burst skipping.
-                if next_tick < now - 0.25:
-                    next_tick = now + 0.75
-
-        if latest_frame is not None and display_secs is not None:
-            latest_frame.clock = secs_to_mmss(display_secs)
-            draw_frame(latest_frame)
-
-    else:
-        if now - last_api_call > SCHED_POLL_SECS:
-            if server_state["power"] == "off":
-                microcontroller.reset()
-            try:
-                fetch_start = time.monotonic()
-                home_score, away_score, opponent_str, clock_str, game_time, game_status, period = fetch_game(team.team_name)
-                fetch_end = time.monotonic()
-                fetch_dt = fetch_end - fetch_start
-                last_api_call = now
-
-                if game_status >= 1:
-                    latest_frame = TimeFrame(team.team_name, home_score, away_score, opponent_str, clock_str, game_time, game_status, period)
-                    target_secs = clock_str_to_secs(clock_str)
-                    if target_secs is not None:
-                        display_secs = target_secs + DELAY_SECS
-                    last_tick = now
-                    in_game = True
-            except Exception as e:
-                print("Live fetch had no games", e)
-                
-        print("Future game loop")
-        # game_time_as_secs = clock_str_to_secs(game_time)
-        # print(game_time_as_secs)
-        # if game_time_as_secs - now == 60:
-        #    countdown = True
-        # else:
-        countdown = False
-        date_str, time_str, next_team_full, next_opp_full = get_next_game(team.team_name)
-        
+        team_key = server_state["team"]
+        if team_key and state.mode != MODE_OFF:
+            server_state["team"] = None
+            team = find_team(team_key)
+            if team is not None:
+                state.select_team(team)
+            else:
+                print("Unknown team:", team_key)
+
+        await asyncio.sleep(CONTROL_SECS)
+
+# Runs a scoreboard_fetch a step at a time, yielding to the other tasks between steps.
+async def fetch_stepped(team):
+    fetch = scoreboard_fetch(team)
+    render_stats["fetching"] = True
+    render_stats["fetch_max_gap"] = 0.0
+    render_stats["fetch_steps"] = 0
+    while not fetch.step():
+        render_stats["fetch_steps"] += 1
+        await asyncio.sleep(0)
+    note_render_gap(time.monotonic())
+    render_stats["fetching"] = False
+    return fetch.result()
+
+# Applies a fetch_game() result, or looks up the team's next scheduled game when it has none
+# on today's board. A failed fetch keeps the board as it is and is retried soon.
+async def poll_game(state, now, result):
+    if result == FETCH_ERROR:
+        state.next_poll = now + poller.retry_in()
+        print("Scoreboard fetch failed, next poll in", state.next_poll - now, "s:", poller.reason)
+        return
+
+    if result is None:
+        print("Live fetch had no games")
+        poller.failed_polls = 0
+        state.next_poll = now + SCHED_POLL_SECS
+
+        team = state.team
+        date_str, time_str, next_team_full, next_opp_full = await get_next_game(team.team_name)
+        if state.team is not team:
+            return  # another team was picked while this one was looked up
         if next_team_full is None:
             print("Could not fetch next game, skipping draw")
-            time.sleep(60)
-            continue
-
+            state.next_poll = now + 60
+            return
         if time_str and time_str.strip() == "Final":
             time_str = "12:00"
-
-        draw_delay = 5000
-        while draw_delay > 0:
-            server.poll()
-            draw_future_game(date_str, time_str, next_team_full, next_opp_full, countdown)
-            draw_delay -= 1
+        state.apply_next_game((date_str, time_str, next_team_full, next_opp_full))
+        return
+
+    home_score, away_score, opponent_str, clock_str, game_time, game_status, period = result
+    frame = TimeFrame(state.team, home_score, away_score, opponent_str, clock_str, game_time, game_status, period)
+    state.apply_game(frame, clock_str_to_secs(clock_str), last_scoreboard["meta_time"])
+    state.next_poll = next_poll_time(now, game_status, period, clock_str)
+
+# Network: NTP resync and scoreboard polls when the poll scheduler says they are due. A failed
+# resync is tried again SYNC_RETRY_SECS later, up to SYNC_RETRIES times, instead of sleeping here.
+async def network_task(state):
+    last_sync = time.monotonic()
+    sync_tries = 0
+    next_sync_try = 0.0
+    while True:
+        now = time.monotonic()
+        if now - last_sync > SYNC_INTERVAL and now >= next_sync_try:
+            sync_tries += 1
+            if try_sync_time(pool) or sync_tries >= SYNC_RETRIES:
+                last_sync = time.monotonic()
+                sync_tries = 0
+            else:
+                next_sync_try = time.monotonic() + SYNC_RETRY_SECS
+
+        if now - last_sync > 14400:  # 4 hours
+            microcontroller.reset()
+
+        if state.mode == MODE_GAME and now >= state.next_poll:
             if server_state["power"] == "off":
                 microcontroller.reset()
-
-        draw_columns(background_bitmap, 0, 32, 64, 4)   # type: ignore
-        draw_columns(background_bitmap, 32, 32, 64, 3)  # type: ignore
-        draw_row_singular(decal_bitmap, 64, 46, 2)      # type: ignore
\ No newline at end of file
+            team = state.team
+            start_ns = time.monotonic_ns()
+            result = await fetch_stepped(team.team_name)
+            timers["fetch"].stop(start_ns)
+            if state.team is team:
+                await poll_game(state, now, result)
+            fetch_dt = time.monotonic() - now
+            if DEBUG and fetch_dt > DBG_WARN_FETCH_SLOW:
+                print("slow poll:", fetch_dt, "s")
+            if DBG_EVERY_API:
+                print("fetch steps:", render_stats["fetch_steps"], "max display gap during fetch:",
+                      render_stats["fetch_max_gap"], "s")
+
+        await asyncio.sleep(NETWORK_IDLE_SECS)
+
+# Clock: reads the game clock model every CLOCK_SECS; state.tick() marks a new second.
+# The model runs on time.monotonic_ns(), so a stalled task catches up on its next read.
+async def clock_task(state):
+    while True:
+        now = time.monotonic()
+        note_render_gap(now)
+        render_stats["last_tick"] = now
+        state.tick()
+        await asyncio.sleep(CLOCK_SECS)
+
+# Renderer: draws when the state changes and sleeps until the next change. A frame that is up
+# stays on the display, so a menu or a next game is drawn once and then costs nothing. Frames
+# are at least FRAME_SECS apart, so a burst of changes is drawn once.
+async def render_task(state):
+    shown_mode = MODE_OFF
+    shown_next_game = None
+    # The delayed board, filled from state's display_* fields.
+    shown = TimeFrame(None, 0, 0, None, "", "", 0, 0)
+    shown_secs = None
+    last_dbg = 0.0
+    while True:
+        await state.dirty.wait()
+        state.dirty.clear()
+        start = time.monotonic()
+        start_ns = time.monotonic_ns()
+
+        if state.mode == MODE_MENU:
+            if shown_mode != MODE_MENU:
+                draw_city_menu()
+            draw_selector(state.menu_idx)
+
+        elif state.mode == MODE_GAME:
+            if shown_mode != MODE_GAME:
+                hide_city_menu()
+                board_scene.invalidate()
+
+            if state.in_game and state.frame is not None and state.display_secs is not None:
+                if shown_next_game is not None:
+                    board_scene.invalidate()
+                    shown_next_game = None
+                if state.display_secs != shown_secs:
+                    shown_secs = state.display_secs
+                    shown.clock = secs_to_mmss(shown_secs)
+                shown.team = state.frame.team
+                shown.opponent = state.frame.opponent
+                shown.home_score = state.display_home
+                shown.away_score = state.display_away
+                shown.period = state.display_period
+                shown.game_status = state.display_status
+                draw_frame(shown)
+
+                if DEBUG and start - last_dbg >= DBG_EVERY_SEC:
+                    last_dbg = start
+                    print("frames:", board_scene.frames, "dirty px:", board_scene.dirty_pixels,
+                          "avg dirty px:", board_scene.total_dirty_pixels // board_scene.frames)
+
+            elif state.next_game is not None and state.next_game != shown_next_game:
+                # The future game is drawn outside the scene: start it on blank layers, and the
+                # live frame repaints in full after it (see above).
+                board_scene.invalidate()
+                date_str, time_str, next_team_full, next_opp_full = state.next_game
+                draw_future_game(date_str, time_str, next_team_full, next_opp_full, False)
+                shown_next_game = state.next_game
+
+        shown_mode = state.mode
+        timers["render_pass"].stop(start_ns)
+        sample_heap()
+        await asyncio.sleep(max(0.0, FRAME_SECS - (time.monotonic() - start)))
+
+async def main():
+    await asyncio.gather(
+        asyncio.create_task(control_task(state)),
+        asyncio.create_task(network_task(state)),
+        asyncio.create_task(clock_task(state)),
+        asyncio.create_task(render_task(state)),
+    )
+
+asyncio.run(main())
@@ -1,9 +1,91 @@
-class buffer_frame:
-    def __init__(self, team_name, home_score, away_score, opponent_str, clock, game_time, game_status):
-        self.team_name = team_name
-        self.home_score = home_score
-        self.away_score = away_score
-        self.opponent_str = opponent_str
-        self.clock = clock
-        self.game_time = game_time
-        self.game_status = game_status
+"""
+Library for playing the scoreboard back behind a delayed broadcast
+=======================================================================================
+
+A stream of the game runs 30 to 90 seconds behind the live scoreboard, so a board showing
+the API's state spoils every basket. frame_buffer keeps a ring of the board's live state
+(scores, clock, period, status) stamped with monotonic time, and the board shows the entry
+that was live 'delay' ago. Until there is that much history it holds the oldest entry.
+
+The ring is a set of preallocated arrays, one per field, so recording and playback do not
+allocate. An entry is only recorded when something on it changes, which is at most once a
+second while the clock runs, so FRAME_BUFFER_SIZE entries cover MAX_DELAY_SECS with room
+to spare.
+
+Author(s): Michael Ladderbush
+"""
+
+import time
+from array import array
+
+FRAME_BUFFER_SIZE = 160
+MAX_DELAY_SECS = 120
+
+# Stored for an unknown clock.
+NO_CLOCK = -1
+
+# Monotonic time in ms.
+def monotonic_ms():
+    return time.monotonic_ns() // 1000000
+
+class frame_buffer:
+    def __init__(self, size=FRAME_BUFFER_SIZE):
+        self.size = size
+        self.times = array("l", [0] * size)
+        self.home_score = array("h", [0] * size)
+        self.away_score = array("h", [0] * size)
+        self.clock = array("h", [0] * size)
+        self.period = bytearray(size)
+        self.status = bytearray(size)
+        self.clear()
+
+    # Forgets the history, e.g. when the team changes.
+    def clear(self):
+        self.origin_ms = monotonic_ms()
+        self.start = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    # Ring slot of the k-th oldest entry.
+    def slot(self, k):
+        return (self.start + k) % self.size
+
+    # Records the live state at 'now_ms' unless it matches the newest entry.
+    def record(self, now_ms, home_score, away_score, clock, period, status):
+        if clock is None:
+            clock = NO_CLOCK
+        if self.count:
+            i = self.slot(self.count - 1)
+            if (self.home_score[i] == home_score and self.away_score[i] == away_score and
+                    self.clock[i] == clock and self.period[i] == period and self.status[i] == status):
+                return
+        if self.count == self.size:
+            i = self.start
+            self.start = self.slot(1)
+        else:
+            i = self.slot(self.count)
+            self.count += 1
+        self.times[i] = now_ms - self.origin_ms
+        self.home_score[i] = home_score
+        self.away_score[i] = away_score
+        self.clock[i] = clock
+        self.period[i] = period
+        self.status[i] = status
+
+    # Slot of the newest entry recorded at or before 'now_ms' - 'delay_ms', the oldest entry
+    # if there is none that old yet, or -1 when the buffer is empty.
+    def playback(self, now_ms, delay_ms):
+        if not self.count:
+            return -1
+        target = now_ms - delay_ms - self.origin_ms
+        low = 0
+        high = self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self.times[self.slot(mid)] <= target:
+                low = mid + 1
+            else:
+                high = mid
+        return self.slot(max(low - 1, 0))
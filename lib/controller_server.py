@@ -3,8 +3,9 @@ import socketpool
 import board
 import digitalio
 from adafruit_httpserver import Server, Request, Response
+from metrics import metrics_json, metrics_prometheus
 
-server_state = {"power": "off", "team":None}
+server_state = {"power": "off", "team":None, "delay":None}
 
 def run_server():
 
@@ -36,11 +37,20 @@ def run_server():
             <input id="teamBox" placeholder="Enter Team (ex: BOS)">
             <button onclick="setTeam()">Set Team</button>
 
+            <br><br>
+
+            <input id="delayBox" placeholder="Stream delay (seconds)">
+            <button onclick="setDelay()">Set Delay</button>
+
             <script>
             function setTeam(){
                 let t = document.getElementById("teamBox").value;
                 fetch("/team?name=" + t);
             }
+            function setDelay(){
+                let d = document.getElementById("delayBox").value;
+                fetch("/delay?secs=" + d);
+            }
             </script>
 
         </body>
@@ -68,6 +78,24 @@ def run_server():
         return Response(request, f"Team set to {name}")
 
 
+    @server.route("/delay")
+    def delay(request: Request):
+        try:
+            secs = int(request.query_params.get("secs"))
+        except (TypeError, ValueError):
+            return Response(request, "Delay must be whole seconds")
+        server_state["delay"] = secs
+        return Response(request, f"Delay set to {secs}s")
+
+
+    # Stage timings and heap watermarks. JSON by default, ?format=prometheus for a scraper.
+    @server.route("/metrics")
+    def metrics(request: Request):
+        if request.query_params.get("format") == "prometheus":
+            return Response(request, metrics_prometheus(), content_type="text/plain; version=0.0.4")
+        return Response(request, metrics_json(), content_type="application/json")
+
+
     # ---------- START SERVER ----------
     server.start(str(wifi.radio.ipv4_address))
 
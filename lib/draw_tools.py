@@ -8,119 +8,106 @@ Author(s): Michael Ladderbush
 from adafruit_matrixportal.matrix import Matrix
 import displayio
 import board
+import os
 import time
 from logo_bitmaps import *
-from logos import *
+from logo_assets import *
+from glyphs import *
+from teams import *
 from buffer_frame import *
 import re
 
-class nba_team:
-    def __init__(self, team_name, bitmap, palette, pattern):
-        self.team_name = team_name
-        self.bitmap = bitmap
-        self.palette = palette
-        self.pattern = pattern
-
-# Eastern Conference teams
-hawks = nba_team("Hawks", hawks_logo_bitmap, hawks_logo_palette, hawks_pattern)
-celtics = nba_team("Celtics", celtics_logo_bitmap, celtics_logo_palette, celtics_pattern)
-nets = nba_team("Nets", nets_logo_bitmap, nets_logo_palette, nets_pattern)
-hornets = nba_team("Hornets", hornets_logo_bitmap, hornets_logo_palette, hornets_pattern)
-bulls = nba_team("Bulls", bulls_logo_bitmap, bulls_logo_palette, bulls_pattern)
-cavaliers = nba_team("Cavaliers", cavaliers_logo_bitmap, cavaliers_logo_palette, cavaliers_pattern)
-pistons = nba_team("Pistons", pistons_logo_bitmap, pistons_logo_palette, pistons_pattern)
-pacers = nba_team("Pacers", pacers_logo_bitmap, pacers_logo_palette, pacers_pattern)
-heat = nba_team("Heat", heat_logo_bitmap, heat_logo_palette, heat_pattern)
-bucks = nba_team("Bucks", bucks_logo_bitmap, bucks_logo_palette, bucks_pattern)
-knicks = nba_team("Knicks", knicks_logo_bitmap, knicks_logo_palette, knicks_pattern)
-magic = nba_team("Magic", magic_logo_bitmap, magic_logo_palette, magic_pattern)
-sixers = nba_team("Sixers", sixers_logo_bitmap, sixers_logo_palette, sixers_pattern)
-raptors = nba_team("Raptors", raptors_logo_bitmap, raptors_logo_palette, raptors_pattern)
-wizards = nba_team("Wizards", wizards_logo_bitmap, wizards_logo_palette, wizards_pattern)
-
-# Western Conference teams
-mavericks = nba_team("Mavericks", mavericks_logo_bitmap, mavericks_logo_palette, mavericks_pattern)
-nuggets = nba_team("Nuggets", nuggets_logo_bitmap, nuggets_logo_palette, nuggets_pattern)
-warriors = nba_team("Warriors", warriors_logo_bitmap, warriors_logo_palette, warriors_pattern)
-rockets = nba_team("Rockets", rockets_logo_bitmap, rockets_logo_palette, rockets_pattern)
-clippers = nba_team("Clippers", clippers_logo_bitmap, clippers_logo_palette, clippers_pattern)
-lakers = nba_team("Lakers", lakers_logo_bitmap, lakers_logo_palette, lakers_pattern)
-grizzlies = nba_team("Grizzlies", grizzlies_logo_bitmap, grizzlies_logo_palette, grizzlies_pattern)
-timberwolves = nba_team("Timberwolves", timberwolves_logo_bitmap, timberwolves_logo_palette, timberwolves_pattern)
-pelicans = nba_team("Pelicans", pelicans_logo_bitmap, pelicans_logo_palette, pelicans_pattern)
-thunder = nba_team("Thunder", thunder_logo_bitmap, thunder_logo_palette, thunder_pattern)
-suns = nba_team("Suns", suns_logo_bitmap, suns_logo_palette, suns_pattern)
-trail_blazers = nba_team("Trail_blazers", trail_blazers_logo_bitmap, trail_blazers_logo_palette, trail_blazers_pattern)
-kings = nba_team("Kings", kings_logo_bitmap, kings_logo_palette, kings_pattern)
-spurs = nba_team("Spurs", spurs_logo_bitmap, spurs_logo_palette, spurs_pattern)
-jazz = nba_team("Jazz", jazz_logo_bitmap, jazz_logo_palette, jazz_pattern)
-
-# Helper to assign team with just a name.
-def team_from_string(team_name) -> nba_team:
-    teams = {
-        "hawks": hawks,
-        "celtics": celtics,
-        "nets": nets,
-        "hornets": hornets,
-        "bulls": bulls,
-        "cavaliers": cavaliers,
-        "mavericks": mavericks,
-        "nuggets": nuggets,
-        "pistons": pistons,
-        "warriors": warriors,
-        "rockets": rockets,
-        "pacers": pacers,
-        "lakers": lakers,
-        "clippers": clippers,
-        "grizzlies": grizzlies,
-        "heat": heat,
-        "bucks": bucks,
-        "timberwolves": timberwolves,
-        "pelicans": pelicans,
-        "knicks": knicks,
-        "thunder": thunder,
-        "magic": magic,
-        "sixers": sixers,
-        "suns": suns,
-        "blazers": trail_blazers,
-        "kings": kings,
-        "spurs": spurs,
-        "raptors": raptors,
-        "jazz": jazz,
-        "wizards": wizards
-    }
-
-    opponent_team = teams.get(team_name)
-
-    return opponent_team
+try:
+    import bitmaptools
+except ImportError:
+    bitmaptools = None
 
 # Draws a pixel on the given bitmap at the specified (x, y) coordinate using the provided color.
 def draw_pixel(bitmap, x, y, my_color):
     bitmap[x, y] = my_color
 
+# Blit engine.
+# Every drawing helper below is built on these three primitives, which work on whole
+# rectangles. On the device they hand the work to bitmaptools in one native call; without
+# bitmaptools they fall back to row by row writes through the flat bitmap index.
+
+# Fills the w x h rectangle at (x, y) with a single palette index.
+def rect_fill(bitmap, x, y, w, h, my_color):
+    if w <= 0 or h <= 0:
+        return
+    if bitmaptools is not None:
+        bitmaptools.fill_region(bitmap, x, y, x + w, y + h, my_color)
+        return
+
+    stride = bitmap.width
+    for row in range(y, y + h):
+        base = row * stride
+        for index in range(base + x, base + x + w):
+            bitmap[index] = my_color
+
+# Copies a w x h pattern of palette indexes (one byte per pixel, row by row) to (x, y).
+# Zeros are copied too, so the pattern's background replaces what was there.
+def blit_pattern(bitmap, x, y, w, h, pattern):
+    if bitmaptools is not None:
+        bitmaptools.arrayblit(bitmap, pattern, x, y, x + w, y + h)
+        return
+
+    stride = bitmap.width
+    i = 0
+    for row in range(y, y + h):
+        base = row * stride + x
+        for index in range(base, base + w):
+            bitmap[index] = pattern[i]
+            i += 1
+
+# Same as blit_pattern but pixels equal to 'skip_index' are left untouched.
+def blit_pattern_masked(bitmap, x, y, w, h, pattern, skip_index=0):
+    if bitmaptools is not None:
+        bitmaptools.arrayblit(bitmap, pattern, x, y, x + w, y + h, skip_index)
+        return
+
+    stride = bitmap.width
+    i = 0
+    for row in range(y, y + h):
+        base = row * stride + x
+        for index in range(base, base + w):
+            value = pattern[i]
+            if value != skip_index:
+                bitmap[index] = value
+            i += 1
+
+# Decodes a run-length packed pattern (see logo_assets.py) straight into the bitmap at (x, y).
+# Every byte is one run inside a row, so the pattern becomes a series of row fills.
+def draw_packed_pattern(bitmap, x, y, width, packed):
+    col = 0
+    row = y
+    for run in packed:
+        length = (run >> 4) + 1
+        rect_fill(bitmap, x + col, row, length, 1, run & 0x0F)
+        col += length
+        if col >= width:
+            col = 0
+            row += 1
+
 # Draws a horizontal row of pixels on the given bitmap.
 # The row starts at the left edge and spans 'length' pixels at the specified y coordinate using the given color.
 def draw_row_singular(bitmap, length, y, my_color):
-    for x in range(length):
-        draw_pixel(bitmap, x, y, my_color)
+    rect_fill(bitmap, 0, y, length, 1, my_color)
 
 # Draws multiple horizontal rows on the given bitmap.
 # Starting at 'start_loc', 'num_rows' rows are drawn, each spanning 'length' pixels, in the specified color.
 def draw_rows(bitmap, start_loc, num_rows, length, my_color):
-    for row in range(start_loc, start_loc + num_rows):
-        draw_row_singular(bitmap, length, row, my_color)
+    rect_fill(bitmap, 0, start_loc, length, num_rows, my_color)
 
 # Draws a vertical column of pixels on the given bitmap.
 # The column spans 'length' pixels at the specified x coordinate using the provided color.
 def draw_column_singular(bitmap, length, x, my_color):
-    for y in range(length):
-        draw_pixel(bitmap, x, y, my_color)
+    rect_fill(bitmap, x, 0, 1, length, my_color)
 
 # Draws multiple vertical columns on the given bitmap.
 # Starting at 'start_loc', 'num_columns' columns are drawn, each spanning 'length' pixels, in the specified color.
 def draw_columns(bitmap, start_loc, num_columns, length, my_color):
-    for column in range(start_loc, start_loc + num_columns):
-        draw_column_singular(bitmap, length, column, my_color)
+    rect_fill(bitmap, start_loc, 0, num_columns, length, my_color)
 
 # Scales a flat pattern by repeating each pixel value according to the specified scale factor.
 # Returns the scaled pattern along with the new width and height.
@@ -141,30 +128,29 @@ def scale_pattern(pattern, original_width, original_height, scale):
 # Draws a sprite on the given bitmap.
 # The sprite is defined by its width, height, scale (size), pattern, and palette.
 # The pattern is first scaled; then each non-zero value in the scaled pattern is drawn on the bitmap.
+# With draw_bg the zero pixels are painted with 'bg_index' instead of being skipped.
 def draw_sprite(bitmap, x, y, width, height, size, pattern, palette, bg_index=0, draw_bg=False):
-    scaled_pattern, new_width, new_height = scale_pattern(pattern, width, height, size)
-
     if len(pattern) != width * height:
         raise ValueError("Pattern length doesn't match sprite dimensions")
 
-    for row in range(new_height):
-        for col in range(new_width):
-            index = row * new_width + col
-            pattern_index_value = scaled_pattern[index]
-
-            if pattern_index_value == 0:
-                if draw_bg:
-                    bitmap[x + col, y + row] = bg_index
-                continue
-            if pattern_index_value > 0:
-                bitmap[x + col, y + row] = pattern_index_value  # Assign index, not hex color
-            else:
-                raise ValueError(f"Pattern index {pattern_index_value} out of range (0-{bitmap.colors - 1})")
-
-# Draws a cube on the given bitmap by creating a pattern filled with ones and then calling draw_sprite.
+    if size == 1:
+        scaled_pattern, new_width, new_height = pattern, width, height
+    else:
+        scaled_pattern, new_width, new_height = scale_pattern(pattern, width, height, size)
+    # Patterns hold palette indexes, not hex colors; bytes() rejects anything outside 0-255.
+    if not isinstance(scaled_pattern, (bytes, bytearray)):
+        scaled_pattern = bytes(scaled_pattern)
+
+    if draw_bg and bg_index == 0:
+        blit_pattern(bitmap, x, y, new_width, new_height, scaled_pattern)
+        return
+    if draw_bg:
+        rect_fill(bitmap, x, y, new_width, new_height, bg_index)
+    blit_pattern_masked(bitmap, x, y, new_width, new_height, scaled_pattern, 0)
+
+# Draws a cube on the given bitmap as a solid rectangle of palette index 1.
 def draw_cube(bitmap, x, y, width, height, size, palette):
-    cube_pattern = [1] * (width * height)
-    draw_sprite(bitmap, x, y, width, height, size, cube_pattern, palette, bg_index=0, draw_bg=True)
+    rect_fill(bitmap, x, y, width * size, height * size, 1)
 
 # Draws a triangle on the given bitmap.
 # The triangle can be rendered with two different reflections, controlled by the 'reflection' parameter.
@@ -189,574 +175,304 @@ def draw_triangle(bitmap, x, y, width, height, size, reflection, palette):
         
         draw_sprite(bitmap, x, y, width, height, size, triangle_pattern, palette, bg_index=0, draw_bg=True)
 
-# Draws a number on the display by mapping the digit to its corresponding drawing function.
+# Glyph atlas.
+# The patterns live in glyphs.py. Each glyph is scaled once per size and the result cached
+# as bytes, so drawing the same digit again is just a copy into the bitmap.
+_glyph_cache = {}
+
+DIGIT_GLYPHS = ("0", "1", "2", "3", "4", "5", "6", "7", "8", "9")
+
+# Returns the glyph scaled by 'size' as (width, height, pattern), building it on first use.
+def get_glyph(glyph, size):
+    cache = _glyph_cache.get(size)
+    if cache is None:
+        cache = {}
+        _glyph_cache[size] = cache
+
+    scaled = cache.get(glyph)
+    if scaled is None:
+        width, height, pattern = GLYPHS[glyph]
+        if size == 1:
+            scaled = (width, height, pattern)
+        else:
+            new_pattern, new_width, new_height = scale_pattern(pattern, width, height, size)
+            scaled = (new_width, new_height, bytes(new_pattern))
+        cache[glyph] = scaled
+    return scaled
+
+# Draws a glyph from the atlas on the given bitmap, background included.
+def draw_glyph(bitmap, glyph, x, y, size):
+    width, height, pattern = get_glyph(glyph, size)
+    blit_pattern(bitmap, x, y, width, height, pattern)
+
+# Draws a number on the display using the digit glyphs. Anything other than 0-9 draws a zero.
 def draw_number(number, x, y, size):
-    def get_number(number):
-        return {
-            1: lambda: draw_one(x, y, size),
-            2: lambda: draw_two(x, y, size),
-            3: lambda: draw_three(x, y, size),
-            4: lambda: draw_four(x, y, size),
-            5: lambda: draw_five(x, y, size),
-            6: lambda: draw_six(x, y, size),
-            7: lambda: draw_seven(x, y, size),
-            8: lambda: draw_eight(x, y, size),
-            9: lambda: draw_nine(x, y, size)
-        }.get(number, lambda: draw_zero(x, y, size))()
-    
-    get_number(number)
+    draw_glyph(decal_bitmap, digit_glyph(number), x, y, size)
 
-# Draws a colon on the display using a predefined pattern.
+# Draws a colon on the display using its atlas glyph.
 def draw_colon(x, y, size):
-    pattern = (
-        0, 0, 0,
-        0, 2, 0,
-        0, 0, 0,
-        0, 2, 0,
-        0, 0, 0,
-    )
-
-    draw_sprite(decal_bitmap, x, y, 3, 5, size, pattern, decal_palette, bg_index=0, draw_bg=True)
+    draw_glyph(decal_bitmap, "colon", x, y, size)
 
-# Draws a dash on the display using a predefined pattern.
+# Draws a dash on the display using its atlas glyph.
 def draw_dash(x, y, size):
-    pattern = (
-        0, 0, 0,
-        0, 0, 2,
-        0, 2, 0,
-        2, 0, 0,
-        0, 0, 0,
-    )
-
-    draw_sprite(decal_bitmap, x, y, 3, 5, size, pattern, decal_palette, bg_index=0, draw_bg=True)
+    draw_glyph(decal_bitmap, "dash", x, y, size)
 
 # Draws a hyphen on the display.
 def draw_hyphen(x, y, size):
-    pattern = (
-        0, 0, 0,
-        0, 0, 0,
-        0, 2, 2,
-        0, 0, 0,
-        0, 0, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 3, 5, size, pattern, decal_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "hyphen", x, y, size)
 
-# Draws the digit '0' on the display using a predefined pattern.
+# Draws the digit '0' on the display using its atlas glyph.
 def draw_zero(x, y, size):
-    pattern = (
-        0, 2, 2, 2,
-        0, 2, 0, 2,
-        0, 2, 0, 2,
-        0, 2, 0, 2,
-        0, 2, 2, 2,
-    )
-
-    draw_sprite(decal_bitmap, x, y, 4, 5, size, pattern, decal_palette, bg_index=0, draw_bg=True)
+    draw_glyph(decal_bitmap, "0", x, y, size)
 
-# Draws the digit '1' on the display using a predefined pattern.
+# Draws the digit '1' on the display using its atlas glyph.
 def draw_one(x, y, size):
-    pattern = (
-        0, 0, 2, 0,
-        0, 2, 2, 0,
-        0, 0, 2, 0,
-        0, 0, 2, 0,
-        0, 2, 2, 2,
-    )
+    draw_glyph(decal_bitmap, "1", x, y, size)
 
-    draw_sprite(decal_bitmap, x, y, 4, 5, size, pattern, decal_palette, bg_index=0, draw_bg=True)
-
-# Draws the digit '2' on the display using a predefined pattern.
+# Draws the digit '2' on the display using its atlas glyph.
 def draw_two(x, y, size):
-    pattern = (
-        0, 2, 2, 2,
-        0, 0, 0, 2,
-        0, 2, 2, 2,
-        0, 2, 0, 0,
-        0, 2, 2, 2,
-    )
-
-    draw_sprite(decal_bitmap, x, y, 4, 5, size, pattern, decal_palette, bg_index=0, draw_bg=True)
+    draw_glyph(decal_bitmap, "2", x, y, size)
 
-# Draws the digit '3' on the display using a predefined pattern.
+# Draws the digit '3' on the display using its atlas glyph.
 def draw_three(x, y, size):
-    pattern = (
-        0, 2, 2, 2,
-        0, 0, 0, 2,
-        0, 0, 2, 2,
-        0, 0, 0, 2,
-        0, 2, 2, 2,
-    )
-
-    draw_sprite(decal_bitmap, x, y, 4, 5, size, pattern, decal_palette, bg_index=0, draw_bg=True)
+    draw_glyph(decal_bitmap, "3", x, y, size)
 
-# Draws the digit '4' on the display using a predefined pattern.
+# Draws the digit '4' on the display using its atlas glyph.
 def draw_four(x, y, size):
-    pattern = (
-        0, 2, 0, 2,
-        0, 2, 0, 2,
-        0, 2, 2, 2,
-        0, 0, 0, 2,
-        0, 0, 0, 2,
-    )
+    draw_glyph(decal_bitmap, "4", x, y, size)
 
-    draw_sprite(decal_bitmap, x, y, 4, 5, size, pattern, decal_palette, bg_index=0, draw_bg=True)
-
-# Draws the digit '5' on the display using a predefined pattern.
+# Draws the digit '5' on the display using its atlas glyph.
 def draw_five(x, y, size):
-    pattern = (
-        0, 2, 2, 2,
-        0, 2, 0, 0,
-        0, 2, 2, 2,
-        0, 0, 0, 2,
-        0, 2, 2, 2,
-    )
-
-    draw_sprite(decal_bitmap, x, y, 4, 5, size, pattern, decal_palette, bg_index=0, draw_bg=True)
+    draw_glyph(decal_bitmap, "5", x, y, size)
 
-# Draws the digit '6' on the display using a predefined pattern.
+# Draws the digit '6' on the display using its atlas glyph.
 def draw_six(x, y, size):
-    pattern = (
-        0, 2, 2, 2,
-        0, 2, 0, 0,
-        0, 2, 2, 2,
-        0, 2, 0, 2,
-        0, 2, 2, 2,
-    )
-
-    draw_sprite(decal_bitmap, x, y, 4, 5, size, pattern, decal_palette, bg_index=0, draw_bg=True)
+    draw_glyph(decal_bitmap, "6", x, y, size)
 
-# Draws the digit '7' on the display using a predefined pattern.
+# Draws the digit '7' on the display using its atlas glyph.
 def draw_seven(x, y, size):
-    pattern = (
-        0, 2, 2, 2,
-        0, 0, 0, 2,
-        0, 0, 2, 0,
-        0, 0, 2, 0,
-        0, 0, 2, 0,
-    )
+    draw_glyph(decal_bitmap, "7", x, y, size)
 
-    draw_sprite(decal_bitmap, x, y, 4, 5, size, pattern, decal_palette, bg_index=0, draw_bg=True)
-
-# Draws the digit '8' on the display using a predefined pattern.
+# Draws the digit '8' on the display using its atlas glyph.
 def draw_eight(x, y, size):
-    pattern = (
-        0, 2, 2, 2,
-        0, 2, 0, 2,
-        0, 2, 2, 2,
-        0, 2, 0, 2,
-        0, 2, 2, 2,
-    )
-
-    draw_sprite(decal_bitmap, x, y, 4, 5, size, pattern, decal_palette, bg_index=0, draw_bg=True)
+    draw_glyph(decal_bitmap, "8", x, y, size)
 
-# Draws the digit '9' on the display using a predefined pattern.
+# Draws the digit '9' on the display using its atlas glyph.
 def draw_nine(x, y, size):
-    pattern = (
-        0, 2, 2, 2,
-        0, 2, 0, 2,
-        0, 2, 2, 2,
-        0, 0, 0, 2,
-        0, 0, 0, 2,
-    )
-
-    draw_sprite(decal_bitmap, x, y, 4, 5, size, pattern, decal_palette, bg_index=0, draw_bg=True)
+    draw_glyph(decal_bitmap, "9", x, y, size)
 
-# Draws the letter 'A' on the display using a predefined pattern.
+# Draws the letter 'A' on the display using its atlas glyph.
 def draw_A(x, y, size):
-    pattern = (
-        0, 2, 2, 2,
-        0, 2, 0, 2,
-        0, 2, 2, 2,
-        0, 2, 0, 2,
-        0, 2, 0, 2,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "A", x, y, size)
 
 def draw_a(x, y, size):
-    pattern = (
-        0, 2, 2, 0,
-        0, 0, 2, 0,
-        2, 2, 2, 0,
-        2, 0, 2, 0,
-        2, 2, 2, 2,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "a", x, y, size)
 
 def draw_B(x, y, size):
-    pattern = (
-        2, 2, 0, 0,
-        2, 0, 2, 0,
-        2, 2, 0, 0,
-        2, 0, 2, 0,
-        2, 2, 0, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "B", x, y, size)
 
 def draw_C(x, y, size):
-    pattern = (
-        2, 2, 2, 0,
-        2, 0, 0, 0,
-        2, 0, 0, 0,
-        2, 0, 0, 0,
-        2, 2, 2, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "C", x, y, size)
 
 def draw_D(x, y, size):
-    pattern = (
-        2, 2, 0, 0,
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-        2, 2, 0, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "D", x, y, size)
 
 def draw_d(x, y, size):
-    pattern = (
-        0, 0, 2, 0,
-        0, 0, 2, 0,
-        2, 2, 2, 0,
-        2, 0, 2, 0,
-        2, 2, 2, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "d", x, y, size)
 
 def draw_E(x, y, size):
-    pattern = (
-        2, 2, 2, 0,
-        2, 0, 0, 0,
-        2, 2, 2, 0,
-        2, 0, 0, 0,
-        2, 2, 2, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "E", x, y, size)
 
 def draw_f(x, y, size):
-    pattern = (
-        0, 2, 2, 0,
-        0, 2, 0, 0,
-        2, 2, 2, 0,
-        0, 2, 0, 0,
-        0, 2, 0, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "f", x, y, size)
 
 def draw_G(x, y, size):
-    pattern = (
-        0, 2, 2, 0,
-        2, 0, 0, 0,
-        2, 0, 2, 2,
-        2, 0, 0, 2,
-        0, 2, 2, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "G", x, y, size)
 
 def draw_H(x, y, size):
-    pattern = (
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-        2, 2, 2, 0,
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "H", x, y, size)
 
 def draw_h(x, y, size):
-    pattern = (
-        2, 0, 0, 0,
-        2, 0, 0, 0,
-        2, 2, 2, 0,
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "h", x, y, size)
 
 def draw_I(x, y, size):
-    pattern = (
-        2, 2, 2, 0,
-        0, 2, 0, 0,
-        0, 2, 0, 0,
-        0, 2, 0, 0,
-        2, 2, 2, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "I", x, y, size)
 
 def draw_K(x, y, size):
-    pattern = (
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-        2, 2, 0, 0,
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "K", x, y, size)
 
 def draw_L(x, y, size):
-    pattern = (
-        2, 0, 0, 0,
-        2, 0, 0, 0,
-        2, 0, 0, 0,
-        2, 0, 0, 0,
-        2, 2, 2, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "L", x, y, size)
 
 def draw_l(x, y, size):
-    pattern = (
-        2, 0, 0, 0,
-        2, 0, 0, 0,
-        2, 0, 0, 0,
-        2, 0, 0, 0,
-        2, 0, 0, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "l", x, y, size)
 
 def draw_M(x, y, size):
-    pattern = (
-        2, 0, 0, 0, 2,
-        2, 2, 0, 2, 2,
-        2, 0, 2, 0, 2,
-        2, 0, 0, 0, 2,
-        2, 0, 0, 0, 2,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 5, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "M", x, y, size)
 
 def draw_N(x, y, size):
-    pattern = (
-        2, 0, 0, 2,
-        2, 2, 0, 2,
-        2, 2, 2, 2,
-        2, 0, 2, 2,
-        2, 0, 0, 2,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "N", x, y, size)
 
 def draw_n(x, y, size):
-    pattern = (
-        0, 0, 0, 0,
-        0, 0, 0, 0,
-        2, 2, 2, 0,
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "n", x, y, size)
 
 def draw_O(x, y, size):
-    pattern = (
-        2, 2, 2, 0,
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-        2, 2, 2, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "O", x, y, size)
 
 def draw_P(x, y, size):
-    pattern = (
-        2, 2, 2, 0,
-        2, 0, 2, 0,
-        2, 2, 2, 0,
-        2, 0, 0, 0,
-        2, 0, 0, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "P", x, y, size)
 
 def draw_p(x, y, size):
-    pattern = (
-        0, 2, 2, 2,
-        0, 2, 0, 2,
-        0, 2, 2, 2,
-        0, 2, 0, 0,
-        0, 2, 0, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "p", x, y, size)
 
 def draw_r(x, y, size):
-    pattern = (
-        0, 0, 0, 0,
-        0, 0, 0, 0,
-        2, 2, 0, 0,
-        2, 0, 0, 0,
-        2, 0, 0, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "r", x, y, size)
 
 def draw_R(x, y, size):
-    pattern = (
-        2, 2, 2, 0,
-        2, 0, 2, 0,
-        2, 2, 0, 0,
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "R", x, y, size)
 
 def draw_S(x, y, size):
-    pattern = (
-        0, 2, 2, 0,
-        2, 0, 0, 0,
-        2, 2, 0, 0,
-        0, 0, 2, 0,
-        2, 2, 0, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "S", x, y, size)
 
 def draw_s(x, y, size):
-    pattern = (
-        0, 0, 0, 0,
-        0, 2, 0, 0,
-        2, 0, 0, 0,
-        0, 2, 0, 0,
-        2, 0, 0, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "s", x, y, size)
 
 def draw_T(x, y, size):
-    pattern = (
-        2, 2, 2, 0,
-        0, 2, 0, 0,
-        0, 2, 0, 0,
-        0, 2, 0, 0,
-        0, 2, 0, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "T", x, y, size)
 
 def draw_t(x, y, size):
-    pattern = (
-        0, 2, 0, 0,
-        0, 2, 0, 0,
-        2, 2, 2, 0,
-        0, 2, 0, 0,
-        0, 2, 0, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "t", x, y, size)
 
 def draw_U(x, y, size):
-    pattern = (
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-        0, 2, 0, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)    
+    draw_glyph(letter_bitmap, "U", x, y, size)
 
 def draw_W(x, y, size):
-    pattern = (
-        2, 0, 0, 0, 2,
-        2, 0, 0, 0, 2,
-        2, 0, 2, 0, 2,
-        2, 0, 2, 0, 2,
-        0, 2, 0, 2, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 5, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "W", x, y, size)
 
 def draw_X(x, y, size):
-    pattern = (
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-        0, 2, 0, 0,
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)
+    draw_glyph(letter_bitmap, "X", x, y, size)
 
 def draw_Y(x, y, size):
-    pattern = (
-        2, 0, 2, 0,
-        2, 0, 2, 0,
-        0, 2, 0, 0,
-        0, 2, 0, 0,
-        0, 2, 0, 0,
-    )
-
-    draw_sprite(letter_bitmap, x, y, 4, 5, size, pattern, letter_palette, bg_index=0, draw_bg=True)   
+    draw_glyph(letter_bitmap, "Y", x, y, size)
 
 def draw_blank_number(x, y, size):
-    pattern = (
-        0, 0, 0, 0,
-        0, 0, 0, 0,
-        0, 0, 0, 0,
-        0, 0, 0, 0,
-        0, 0, 0, 0,
-    )
-    draw_sprite(decal_bitmap, x, y, 4, 5, size, pattern, decal_palette, bg_index=0, draw_bg=True)
+    draw_glyph(decal_bitmap, "blank", x, y, size)
+
+# Logo provider.
+# A team's logo bitmap and palette are only read from its asset file the first time the
+# team is drawn. The most recently used logos stay resident so switching back to them is
+# just a slot swap; past LOGO_CACHE_SIZE the least recently used one is evicted and its
+# bitmap reused.
+# The size can be set with LOGO_CACHE_SIZE in settings.toml.
+LOGO_CACHE_SIZE = int(os.getenv("LOGO_CACHE_SIZE") or 4)
+
+class resident_logo:
+    def __init__(self, team, bitmap, palette):
+        self.team = team
+        self.bitmap = bitmap
+        self.palette = palette
 
-# Draws the team logos on the display.
-# The 'home_or_away' parameter determines the logo position on the bitmap.
-def draw_logo(team, x, y, home_or_away):
+class logo_provider:
+    def __init__(self, capacity=LOGO_CACHE_SIZE):
+        # Both slots must be able to hold a logo at the same time.
+        self.capacity = max(capacity, len(logo_slots))
+        self.resident = []  # least recently used first
+        self.hits = 0
+        self.loads = 0
+
+    # Returns the resident logo for the team, loading it if needed. 'replacing' is the index
+    # of the slot the logo is for; that slot's current logo may be evicted to make room.
+    def get(self, team, replacing=None):
+        for i in range(len(self.resident)):
+            logo = self.resident[i]
+            if logo.team is team:
+                if i != len(self.resident) - 1:
+                    self.resident.append(self.resident.pop(i))
+                self.hits += 1
+                return logo
+        return self.load(team, replacing)
+
+    def load(self, team, replacing=None):
+        bitmap = None
+        if len(self.resident) >= self.capacity:
+            bitmap = self.evict(replacing)
+            # Only the other slots are pinned, and capacity covers all of them, so something
+            # can always go.
+            assert bitmap is not None, "logo cache full of pinned logos"
+        if bitmap is None:
+            bitmap = displayio.Bitmap(LOGO_SIZE, LOGO_SIZE, 16)
+
+        asset = read_logo(team.logo)
+        if asset is None:
+            # Leave the slot blank rather than stop the scoreboard over a missing file.
+            bitmap.fill(0)
+            palette = empty_logo_palette
+        else:
+            width, height, palette, packed = asset
+            if width != LOGO_SIZE or height != LOGO_SIZE:
+                bitmap.fill(0)
+            draw_packed_pattern(bitmap, 0, 0, width, packed)
+
+        logo = resident_logo(team, bitmap, palette)
+        self.resident.append(logo)
+        self.loads += 1
+        return logo
+
+    # Drops the least recently used logo that is not on screen and returns its bitmap. The
+    # logo in slot 'replacing' is about to leave the screen, so it does not count as shown.
+    def evict(self, replacing=None):
+        for i in range(len(self.resident)):
+            team = self.resident[i].team
+            pinned = False
+            for s in range(len(logo_slots)):
+                if s != replacing and logo_slots[s].team is team:
+                    pinned = True
+            if not pinned:
+                return self.resident.pop(i).bitmap
+        return None
 
-    width = 32
-    height = 32
-    size = 1
+logo_cache = logo_provider()
 
-    if home_or_away == 0:
-        draw_sprite(team.bitmap, x, y, width, height, size, team.pattern, team.palette, bg_index=0, draw_bg=True)
-    if home_or_away == 1:
-        draw_sprite(team.bitmap, x + 32, y, width, height, size, team.pattern, team.palette, bg_index=0, draw_bg=True)
+# Draws the team logos on the display.
+# The 'home_or_away' parameter selects the logo slot; x and y are offsets inside that slot.
+# A slot that already shows the team is left alone, so only a matchup change costs anything.
+# Returns True when the slot changed.
+def draw_logo(team, x, y, home_or_away):
+    slot = logo_slots[home_or_away]
+    if slot.team is team:
+        return False
+
+    logo = logo_cache.get(team, home_or_away)
+    slot.show(logo.bitmap, logo.palette, x, y)
+    slot.team = team
+    return True
+
+# Score layout: each side has a hundreds, tens and ones cell drawn at size 2.
+HOME_SCORE_X = 0
+AWAY_SCORE_X = 37
+SCORE_Y = 48
+SCORE_STEP = 8
+
+# Splits a score into the glyphs of its hundreds, tens and ones cells.
+# The hundreds cell is None below 100 so it can be left empty.
+def score_glyphs(score):
+    hundreds = (score // 100) % 10
+    tens = DIGIT_GLYPHS[(score // 10) % 10]
+    ones = DIGIT_GLYPHS[score % 10]
+
+    if hundreds > 0:
+        return DIGIT_GLYPHS[hundreds], tens, ones
+    return None, tens, ones
 
 # Draws the game score on the display.
 # The score is split into hundreds, tens, and ones and drawn separately.
 def draw_score(home_score, away_score):
-    # Home team
-    home_score_hundreds = (home_score // 100) % 10
-    home_score_tens = (home_score // 10) % 10
-    home_score_ones = home_score % 10
-
-
-    if home_score_hundreds > 0:
-        draw_number(home_score_hundreds, 0, 48, 2)
-        draw_number(home_score_tens, 8, 48, 2)
-        draw_number(home_score_ones, 16, 48, 2)
-    else:
-        draw_number(home_score_tens, 8, 48, 2)
-        draw_number(home_score_ones, 16, 48, 2)
-
-    # Away team
-    away_score_hundreds = (away_score // 100) % 10
-    away_score_tens = (away_score // 10) % 10
-    away_score_ones = away_score % 10
-
-    if away_score_hundreds > 0:
-        draw_number(away_score_hundreds, 37, 48, 2)
-        draw_number(away_score_tens, 45, 48, 2)
-        draw_number(away_score_ones, 53, 48, 2)
-
-    else:
-        draw_number(away_score_tens, 45, 48, 2)
-        draw_number(away_score_ones, 53, 48, 2)
+    for x, score in ((HOME_SCORE_X, home_score), (AWAY_SCORE_X, away_score)):
+        cell_x = x
+        for glyph in score_glyphs(score):
+            if glyph is not None:
+                draw_glyph(decal_bitmap, glyph, cell_x, SCORE_Y, 2)
+            cell_x += SCORE_STEP
 
 def draw_quarter(quarter):
     if quarter == 1:
@@ -793,7 +509,22 @@ def format_clock(clock_str):
     return clock_str  # Assume it's already in MM:SS or HH:MM format
 
 
-def draw_clock(clock_str):
+# Clock layout: five size 2 cells for "HH:MM" and a size 1 AM/PM suffix.
+CLOCK_X = (9, 17, 25, 31, 39)
+CLOCK_Y = 34
+CLOCK_SUFFIX_X = 47
+CLOCK_SUFFIX_Y = 39
+
+# Returns the glyph for a single digit cell. Anything other than 0-9 shows a zero.
+def digit_glyph(number):
+    if 0 <= number <= 9:
+        return DIGIT_GLYPHS[number]
+    return "0"
+
+# Works out what the clock shows without drawing it.
+# Returns the glyphs of the five clock cells and the AM/PM suffix glyph (None for a game clock),
+# or None when the string can't be read.
+def clock_glyphs(clock_str):
     if not isinstance(clock_str, str) or not clock_str:
         clock_str = "12:00 PM"
 
@@ -821,42 +552,49 @@ def draw_clock(clock_str):
             time_part, am_pm = clock_upper.split()
             hours, minutes = map(int, time_part.split(":"))
 
-            if hours >= 10:
-                draw_number(hours // 10, 9, 34, 2)
-            else:
-                draw_blank_number(9, 34, 2)
-            draw_number(hours % 10, 17, 34, 2)
-            draw_colon(25, 34, 2)
-            draw_number(minutes // 10, 31, 34, 2)
-            draw_number(minutes % 10, 39, 34, 2)
-
-            if am_pm == "AM":
-                draw_a(47, 39, 1)
-            else:
-                draw_p(47, 39, 1)
+            return (
+                digit_glyph(hours // 10) if hours >= 10 else "blank",
+                digit_glyph(hours % 10),
+                "colon",
+                digit_glyph(minutes // 10),
+                digit_glyph(minutes % 10),
+                "a" if am_pm == "AM" else "p",
+            )
         except ValueError as e:
             print("AM/PM time format error:", e)
+            return None
 
     # Case 4: MM:SS game clock
-    else:
-        try:
-            if clock_str.startswith(":"):
-                clock_str = "0" + clock_str
-            if "." in clock_str:
-                clock_str = clock_str.split(".")[0]
-
-            minutes, seconds = map(int, clock_str.split(":"))
-
-            if minutes >= 10:
-                draw_number(minutes // 10, 9, 34, 2)
-            else:
-                draw_blank_number(9, 34, 2)
-            draw_number(minutes % 10, 17, 34, 2)
-            draw_colon(25, 34, 2)
-            draw_number(seconds // 10, 31, 34, 2)
-            draw_number(seconds % 10, 39, 34, 2)
-        except ValueError as e:
-            print("MM:SS time format error:", e)
+    try:
+        if clock_str.startswith(":"):
+            clock_str = "0" + clock_str
+        if "." in clock_str:
+            clock_str = clock_str.split(".")[0]
+
+        minutes, seconds = map(int, clock_str.split(":"))
+
+        return (
+            digit_glyph(minutes // 10) if minutes >= 10 else "blank",
+            digit_glyph(minutes % 10),
+            "colon",
+            digit_glyph(seconds // 10),
+            digit_glyph(seconds % 10),
+            None,
+        )
+    except ValueError as e:
+        print("MM:SS time format error:", e)
+        return None
+
+
+def draw_clock(clock_str):
+    glyphs = clock_glyphs(clock_str)
+    if glyphs is None:
+        return
+
+    for i in range(5):
+        draw_glyph(decal_bitmap, glyphs[i], CLOCK_X[i], CLOCK_Y, 2)
+    if glyphs[5] is not None:
+        draw_glyph(letter_bitmap, glyphs[5], CLOCK_SUFFIX_X, CLOCK_SUFFIX_Y, 1)
 
 
 # Draws the game date on the display.
@@ -895,49 +633,12 @@ def draw_date(game_date):
         print("draw_date format error:", e)
 
 def draw_future_game(game_date, game_time, team, game_opponent, countdown):
-    teams = {
-        "Atlanta Hawks": hawks,
-        "Boston Celtics": celtics,
-        "Brooklyn Nets": nets,
-        "Charlotte Hornets": hornets,
-        "Chicago Bulls": bulls,
-        "Cleveland Cavaliers": cavaliers,
-        "Dallas Mavericks": mavericks,
-        "Denver Nuggets": nuggets,
-        "Detroit Pistons": pistons,
-        "Golden State Warriors": warriors,
-        "Houston Rockets": rockets,
-        "Indiana Pacers": pacers,
-        "Los Angeles Lakers": lakers,
-        "Los Angeles Clippers": clippers,
-        "Memphis Grizzlies": grizzlies,
-        "Miami Heat": heat,
-        "Milwaukee Bucks": bucks,
-        "Minnesota Timberwolves": timberwolves,
-        "New Orleans Pelicans": pelicans,
-        "New York Knicks": knicks,
-        "Oklahoma City Thunder": thunder,
-        "Orlando Magic": magic,
-        "Philadelphia 76ers": sixers,
-        "Phoenix Suns": suns,
-        "Portland Trail Blazers": trail_blazers,
-        "Sacramento Kings": kings,
-        "San Antonio Spurs": spurs,
-        "Toronto Raptors": raptors,
-        "Utah Jazz": jazz,
-        "Washington Wizards": wizards
-    }
-
+    # Full names from the schedule API, falling back to the nickname for odd spellings.
     def resolve_team(name):
-        if name in teams:
-            return teams[name]
-        if "blaz" in name.lower():
-            return trail_blazers
-        last_word = name.split()[-1]
-        for full_name, obj in teams.items():
-            if full_name.split()[-1] == last_word:
-                return obj
-        return None
+        found = find_team(name)
+        if found is None and name:
+            found = find_team(name.split()[-1])
+        return found
 
     this_team = resolve_team(team)
     opponent_team = resolve_team(game_opponent)
@@ -974,203 +675,94 @@ def normalize_game_time(time_str):
     return time_str            
 
 
+# Team selection menu.
+# The tricodes from TEAM_ABBRS go down MENU_COL_X columns of MENU_ROWS, MENU_ROW_STEP pixels
+# apart, each after a selector's width of space, with their letters set one blank column
+# apart. The menu is drawn once into menu_bitmap and then only shown and hidden; moving the
+# selector erases one hyphen and draws one.
+MENU_COL_X = (0, 16, 34, 48)
+MENU_ROWS = 9
+MENU_ROW_STEP = 7
+
+menu_state = {"drawn": False, "selected": None}
+
+# Top left of the selector for menu entry 'menu_idx'; the tricode starts right after it.
+def menu_slot(menu_idx):
+    col, row = divmod(menu_idx, MENU_ROWS)
+    return MENU_COL_X[col], row * MENU_ROW_STEP
+
+# First and last column of a glyph that has any pixels set.
+def glyph_ink(glyph):
+    width, height, pattern = GLYPHS[glyph]
+    first = width
+    last = -1
+    for row in range(height):
+        for col in range(width):
+            if pattern[row * width + col]:
+                first = min(first, col)
+                last = max(last, col)
+    return first, last
+
+# The inked columns of a glyph: (width, height, pattern) without its blank side columns, so
+# a letter at the end of a tricode never reaches past its last pixel. Built once per glyph.
+_inked_cache = {}
+
+def glyph_inked(glyph):
+    inked = _inked_cache.get(glyph)
+    if inked is None:
+        width, height, pattern = GLYPHS[glyph]
+        first, last = glyph_ink(glyph)
+        inked_width = last - first + 1
+        trimmed = bytearray(inked_width * height)
+        for row in range(height):
+            trimmed[row * inked_width:(row + 1) * inked_width] = pattern[row * width + first:row * width + last + 1]
+        inked = (inked_width, height, bytes(trimmed))
+        _inked_cache[glyph] = inked
+    return inked
+
+# Where the letters of menu entry 'menu_idx' go: a list of (x, y, width, height, pattern).
+def menu_entry_letters(menu_idx):
+    x, y = menu_slot(menu_idx)
+    x += GLYPHS["hyphen"][0]
+    letters = []
+    for letter in TEAM_ABBRS[menu_idx]:
+        width, height, pattern = glyph_inked(letter)
+        letters.append((x, y, width, height, pattern))
+        x += width + 1
+    return letters
+
+def layout_city_menu():
+    for menu_idx in range(len(TEAM_ABBRS)):
+        for x, y, width, height, pattern in menu_entry_letters(menu_idx):
+            blit_pattern_masked(menu_bitmap, x, y, width, height, pattern, 0)
+    menu_state["drawn"] = True
+    menu_state["selected"] = None
+
+# Shows the team selection menu over everything else, laying it out on first use.
 def draw_city_menu():
-    # ATL
-    draw_A(2, 0, 1)
-    draw_T(7, 0, 1)
-    draw_L(11, 0, 1)
-
-    # BKN
-    draw_B(3, 7, 1)
-    draw_K(7, 7, 1)
-    draw_N(11, 7, 1)
-
-    # BOS
-    draw_B(3, 14, 1)
-    draw_O(7, 14, 1)
-    draw_S(11, 14, 1)
-
-    # CHA
-    draw_C(3, 21, 1)
-    draw_H(7, 21, 1)
-    draw_A(10, 21, 1)
-
-    # CHI
-    draw_C(3, 28, 1)
-    draw_H(7, 28, 1)
-    draw_I(11, 28, 1)
-
-    # CLE
-    draw_C(3, 35, 1)
-    draw_L(7, 35, 1)
-    draw_E(11, 35, 1)
-
-    # DAL
-    draw_D(3, 42, 1)
-    draw_A(6, 42, 1)
-    draw_L(11, 42, 1)
-
-    # DEN
-    draw_D(3, 49, 1)
-    draw_E(7, 49, 1)
-    draw_N(11, 49, 1)
-
-    # DET
-    draw_D(3, 56, 1)
-    draw_E(7, 56, 1)
-    draw_T(11, 56, 1)
-
-    # GSW
-    draw_G(18, 0, 1)
-    draw_S(22, 0, 1)
-    draw_W(25, 0, 1)
-
-    # HOU
-    draw_H(18, 7, 1)
-    draw_O(22, 7, 1)
-    draw_U(26, 7, 1)
-
-    # IND
-    draw_I(18, 14, 1)
-    draw_N(22, 14, 1)
-    draw_D(27, 14, 1)
-
-    # LAC
-    draw_L(18, 21, 1)
-    draw_A(21, 21, 1)
-    draw_C(26, 21, 1)
-
-    # LAL
-    draw_L(18, 28, 1)
-    draw_A(21, 28, 1)
-    draw_L(26, 28, 1)
-
-    # MEM
-    draw_M(18, 35, 1)
-    draw_E(23, 35, 1)
-    draw_M(27, 35, 1)
-
-    # MIA
-    draw_M(18, 42, 1)
-    draw_I(23, 42, 1)
-    draw_A(27, 42, 1)
-
-    # MIL
-    draw_M(18, 49, 1)
-    draw_I(23, 49, 1)
-    draw_L(27, 49, 1)
-
-    # MIN
-    draw_M(18, 56, 1)
-    draw_I(23, 56, 1)
-    draw_N(27, 56, 1)
-
-    # NOP
-    draw_N(36, 0, 1)
-    draw_O(41, 0, 1)
-    draw_P(45, 0, 1)
-
-    # NYK
-    draw_N(36, 7, 1)
-    draw_Y(40, 7, 1)
-    draw_K(44, 7, 1)
-
-    # OKC
-    draw_O(36, 14, 1)
-    draw_K(40, 14, 1)
-    draw_C(44, 14, 1)
-
-    # ORL
-    draw_O(36, 21, 1)
-    draw_R(40, 21, 1)
-    draw_L(44, 21, 1)
-
-    # PHI
-    draw_P(36, 28, 1)
-    draw_H(40, 28, 1)
-    draw_I(44, 28, 1)
-
-    # PHX
-    draw_P(36, 35, 1)
-    draw_H(40, 35, 1)
-    draw_X(44, 35, 1)
-
-    # POR
-    draw_P(36, 42, 1)
-    draw_O(40, 42, 1)
-    draw_R(44, 42, 1)
-
-    # SAC
-    draw_S(36, 49, 1)
-    draw_A(39, 49, 1)
-    draw_C(44, 49, 1)
-
-    # SAS
-    draw_S(36, 56, 1)
-    draw_A(39, 56, 1)
-    draw_S(44, 56, 1)
-
-    # TOR
-    draw_T(50, 0, 1)
-    draw_O(54, 0, 1)
-    draw_R(58, 0, 1)
-
-    # UTA
-    draw_U(50, 7, 1)
-    draw_T(54, 7, 1)
-    draw_A(57, 7, 1)
-
-    # WAS
-    draw_W(50, 14, 1)
-    draw_A(55, 14, 1)
-    draw_S(60, 14, 1)
-    
-def clear_hyphen(x, y, size):
-    # Same sprite footprint as draw_hyphen: 3x5.
-    # All zeros + draw_bg=True forces the background index into that region.
-    pattern = (
-        0, 0,
-        0, 0,
-        0, 0,
-        0, 0,
-        0, 0,
-    )
-    draw_sprite(letter_bitmap, x, y, 2, 5, size, pattern, decal_palette, bg_index=0, draw_bg=True)
+    if not menu_state["drawn"]:
+        layout_city_menu()
+    tilegrid_menu.hidden = False
 
-def draw_selector(menu_idx: int):
-    y_step = 7
-    COL_X = [0, 16, 34, 48]
-    COL_ROWS = [9, 9, 9, 3]  # matches your menu layout
-
-    # 1) Clear every possible selector location
-    idx = 0
-    for col, rows in enumerate(COL_ROWS):
-        x = COL_X[col]
-        for row in range(rows):
-            y = row * y_step
-            clear_hyphen(x, y, 1)
-            idx += 1
-
-    # 2) Draw the active selector
-    if menu_idx < 9:
-        col = 0
-        row = menu_idx
-    elif menu_idx < 18:
-        col = 1
-        row = menu_idx - 9
-    elif menu_idx < 27:
-        col = 2
-        row = menu_idx - 18
-    else:
-        col = 3
-        row = menu_idx - 27  # 0..2
+def hide_city_menu():
+    tilegrid_menu.hidden = True
 
-    x = COL_X[col]
-    y = row * y_step
-    draw_hyphen(x, y, 1)
+# Moves the menu selector to entry 'menu_idx'.
+def draw_selector(menu_idx: int):
+    selected = menu_state["selected"]
+    if selected == menu_idx:
+        return
+    # Only the hyphen's inked columns are touched: the blank one left of them can hold the
+    # last pixel of the previous column's tricode.
+    first = glyph_ink("hyphen")[0]
+    width, height, pattern = glyph_inked("hyphen")
+    if selected is not None:
+        x, y = menu_slot(selected)
+        rect_fill(menu_bitmap, x + first, y, width, height, 0)
+    x, y = menu_slot(menu_idx)
+    blit_pattern(menu_bitmap, x + first, y, width, height, pattern)
+    menu_state["selected"] = menu_idx
 
 def clear_area(bitmap, x0, y0, w, h, bg=0):
-    for y in range(y0, y0 + h):
-        for x in range(x0, x0 + w):
-            bitmap[x, y] = bg
+    rect_fill(bitmap, x0, y0, w, h, bg)
 
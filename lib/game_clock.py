@@ -0,0 +1,134 @@
+"""
+Library for running the game clock between scoreboard polls
+=======================================================================================
+
+A poll only says what the clock read when the scoreboard was written. game_clock keeps a
+model of the real clock from those samples and runs it on time.monotonic_ns() in between:
+
+    clock moved down since the last sample     running, counts down in real time
+    clock did not move                         stopped (foul, timeout, review)
+    new period, or gameStatus not live         starts over from the sample
+    same meta.time as the last sample          the CDN repeated itself, sample ignored
+
+The displayed clock follows the model in real time; the broadcast delay is applied later,
+by game_state's frame_buffer. When a new sample disagrees with what is on the board while
+the clock runs, the difference is worked off at SLEW_RATE seconds per second (the board
+runs a little fast or slow) instead of jumping. Errors over SNAP_SECS, and any change while
+the clock is stopped, are shown at once, as a real scoreboard does after a review.
+
+Times are kept in integer milliseconds and nanoseconds, since CircuitPython floats are too
+short for monotonic time.
+
+Author(s): Michael Ladderbush
+"""
+
+import time
+
+from poll_scheduler import GAME_LIVE
+
+PERIOD_SECS = 12 * 60
+OVERTIME_SECS = 5 * 60
+
+# The board may run at (1 - SLEW_RATE) to (1 + SLEW_RATE) times real speed while it catches up.
+SLEW_RATE = 0.25
+SNAP_SECS = 10
+
+class game_clock:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.period = None
+        self.game_status = None
+        self.meta_time = None
+        self.running = False
+        self.sample_ms = None
+        # Model: 'anchor_ms' on the clock at monotonic 'anchor_ns'.
+        self.anchor_ms = None
+        self.anchor_ns = 0
+        # Display correction: 'offset_ms' at 'offset_ns', shrinking by SLEW_RATE.
+        self.offset_ms = 0
+        self.offset_ns = 0
+        self.samples = 0
+        self.snaps = 0
+
+    @staticmethod
+    def period_ms_for(period):
+        return (PERIOD_SECS if (period or 1) <= 4 else OVERTIME_SECS) * 1000
+
+    def period_ms(self):
+        return self.period_ms_for(self.period)
+
+    # The model's clock in ms at monotonic 'at_ns'.
+    def model_ms(self, at_ns):
+        if self.anchor_ms is None:
+            return None
+        ms = self.anchor_ms
+        if self.running:
+            ms -= (at_ns - self.anchor_ns) // 1000000
+        return max(0, min(ms, self.period_ms()))
+
+    def correction_ms(self, at_ns):
+        if not self.offset_ms:
+            return 0
+        worked_off = int((at_ns - self.offset_ns) // 1000000 * SLEW_RATE)
+        if worked_off <= 0:
+            return self.offset_ms
+        if self.offset_ms > 0:
+            return max(0, self.offset_ms - worked_off)
+        return min(0, self.offset_ms + worked_off)
+
+    # The displayed clock in ms at monotonic 'now_ns', or None before the first sample.
+    def display_ms(self, now_ns=None):
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        ms = self.model_ms(now_ns)
+        if ms is None:
+            return None
+        return max(0, min(ms + self.correction_ms(now_ns), self.period_ms()))
+
+    # The displayed clock in whole seconds, rounded up like an arena clock, or None.
+    def secs(self, now_ns=None):
+        ms = self.display_ms(now_ns)
+        if ms is None:
+            return None
+        return (ms + 999) // 1000
+
+    # Takes one poll's clock in seconds, period, gameStatus and meta.time.
+    def update(self, clock_secs, period, game_status, meta_time=None, now_ns=None):
+        if clock_secs is None:
+            return
+        if meta_time is not None and meta_time == self.meta_time:
+            return
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        shown = self.display_ms(now_ns)
+        sample_ms = int(clock_secs * 1000)
+
+        same_period = period == self.period and game_status == self.game_status and self.sample_ms is not None
+        if game_status != GAME_LIVE or sample_ms == 0:
+            running = False
+        elif same_period:
+            running = sample_ms < self.sample_ms
+        else:
+            # First look at a period: running unless it has not started yet.
+            running = sample_ms < self.period_ms_for(period)
+
+        self.period = period
+        self.game_status = game_status
+        self.meta_time = meta_time
+        self.sample_ms = sample_ms
+        self.running = running
+        self.anchor_ms = sample_ms
+        self.anchor_ns = now_ns
+        self.samples += 1
+
+        # Where the new model puts the display, and how far the board is from it.
+        error = 0 if shown is None else shown - self.model_ms(now_ns)
+        if not same_period or not running or abs(error) > SNAP_SECS * 1000:
+            if error:
+                self.snaps += 1
+            self.offset_ms = 0
+        else:
+            self.offset_ms = error
+            self.offset_ns = now_ns
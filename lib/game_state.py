@@ -0,0 +1,118 @@
+"""
+Library for the state shared by the scoreboard's tasks
+=======================================================================================
+
+code.py runs the control server, the network poller, the 1 Hz clock and the renderer as
+separate asyncio tasks. They only talk through one game_state: the poller writes the
+latest frame or next scheduled game and feeds its clock to a game_clock, the clock task
+records the live board in a frame_buffer and plays it back 'delay_secs' late into the
+display_* fields, the control task changes mode, team and delay, and the renderer draws
+whatever is there.
+'version' goes up on every change so a task can tell if anything moved since it last looked,
+and the 'dirty' event is set so the renderer can sleep until there is something new to draw.
+
+Author(s): Michael Ladderbush
+"""
+
+import asyncio
+
+from game_clock import game_clock
+from buffer_frame import frame_buffer, monotonic_ms, MAX_DELAY_SECS, NO_CLOCK
+
+# What the board is showing.
+MODE_OFF = 0
+MODE_MENU = 1
+MODE_GAME = 2
+
+class game_state:
+    def __init__(self, delay_secs=0):
+        self.mode = MODE_OFF
+        self.team = None
+        # Highlighted entry of the team menu (an index into teams.TEAM_ABBRS).
+        self.menu_idx = 0
+        self.version = 0
+        self.dirty = asyncio.Event()
+        self.clock = game_clock()
+        self.history = frame_buffer()
+        self.set_delay(delay_secs)
+        self.reset_game()
+
+    def reset_game(self):
+        self.frame = None
+        self.in_game = False
+        self.clock.reset()
+        self.history.clear()
+        self.display_secs = None
+        self.display_home = None
+        self.display_away = None
+        self.display_period = None
+        self.display_status = None
+        self.next_game = None
+        self.next_poll = 0.0
+
+    def changed(self):
+        self.version += 1
+        self.dirty.set()
+
+    # Sets the broadcast delay, up to MAX_DELAY_SECS.
+    def set_delay(self, delay_secs):
+        self.delay_ms = max(0, min(int(delay_secs), MAX_DELAY_SECS)) * 1000
+
+    def set_mode(self, mode):
+        if mode != self.mode:
+            self.mode = mode
+            self.changed()
+
+    # Moves the menu highlight to entry 'menu_idx'.
+    def highlight(self, menu_idx):
+        if menu_idx != self.menu_idx:
+            self.menu_idx = menu_idx
+            self.changed()
+
+    # Switches to 'team' and asks the poller for an immediate fetch.
+    def select_team(self, team):
+        self.team = team
+        self.reset_game()
+        self.mode = MODE_GAME
+        self.changed()
+
+    # Takes a fetched frame. 'clock_secs' is its clock in seconds (None if unknown) and
+    # 'meta_time' the scoreboard's meta.time.
+    def apply_game(self, frame, clock_secs, meta_time=None):
+        self.frame = frame
+        self.in_game = True
+        self.clock.update(clock_secs, frame.period, frame.game_status, meta_time)
+        self.tick()
+        self.changed()
+
+    # Takes a (date, time, home team, visitor team) tuple for when the team has no game today.
+    def apply_next_game(self, next_game):
+        self.in_game = False
+        self.next_game = next_game
+        self.changed()
+
+    # Records the live board and moves the display_* fields to the delayed one. Returns True
+    # if anything shown changed.
+    def tick(self):
+        frame = self.frame
+        if frame is None:
+            return False
+        now_ms = monotonic_ms()
+        history = self.history
+        history.record(now_ms, frame.home_score, frame.away_score, self.clock.secs(),
+                       frame.period, frame.game_status)
+        i = history.playback(now_ms, self.delay_ms)
+
+        clock = history.clock[i]
+        secs = None if clock == NO_CLOCK else clock
+        if (secs == self.display_secs and history.home_score[i] == self.display_home and
+                history.away_score[i] == self.display_away and history.period[i] == self.display_period and
+                history.status[i] == self.display_status):
+            return False
+        self.display_secs = secs
+        self.display_home = history.home_score[i]
+        self.display_away = history.away_score[i]
+        self.display_period = history.period[i]
+        self.display_status = history.status[i]
+        self.changed()
+        return True
@@ -0,0 +1,333 @@
+"""
+Library for defining patterns of glyphs
+=======================================================================================
+
+Every digit, letter and separator drawn by draw_tools lives in this one registry.
+A glyph is (width, height, pattern) with the pattern stored row by row as bytes.
+
+Author(s): Michael Ladderbush
+"""
+
+GLYPH_HEIGHT = 5
+
+GLYPHS = {
+    # Colon between clock minutes and seconds.
+    "colon": (3, GLYPH_HEIGHT, bytes((
+        0, 0, 0,
+        0, 2, 0,
+        0, 0, 0,
+        0, 2, 0,
+        0, 0, 0,
+    ))),
+    # Dash between the parts of a date.
+    "dash": (3, GLYPH_HEIGHT, bytes((
+        0, 0, 0,
+        0, 0, 2,
+        0, 2, 0,
+        2, 0, 0,
+        0, 0, 0,
+    ))),
+    # Menu selector.
+    "hyphen": (3, GLYPH_HEIGHT, bytes((
+        0, 0, 0,
+        0, 0, 0,
+        0, 2, 2,
+        0, 0, 0,
+        0, 0, 0,
+    ))),
+    "0": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 2, 2,
+        0, 2, 0, 2,
+        0, 2, 0, 2,
+        0, 2, 0, 2,
+        0, 2, 2, 2,
+    ))),
+    "1": (4, GLYPH_HEIGHT, bytes((
+        0, 0, 2, 0,
+        0, 2, 2, 0,
+        0, 0, 2, 0,
+        0, 0, 2, 0,
+        0, 2, 2, 2,
+    ))),
+    "2": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 2, 2,
+        0, 0, 0, 2,
+        0, 2, 2, 2,
+        0, 2, 0, 0,
+        0, 2, 2, 2,
+    ))),
+    "3": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 2, 2,
+        0, 0, 0, 2,
+        0, 0, 2, 2,
+        0, 0, 0, 2,
+        0, 2, 2, 2,
+    ))),
+    "4": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 0, 2,
+        0, 2, 0, 2,
+        0, 2, 2, 2,
+        0, 0, 0, 2,
+        0, 0, 0, 2,
+    ))),
+    "5": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 2, 2,
+        0, 2, 0, 0,
+        0, 2, 2, 2,
+        0, 0, 0, 2,
+        0, 2, 2, 2,
+    ))),
+    "6": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 2, 2,
+        0, 2, 0, 0,
+        0, 2, 2, 2,
+        0, 2, 0, 2,
+        0, 2, 2, 2,
+    ))),
+    "7": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 2, 2,
+        0, 0, 0, 2,
+        0, 0, 2, 0,
+        0, 0, 2, 0,
+        0, 0, 2, 0,
+    ))),
+    "8": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 2, 2,
+        0, 2, 0, 2,
+        0, 2, 2, 2,
+        0, 2, 0, 2,
+        0, 2, 2, 2,
+    ))),
+    "9": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 2, 2,
+        0, 2, 0, 2,
+        0, 2, 2, 2,
+        0, 0, 0, 2,
+        0, 0, 0, 2,
+    ))),
+    "A": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 2, 2,
+        0, 2, 0, 2,
+        0, 2, 2, 2,
+        0, 2, 0, 2,
+        0, 2, 0, 2,
+    ))),
+    "a": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 2, 0,
+        0, 0, 2, 0,
+        2, 2, 2, 0,
+        2, 0, 2, 0,
+        2, 2, 2, 2,
+    ))),
+    "B": (4, GLYPH_HEIGHT, bytes((
+        2, 2, 0, 0,
+        2, 0, 2, 0,
+        2, 2, 0, 0,
+        2, 0, 2, 0,
+        2, 2, 0, 0,
+    ))),
+    "C": (4, GLYPH_HEIGHT, bytes((
+        2, 2, 2, 0,
+        2, 0, 0, 0,
+        2, 0, 0, 0,
+        2, 0, 0, 0,
+        2, 2, 2, 0,
+    ))),
+    "D": (4, GLYPH_HEIGHT, bytes((
+        2, 2, 0, 0,
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+        2, 2, 0, 0,
+    ))),
+    "d": (4, GLYPH_HEIGHT, bytes((
+        0, 0, 2, 0,
+        0, 0, 2, 0,
+        2, 2, 2, 0,
+        2, 0, 2, 0,
+        2, 2, 2, 0,
+    ))),
+    "E": (4, GLYPH_HEIGHT, bytes((
+        2, 2, 2, 0,
+        2, 0, 0, 0,
+        2, 2, 2, 0,
+        2, 0, 0, 0,
+        2, 2, 2, 0,
+    ))),
+    "f": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 2, 0,
+        0, 2, 0, 0,
+        2, 2, 2, 0,
+        0, 2, 0, 0,
+        0, 2, 0, 0,
+    ))),
+    "G": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 2, 0,
+        2, 0, 0, 0,
+        2, 0, 2, 2,
+        2, 0, 0, 2,
+        0, 2, 2, 0,
+    ))),
+    "H": (4, GLYPH_HEIGHT, bytes((
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+        2, 2, 2, 0,
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+    ))),
+    "h": (4, GLYPH_HEIGHT, bytes((
+        2, 0, 0, 0,
+        2, 0, 0, 0,
+        2, 2, 2, 0,
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+    ))),
+    "I": (4, GLYPH_HEIGHT, bytes((
+        2, 2, 2, 0,
+        0, 2, 0, 0,
+        0, 2, 0, 0,
+        0, 2, 0, 0,
+        2, 2, 2, 0,
+    ))),
+    "K": (4, GLYPH_HEIGHT, bytes((
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+        2, 2, 0, 0,
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+    ))),
+    "L": (4, GLYPH_HEIGHT, bytes((
+        2, 0, 0, 0,
+        2, 0, 0, 0,
+        2, 0, 0, 0,
+        2, 0, 0, 0,
+        2, 2, 2, 0,
+    ))),
+    "l": (4, GLYPH_HEIGHT, bytes((
+        2, 0, 0, 0,
+        2, 0, 0, 0,
+        2, 0, 0, 0,
+        2, 0, 0, 0,
+        2, 0, 0, 0,
+    ))),
+    "M": (5, GLYPH_HEIGHT, bytes((
+        2, 0, 0, 0, 2,
+        2, 2, 0, 2, 2,
+        2, 0, 2, 0, 2,
+        2, 0, 0, 0, 2,
+        2, 0, 0, 0, 2,
+    ))),
+    "N": (4, GLYPH_HEIGHT, bytes((
+        2, 0, 0, 2,
+        2, 2, 0, 2,
+        2, 2, 2, 2,
+        2, 0, 2, 2,
+        2, 0, 0, 2,
+    ))),
+    "n": (4, GLYPH_HEIGHT, bytes((
+        0, 0, 0, 0,
+        0, 0, 0, 0,
+        2, 2, 2, 0,
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+    ))),
+    "O": (4, GLYPH_HEIGHT, bytes((
+        2, 2, 2, 0,
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+        2, 2, 2, 0,
+    ))),
+    "P": (4, GLYPH_HEIGHT, bytes((
+        2, 2, 2, 0,
+        2, 0, 2, 0,
+        2, 2, 2, 0,
+        2, 0, 0, 0,
+        2, 0, 0, 0,
+    ))),
+    "p": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 2, 2,
+        0, 2, 0, 2,
+        0, 2, 2, 2,
+        0, 2, 0, 0,
+        0, 2, 0, 0,
+    ))),
+    "r": (4, GLYPH_HEIGHT, bytes((
+        0, 0, 0, 0,
+        0, 0, 0, 0,
+        2, 2, 0, 0,
+        2, 0, 0, 0,
+        2, 0, 0, 0,
+    ))),
+    "R": (4, GLYPH_HEIGHT, bytes((
+        2, 2, 2, 0,
+        2, 0, 2, 0,
+        2, 2, 0, 0,
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+    ))),
+    "S": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 2, 0,
+        2, 0, 0, 0,
+        2, 2, 0, 0,
+        0, 0, 2, 0,
+        2, 2, 0, 0,
+    ))),
+    "s": (4, GLYPH_HEIGHT, bytes((
+        0, 0, 0, 0,
+        0, 2, 0, 0,
+        2, 0, 0, 0,
+        0, 2, 0, 0,
+        2, 0, 0, 0,
+    ))),
+    "T": (4, GLYPH_HEIGHT, bytes((
+        2, 2, 2, 0,
+        0, 2, 0, 0,
+        0, 2, 0, 0,
+        0, 2, 0, 0,
+        0, 2, 0, 0,
+    ))),
+    "t": (4, GLYPH_HEIGHT, bytes((
+        0, 2, 0, 0,
+        0, 2, 0, 0,
+        2, 2, 2, 0,
+        0, 2, 0, 0,
+        0, 2, 0, 0,
+    ))),
+    "U": (4, GLYPH_HEIGHT, bytes((
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+        0, 2, 0, 0,
+    ))),
+    "W": (5, GLYPH_HEIGHT, bytes((
+        2, 0, 0, 0, 2,
+        2, 0, 0, 0, 2,
+        2, 0, 2, 0, 2,
+        2, 0, 2, 0, 2,
+        0, 2, 0, 2, 0,
+    ))),
+    "X": (4, GLYPH_HEIGHT, bytes((
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+        0, 2, 0, 0,
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+    ))),
+    "Y": (4, GLYPH_HEIGHT, bytes((
+        2, 0, 2, 0,
+        2, 0, 2, 0,
+        0, 2, 0, 0,
+        0, 2, 0, 0,
+        0, 2, 0, 0,
+    ))),
+    # Blank digit, used to clear a digit slot.
+    "blank": (4, GLYPH_HEIGHT, bytes((
+        0, 0, 0, 0,
+        0, 0, 0, 0,
+        0, 0, 0, 0,
+        0, 0, 0, 0,
+        0, 0, 0, 0,
+    ))),
+}
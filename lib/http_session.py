@@ -0,0 +1,116 @@
+"""
+Library for keep-alive HTTPS requests with connect and transfer timing
+=======================================================================================
+
+adafruit_requests already hands sockets back to adafruit_connection_manager when a response
+is closed, and the next request to the same host picks the socket up again. That only saves
+the DNS lookup, TCP connect and TLS handshake if every response is read to the end before it
+is closed. A socket closed part way through a body, or after an error, has to be dropped,
+not reused, or the next request reads the tail of the old one.
+
+keepalive_session makes that explicit. connect() takes the host's socket from the connection
+manager first (reusing it or connecting a new one) and times that as the handshake, and
+send() makes the request over it; get() does both. close() frees the socket for the next
+poll when the exchange finished cleanly, and closes it when the body was cut short, the
+request failed, or the server answered "Connection: close".
+A socket the server dropped while idle fails adafruit_requests' liveness check on the next
+request and is reconnected there, which is counted as a reconnect.
+
+Author(s): Michael Ladderbush
+"""
+
+import time
+
+import adafruit_requests
+from adafruit_connection_manager import get_connection_manager
+
+REQUEST_TIMEOUT_SECS = 10
+
+class keepalive_session:
+    def __init__(self, pool, ssl_context):
+        self.session = adafruit_requests.Session(pool, ssl_context)
+        self.manager = get_connection_manager(pool)
+        self.ssl_context = ssl_context
+        self.sockets = {}
+        self.request_start = 0.0
+        self.request_key = None
+        self.request_socket = None
+        self.stats = {
+            "connects": 0,
+            "reuses": 0,
+            "reconnects": 0,
+            "handshake_secs": 0.0,
+            "transfer_secs": 0.0,
+            "total_handshake_secs": 0.0,
+            "total_transfer_secs": 0.0,
+        }
+
+    # Takes the socket for the URL's host from the connection manager and gives it straight
+    # back, so send() finds it connected. Returns the socket, or None if connecting failed
+    # (send() then tries again itself).
+    def connect(self, url):
+        proto, _, host = url.split("/", 3)[0:3]
+        port = 443 if proto == "https:" else 80
+        if ":" in host:
+            host, port = host.split(":", 1)
+            port = int(port)
+        key = (host, port, proto)
+        self.request_key = key
+        self.request_socket = None
+
+        start = time.monotonic()
+        try:
+            socket = self.manager.get_socket(host, port, proto, timeout=REQUEST_TIMEOUT_SECS,
+                                             ssl_context=self.ssl_context)
+        except (OSError, RuntimeError) as e:
+            print("Connect to", host, "failed:", e)
+            return None
+        handshake = time.monotonic() - start
+        self.manager.free_socket(socket)
+
+        if self.sockets.get(key) is socket:
+            self.stats["reuses"] += 1
+        else:
+            self.stats["connects"] += 1
+            self.sockets[key] = socket
+        self.stats["handshake_secs"] = handshake
+        self.stats["total_handshake_secs"] += handshake
+        self.request_socket = socket
+        return socket
+
+    # Sends a GET over the socket connect() set up. Always pass the response to close().
+    def send(self, url, headers=None):
+        key = self.request_key
+        socket = self.request_socket
+        self.request_start = time.monotonic()
+        try:
+            response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT_SECS)
+        except Exception:
+            self.sockets.pop(key, None)
+            raise
+        if socket is not None and response.socket is not socket:
+            self.stats["reconnects"] += 1
+            self.sockets[key] = response.socket
+        return response
+
+    # Sends a GET over the host's kept-alive socket. Always pass the response to close().
+    def get(self, url, headers=None):
+        self.connect(url)
+        return self.send(url, headers)
+
+    # Ends the exchange. 'complete' is False when the body was not read to the end.
+    def close(self, response, complete=True):
+        transfer = time.monotonic() - self.request_start
+        self.stats["transfer_secs"] = transfer
+        self.stats["total_transfer_secs"] += transfer
+
+        socket = response.socket
+        if socket is None:
+            return
+        if complete and response.headers.get("connection", "").lower() != "close":
+            response.close()
+            return
+
+        self.sockets.pop(self.request_key, None)
+        self.manager.close_socket(socket)
+        response.socket = None
@@ -0,0 +1,81 @@
+"""
+Library for reading team logo assets from flash or the SD card
+=======================================================================================
+
+Team logos are stored as small binary files (see tools/logo_tool.py), one per team, in
+/sd/logos or /logos. The SD card is searched first so logos can be added or updated there
+without touching the code. A file is:
+
+    magic b"NBAL", version, width, height, color count   (8 bytes)
+    color count x RGB                                      (3 bytes each, index 0 transparent)
+    run-length packed pattern                              (rest of the file)
+
+Each pattern byte is one run inside a row: the low nibble is the palette index and the high
+nibble is the run length minus one. Everything is read into preallocated buffers, so
+loading a logo only allocates its palette.
+
+Author(s): Michael Ladderbush
+"""
+
+import displayio
+
+LOGO_MAGIC = b"NBAL"
+LOGO_VERSION = 1
+LOGO_DIRS = ("/sd/logos", "/logos")
+LOGO_EXTENSION = ".logo"
+
+MAX_LOGO_COLORS = 16
+MAX_LOGO_PIXELS = 32 * 32
+
+_header = bytearray(8)
+_colors = bytearray(3 * MAX_LOGO_COLORS)
+_pattern = bytearray(MAX_LOGO_PIXELS)
+_pattern_view = memoryview(_pattern)
+
+# Opens the first asset found for the logo name, or returns None.
+def open_logo(name):
+    for directory in LOGO_DIRS:
+        try:
+            return open(directory + "/" + name + LOGO_EXTENSION, "rb")
+        except OSError:
+            pass
+    return None
+
+# Reads a logo asset. Returns (width, height, palette, packed pattern) or None when the
+# asset is missing or unreadable. The packed pattern is a view into a shared buffer and is
+# only valid until the next call.
+def read_logo(name):
+    f = open_logo(name)
+    if f is None:
+        print("Logo asset not found:", name)
+        return None
+
+    try:
+        if f.readinto(_header) != len(_header) or _header[0:4] != LOGO_MAGIC:
+            print("Bad logo asset:", name)
+            return None
+        if _header[4] != LOGO_VERSION:
+            print("Unsupported logo asset version:", name, _header[4])
+            return None
+
+        width = _header[5]
+        height = _header[6]
+        color_count = _header[7]
+        if color_count > MAX_LOGO_COLORS or width * height > MAX_LOGO_PIXELS:
+            print("Logo asset too large:", name)
+            return None
+
+        color_bytes = memoryview(_colors)[0:3 * color_count]
+        if f.readinto(color_bytes) != len(color_bytes):
+            print("Truncated logo asset:", name)
+            return None
+        length = f.readinto(_pattern_view)
+    finally:
+        f.close()
+
+    palette = displayio.Palette(color_count)
+    for i in range(1, color_count):
+        palette[i] = (_colors[3 * i] << 16) | (_colors[3 * i + 1] << 8) | _colors[3 * i + 2]
+    palette.make_transparent(0)
+
+    return width, height, palette, _pattern_view[0:length]
@@ -0,0 +1,165 @@
+"""
+Library for timing the scoreboard's hot paths in the field
+=======================================================================================
+
+Each stage keeps a stage_timer: a fixed-size histogram of durations measured with
+time.monotonic_ns(), plus the count, sum and maximum. Nothing grows while the board runs,
+so the timers can stay on for weeks. The stages are:
+
+    fetch           one scoreboard poll, connect to result
+    body_read       receiving and scanning the scoreboard body, i.e. network time included
+    draw_frame      one scene.draw_frame() call
+    server_poll     one control server poll
+    render_pass     one renderer pass after a state change, menu and next game included
+
+A stage's sum is kept under SUM_LIMIT_US, which keeps it a small int on CircuitPython
+instead of a long int allocated on every add. A timer whose sum would pass it starts over
+from zero, buckets, count and maximum included, so Prometheus sees an ordinary counter reset
+and the JSON mean stays sum_us / n.
+
+The heap watermarks are the lowest and highest gc.mem_free() seen by sample_heap().
+
+render_stats holds the display gaps: the longest time between two clock task reads, i.e. how
+long the board could not change, overall and during the last scoreboard fetch.
+
+metrics_json() and metrics_prometheus() render everything for the control server's
+/metrics route, so a board can be watched without a serial console.
+
+Author(s): Michael Ladderbush
+"""
+
+import gc
+import json
+import time
+from array import array
+
+# Upper bucket bounds in microseconds. Durations past the last bound go in an overflow bucket.
+BUCKET_BOUNDS_US = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000,
+                    250000, 500000, 1000000, 2500000, 5000000)
+
+STAGES = ("fetch", "body_read", "draw_frame", "server_poll", "render_pass")
+
+# About 18 minutes of accumulated time.
+SUM_LIMIT_US = 1 << 30
+
+class stage_timer:
+    def __init__(self):
+        self.buckets = array("L", [0] * (len(BUCKET_BOUNDS_US) + 1))
+        self.reset()
+
+    def reset(self):
+        for i in range(len(self.buckets)):
+            self.buckets[i] = 0
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    # Adds one duration of 'us' microseconds.
+    def add_us(self, us):
+        if self.total_us + us >= SUM_LIMIT_US:
+            self.reset()
+        i = 0
+        last = len(BUCKET_BOUNDS_US)
+        while i < last and us > BUCKET_BOUNDS_US[i]:
+            i += 1
+        self.buckets[i] += 1
+        self.count += 1
+        self.total_us += us
+        if us > self.max_us:
+            self.max_us = us
+
+    # Adds the time since 'start_ns', a time.monotonic_ns() reading.
+    def stop(self, start_ns):
+        self.add_us((time.monotonic_ns() - start_ns) // 1000)
+
+
+timers = {}
+for _name in STAGES:
+    timers[_name] = stage_timer()
+
+# Lowest and highest gc.mem_free() seen. Stays None where gc has no mem_free (CPython).
+heap_stats = {"free_low": None, "free_high": None}
+
+started_ns = time.monotonic_ns()
+
+# Records gc.mem_free() against the watermarks.
+def sample_heap():
+    try:
+        free = gc.mem_free()
+    except AttributeError:
+        return
+    if heap_stats["free_low"] is None or free < heap_stats["free_low"]:
+        heap_stats["free_low"] = free
+    if heap_stats["free_high"] is None or free > heap_stats["free_high"]:
+        heap_stats["free_high"] = free
+
+# Gaps between clock task reads, in seconds. 'fetch_max_gap' is the longest gap while the
+# last scoreboard fetch was running, i.e. how long the network held the display up, and
+# 'fetch_steps' the number of steps that fetch took.
+render_stats = {"last_tick": None, "max_gap": 0.0, "fetching": False, "fetch_max_gap": 0.0, "fetch_steps": 0}
+
+# Records a clock task read at 'now', a time.monotonic() reading.
+def note_render_gap(now):
+    last = render_stats["last_tick"]
+    if last is not None:
+        gap = now - last
+        if gap > render_stats["max_gap"]:
+            render_stats["max_gap"] = gap
+        if render_stats["fetching"] and gap > render_stats["fetch_max_gap"]:
+            render_stats["fetch_max_gap"] = gap
+
+def reset_metrics():
+    for name in timers:
+        timers[name].reset()
+    heap_stats["free_low"] = None
+    heap_stats["free_high"] = None
+    render_stats["max_gap"] = 0.0
+
+def uptime_secs():
+    return (time.monotonic_ns() - started_ns) // 1000000000
+
+# {"uptime_s", "bounds_us", "stages": {name: {"n", "sum_us", "max_us", "buckets"}}, "heap",
+# "display": {"max_gap_s", "fetch_max_gap_s", "fetch_steps"}}. 'buckets' are per bucket, not
+# cumulative, with the overflow bucket last.
+def metrics_json():
+    sample_heap()
+    stages = {}
+    for name in STAGES:
+        timer = timers[name]
+        stages[name] = {"n": timer.count, "sum_us": timer.total_us, "max_us": timer.max_us,
+                        "buckets": list(timer.buckets)}
+    display = {"max_gap_s": render_stats["max_gap"], "fetch_max_gap_s": render_stats["fetch_max_gap"],
+               "fetch_steps": render_stats["fetch_steps"]}
+    return json.dumps({"uptime_s": uptime_secs(), "bounds_us": BUCKET_BOUNDS_US,
+                       "stages": stages, "heap": heap_stats, "display": display}, separators=(",", ":"))
+
+def _seconds(us):
+    return "%.6g" % (us / 1000000)
+
+# The same numbers in the Prometheus text exposition format.
+def metrics_prometheus():
+    sample_heap()
+    lines = ["# TYPE scoreboard_uptime_seconds gauge",
+             "scoreboard_uptime_seconds %d" % uptime_secs(),
+             "# TYPE scoreboard_stage_seconds histogram"]
+    for name in STAGES:
+        timer = timers[name]
+        seen = 0
+        for i in range(len(BUCKET_BOUNDS_US)):
+            seen += timer.buckets[i]
+            lines.append('scoreboard_stage_seconds_bucket{stage="%s",le="%s"} %d'
+                         % (name, _seconds(BUCKET_BOUNDS_US[i]), seen))
+        lines.append('scoreboard_stage_seconds_bucket{stage="%s",le="+Inf"} %d' % (name, timer.count))
+        lines.append('scoreboard_stage_seconds_sum{stage="%s"} %s' % (name, _seconds(timer.total_us)))
+        lines.append('scoreboard_stage_seconds_count{stage="%s"} %d' % (name, timer.count))
+    lines.append("# TYPE scoreboard_stage_max_seconds gauge")
+    for name in STAGES:
+        lines.append('scoreboard_stage_max_seconds{stage="%s"} %s' % (name, _seconds(timers[name].max_us)))
+    lines.append("# TYPE scoreboard_display_gap_max_seconds gauge")
+    lines.append('scoreboard_display_gap_max_seconds{during="any"} %.6g' % render_stats["max_gap"])
+    lines.append('scoreboard_display_gap_max_seconds{during="last_fetch"} %.6g' % render_stats["fetch_max_gap"])
+    if heap_stats["free_low"] is not None:
+        lines.append("# TYPE scoreboard_heap_free_bytes gauge")
+        lines.append('scoreboard_heap_free_bytes{watermark="low"} %d' % heap_stats["free_low"])
+        lines.append('scoreboard_heap_free_bytes{watermark="high"} %d' % heap_stats["free_high"])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,120 @@
+"""
+Library for deciding when to poll the NBA scoreboard next
+=======================================================================================
+
+Every poll of the scoreboard is a TLS handshake and a 24 KB download, so the interval
+follows what the game is doing instead of a fixed timer:
+
+    final two minutes of the 4th or overtime     CLUTCH_POLL_SECS
+    clock running                                LIVE_POLL_SECS
+    clock stopped at 0:00 between periods        BREAK_POLL_SECS
+    halftime                                     HALFTIME_POLL_SECS
+    scheduled                                    wake up PREGAME_LEAD_SECS before tip-off
+    final                                        FINAL_POLL_SECS
+
+If the scoreboard's meta.time has not moved since the last poll the CDN is serving the same
+file, so the interval doubles for every repeat, to at most STALE_MAX_FACTOR times the game
+state's interval and STALE_MAX_SECS. Crunch time stays within 20 seconds that way.
+
+A fetch that fails is retried after RETRY_POLL_SECS, doubling for every failure in a row up
+to RETRY_MAX_SECS, while the board keeps showing the last game.
+
+Author(s): Michael Ladderbush
+"""
+
+import time
+
+CLUTCH_POLL_SECS = 5
+CLUTCH_CLOCK_SECS = 120
+LIVE_POLL_SECS = 30          # game_clock runs the clock between polls
+BREAK_POLL_SECS = 60
+HALFTIME_POLL_SECS = 120
+PREGAME_LEAD_SECS = 60
+PREGAME_POLL_SECS = 30
+SCHED_POLL_SECS = 300
+MAX_SCHED_POLL_SECS = 3600
+FINAL_POLL_SECS = 1800
+STALE_MAX_FACTOR = 4
+STALE_MAX_SECS = 60
+RETRY_POLL_SECS = 5
+RETRY_MAX_SECS = 60
+
+# gameStatus values from the scoreboard.
+GAME_SCHEDULED = 1
+GAME_LIVE = 2
+GAME_FINAL = 3
+
+# Seconds since the epoch for a scoreboard "2025-04-23T23:00:00Z", on the same clock as
+# time.mktime, or None if it cannot be read.
+def utc_to_epoch(utc_str):
+    try:
+        date, clock = utc_str.rstrip("Z").split("T")
+        year, month, day = date.split("-")
+        hours, minutes, seconds = clock.split(":")
+        return time.mktime((int(year), int(month), int(day), int(hours), int(minutes),
+                            int(float(seconds)), 0, -1, -1))
+    except (AttributeError, ValueError):
+        return None
+
+class poll_scheduler:
+    def __init__(self):
+        self.last_meta_time = None
+        self.stale_polls = 0
+        self.failed_polls = 0
+        self.reason = "start"
+
+    # Seconds from now until the next poll. 'clock_secs' is the game clock in seconds
+    # (None if unknown), 'game_time_utc' the scoreboard's gameTimeUTC, 'meta_time' its
+    # meta.time and 'now_utc' the current UTC time on the utc_to_epoch clock (None if unsynced).
+    def next_poll_in(self, game_status, period, clock_secs, game_time_utc=None, meta_time=None, now_utc=None):
+        self.failed_polls = 0
+        interval = self.state_interval(game_status, period, clock_secs, game_time_utc, now_utc)
+
+        if meta_time is not None and meta_time == self.last_meta_time:
+            self.stale_polls += 1
+            limit = max(interval, min(interval * STALE_MAX_FACTOR, STALE_MAX_SECS))
+            backoff = min(interval << min(self.stale_polls, 8), limit)
+            if backoff > interval:
+                interval = backoff
+                self.reason += " (stale x" + str(self.stale_polls) + ")"
+        else:
+            self.stale_polls = 0
+        self.last_meta_time = meta_time
+
+        return interval
+
+    def state_interval(self, game_status, period, clock_secs, game_time_utc, now_utc):
+        if game_status == GAME_LIVE:
+            if clock_secs is None or clock_secs > 0:
+                if period >= 4 and clock_secs is not None and clock_secs <= CLUTCH_CLOCK_SECS:
+                    self.reason = "clutch"
+                    return CLUTCH_POLL_SECS
+                self.reason = "live"
+                return LIVE_POLL_SECS
+            if period == 2:
+                self.reason = "halftime"
+                return HALFTIME_POLL_SECS
+            self.reason = "break"
+            return BREAK_POLL_SECS
+
+        if game_status == GAME_FINAL:
+            self.reason = "final"
+            return FINAL_POLL_SECS
+
+        tip_off = utc_to_epoch(game_time_utc) if game_time_utc else None
+        if tip_off is None or now_utc is None:
+            self.reason = "scheduled"
+            return SCHED_POLL_SECS
+
+        wait = tip_off - PREGAME_LEAD_SECS - now_utc
+        if wait <= 0:
+            self.reason = "tip-off"
+            return PREGAME_POLL_SECS
+        self.reason = "waiting for tip-off"
+        return max(PREGAME_POLL_SECS, min(int(wait), MAX_SCHED_POLL_SECS))
+
+    # Seconds from now until the poll after a failed fetch.
+    def retry_in(self):
+        self.failed_polls += 1
+        self.reason = "retry x" + str(self.failed_polls)
+        return min(RETRY_POLL_SECS << min(self.failed_polls - 1, 8), RETRY_MAX_SECS)
@@ -0,0 +1,128 @@
+"""
+Library for retained-mode drawing of the live game frame
+=======================================================================================
+
+The scene remembers what was last drawn in every widget of the scoreboard (logo pair,
+score digits, clock digits and quarter label) and only pushes the cells whose value changed
+to the bitmaps. It also counts the pixels written for each frame so the saving can be
+checked against a full repaint.
+
+Author(s): Michael Ladderbush
+"""
+
+from draw_tools import *
+
+# Quarter label region, shared by the digit on the decal layer and the suffix on the letter layer.
+QUARTER_X = 25
+QUARTER_Y = 48
+QUARTER_WIDTH = 12
+QUARTER_HEIGHT = 5
+
+# Everything drawn on the decal and letter layers, by the scene or the next-game card, is
+# below the logos.
+TEXT_Y = LOGO_SIZE
+
+# Cost of the static layer: two background column blocks and the decal row.
+STATIC_PIXELS = 64 * 64 + 64
+
+class scene:
+    def __init__(self):
+        self.invalidate()
+        self.frames = 0
+        self.dirty_pixels = 0
+        self.total_dirty_pixels = 0
+
+    # Blanks the decal and letter layers and forgets everything on screen, so the next frame
+    # is a full repaint onto clean layers. Call this before and after anything outside the
+    # scene (the next-game card) draws on them. The background and logo slots are always
+    # repainted in full, so they are left alone.
+    def invalidate(self):
+        clear_area(decal_bitmap, 0, TEXT_Y, decal_bitmap.width, decal_bitmap.height - TEXT_Y)
+        clear_area(letter_bitmap, 0, TEXT_Y, letter_bitmap.width, letter_bitmap.height - TEXT_Y)
+        self.decal_cells = {}
+        self.letter_cells = {}
+        self.static_drawn = False
+        self.logos = None
+        self.home_score = None
+        self.away_score = None
+        self.clock = None
+        self.quarter = None
+
+    # Draws a glyph unless the cell already shows it.
+    def put_glyph(self, bitmap, glyph, x, y, size):
+        cells = self.letter_cells if bitmap is letter_bitmap else self.decal_cells
+        key = y * bitmap.width + x
+        if cells.get(key) == glyph:
+            return
+        draw_glyph(bitmap, glyph, x, y, size)
+        cells[key] = glyph
+        width, height, pattern = get_glyph(glyph, size)
+        self.dirty_pixels += width * height
+
+    def draw_static(self):
+        draw_columns(background_bitmap, 0, 32, 64, 4)
+        draw_columns(background_bitmap, 32, 32, 64, 3)
+        draw_row_singular(decal_bitmap, 64, 46, 2)
+        self.static_drawn = True
+        self.dirty_pixels += STATIC_PIXELS
+
+    def draw_logos(self, home, opp):
+        if draw_logo(home, 0, 0, 0):
+            self.dirty_pixels += LOGO_SIZE * LOGO_SIZE
+        if opp is not None and draw_logo(opp, 0, 0, 1):
+            self.dirty_pixels += LOGO_SIZE * LOGO_SIZE
+
+    def draw_score_cells(self, x, score):
+        hundreds, tens, ones = score_glyphs(score)
+        # An empty hundreds cell is blanked so a score dropping below 100 leaves no digit behind.
+        self.put_glyph(decal_bitmap, hundreds or "blank", x, SCORE_Y, 2)
+        self.put_glyph(decal_bitmap, tens, x + SCORE_STEP, SCORE_Y, 2)
+        self.put_glyph(decal_bitmap, ones, x + 2 * SCORE_STEP, SCORE_Y, 2)
+
+    def draw_clock_cells(self, clock_str):
+        glyphs = clock_glyphs(clock_str)
+        if glyphs is None:
+            return
+        for i in range(5):
+            self.put_glyph(decal_bitmap, glyphs[i], CLOCK_X[i], CLOCK_Y, 2)
+        self.put_glyph(letter_bitmap, glyphs[5] or "blank", CLOCK_SUFFIX_X, CLOCK_SUFFIX_Y, 1)
+
+    def draw_quarter_label(self, quarter):
+        # The label layout changes with the quarter, so the whole region is repainted.
+        clear_area(decal_bitmap, QUARTER_X, QUARTER_Y, QUARTER_WIDTH, QUARTER_HEIGHT)
+        clear_area(letter_bitmap, QUARTER_X, QUARTER_Y, QUARTER_WIDTH, QUARTER_HEIGHT)
+        draw_quarter(quarter)
+        # Two cleared layers plus the label glyphs, which all fit inside the region.
+        self.dirty_pixels += 3 * QUARTER_WIDTH * QUARTER_HEIGHT
+
+    # Draws a TimeFrame, touching only the widgets whose value changed since the last frame.
+    # Returns the number of pixels written.
+    def draw_frame(self, frame):
+        self.dirty_pixels = 0
+
+        if not self.static_drawn:
+            self.draw_static()
+
+        home = frame.team
+        if self.logos is None or self.logos[0] is not home or self.logos[1] != frame.opponent:
+            self.draw_logos(home, find_team(frame.opponent))
+            self.logos = (home, frame.opponent)
+
+        if frame.home_score != self.home_score:
+            self.draw_score_cells(HOME_SCORE_X, frame.home_score)
+            self.home_score = frame.home_score
+        if frame.away_score != self.away_score:
+            self.draw_score_cells(AWAY_SCORE_X, frame.away_score)
+            self.away_score = frame.away_score
+
+        if frame.clock != self.clock:
+            self.draw_clock_cells(frame.clock)
+            self.clock = frame.clock
+
+        if frame.period != self.quarter:
+            self.draw_quarter_label(frame.period)
+            self.quarter = frame.period
+
+        self.frames += 1
+        self.total_dirty_pixels += self.dirty_pixels
+        return self.dirty_pixels
@@ -0,0 +1,77 @@
+"""
+Library for caching next-game schedule lookups
+=======================================================================================
+
+The next scheduled game changes at most once a day, so get_next_game() results are kept
+by (balldontlie team ID, date) until the cached game tips off. The cache is written to a
+small JSON file in /cache so a reboot, including the 4 hour reset in code.py, starts with
+it instead of calling the API again. boot.py makes CIRCUITPY writable for that; if it is
+read-only (UP held at reset) the save is logged and the cache lives in memory.
+
+Entries are [expires, date, time, home team, visitor team], with 'expires' in seconds on
+the time.mktime clock (see poll_scheduler.utc_to_epoch).
+
+Author(s): Michael Ladderbush
+"""
+
+import json
+
+SCHEDULE_CACHE_PATH = "/cache/schedule_cache.json"
+SCHEDULE_CACHE_ENTRIES = 8
+
+# Used when the schedule gives no tip-off time.
+DEFAULT_TTL_SECS = 6 * 3600
+
+class schedule_cache:
+    def __init__(self, path=SCHEDULE_CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(entries, dict):
+            self.entries = entries
+
+    def save(self):
+        try:
+            with open(self.path, "w") as f:
+                json.dump(self.entries, f)
+        except OSError as e:
+            print("Schedule cache not saved to", self.path, "(read-only filesystem? see boot.py):", e)
+
+    @staticmethod
+    def key(team_id, date):
+        return str(team_id) + "|" + date
+
+    # Returns (date, time, home team, visitor team) if a live entry exists, else None.
+    def get(self, team_id, date, now):
+        entry = self.entries.get(self.key(team_id, date))
+        if entry is None or now is None or now >= entry[0]:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1], entry[2], entry[3], entry[4]
+
+    # Stores a lookup until 'expires' (or DEFAULT_TTL_SECS from 'now' if None) and saves the file.
+    def put(self, team_id, date, game, now, expires=None):
+        if now is None:
+            return
+        if expires is None:
+            expires = now + DEFAULT_TTL_SECS
+
+        for key in list(self.entries):
+            if self.entries[key][0] <= now:
+                del self.entries[key]
+        while len(self.entries) >= SCHEDULE_CACHE_ENTRIES:
+            oldest = min(self.entries, key=lambda k: self.entries[k][0])
+            del self.entries[oldest]
+
+        self.entries[self.key(team_id, date)] = [int(expires)] + list(game)
+        self.save()
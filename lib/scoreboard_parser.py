@@ -0,0 +1,300 @@
+"""
+Library for reading one team's game out of the NBA scoreboard stream
+=======================================================================================
+
+todaysScoreboard_00.json is about 24 KB, most of it per-period scores, game leaders and
+odds for games we never show. Instead of building the whole document with json.load, the
+response is read through one preallocated buffer and scanned byte by byte. The scanner
+only tracks how deep it is and which key opened each container, and only keeps the fields
+the scoreboard draws or schedules polls with. Keys are compared by a running hash, and a key
+whose hash matches one of ours is checked byte for byte, so a colliding key is just skipped.
+Skipped values are never copied anywhere.
+
+Scanning stops once the game with the requested team has been read. The rest of the body
+is drained into the same buffer without being scanned so the socket can be reused. A read
+is only complete if the scan got that far (or past the games list) and, when the length is
+known, the whole body arrived; read_complete() says which.
+
+Author(s): Michael Ladderbush
+"""
+
+CHUNK_SIZE = 512
+TOKEN_SIZE = 32
+MAX_DEPTH = 16
+
+# Running hash used for keys. 24 bits keeps it a small int on the board.
+def key_hash(name):
+    h = 0
+    for c in name:
+        h = (h * 31 + c) & 0xFFFFFF
+    return h
+
+# Key value for any key we do not look for, including ones whose hash collides with ours.
+UNKNOWN_KEY = -1
+
+META_KEY = key_hash(b"meta")
+SCOREBOARD_KEY = key_hash(b"scoreboard")
+GAMES_KEY = key_hash(b"games")
+HOME_TEAM_KEY = key_hash(b"homeTeam")
+AWAY_TEAM_KEY = key_hash(b"awayTeam")
+
+# Value slots, in the order read_team_game() returns them.
+HOME_NAME = 0
+HOME_SCORE = 1
+AWAY_NAME = 2
+AWAY_SCORE = 3
+GAME_CLOCK = 4
+GAME_STATUS_TEXT = 5
+GAME_STATUS = 6
+PERIOD = 7
+GAME_TIME_UTC = 8
+META_TIME = 9
+GAME_SLOTS = 9
+
+GAME_FIELDS = {
+    key_hash(b"gameClock"): GAME_CLOCK,
+    key_hash(b"gameStatusText"): GAME_STATUS_TEXT,
+    key_hash(b"gameStatus"): GAME_STATUS,
+    key_hash(b"period"): PERIOD,
+    key_hash(b"gameTimeUTC"): GAME_TIME_UTC,
+}
+TIME_KEY = key_hash(b"time")
+TEAM_NAME_KEY = key_hash(b"teamName")
+SCORE_KEY = key_hash(b"score")
+
+# Every key the scanner looks for, by hash.
+KNOWN_KEYS = {}
+for _name in (b"meta", b"scoreboard", b"games", b"homeTeam", b"awayTeam", b"gameClock",
+              b"gameStatusText", b"gameStatus", b"period", b"gameTimeUTC", b"time", b"teamName",
+              b"score"):
+    KNOWN_KEYS[key_hash(_name)] = _name
+
+_OPEN_OBJECT = 0x7B    # {
+_CLOSE_OBJECT = 0x7D   # }
+_OPEN_ARRAY = 0x5B     # [
+_CLOSE_ARRAY = 0x5D    # ]
+_COLON = 0x3A
+_COMMA = 0x2C
+_QUOTE = 0x22
+_BACKSLASH = 0x5C
+
+# Scans a scoreboard document fed in chunks and keeps the fields of the game with 'team'.
+class scoreboard_scanner:
+    def __init__(self):
+        self.stack = bytearray(MAX_DEPTH)
+        self.path = [0] * MAX_DEPTH
+        self.token = bytearray(TOKEN_SIZE)
+        self.key_bytes = bytearray(TOKEN_SIZE)
+        self.values = [None] * (META_TIME + 1)
+        self.reset(None)
+
+    def reset(self, team):
+        self.team = team
+        self.depth = 0
+        self.key = 0
+        self.key_len = 0
+        self.want_key = False
+        self.in_string = False
+        self.in_scalar = False
+        self.escape = False
+        self.slot = -1
+        self.token_len = 0
+        self.found = False
+        self.done = False
+        self.bytes_read = 0
+        self.length = None
+        self.scanning = False
+        for i in range(len(self.values)):
+            self.values[i] = None
+
+    # True while inside a game object of scoreboard.games, at any depth.
+    def in_games(self):
+        return self.depth >= 4 and self.path[2] == SCOREBOARD_KEY and self.path[3] == GAMES_KEY
+
+    # Value slot for the value that follows the current key, or -1 if it is not kept.
+    def value_slot(self):
+        if self.depth == 2 and self.path[2] == META_KEY and self.key == TIME_KEY:
+            return META_TIME
+        if self.depth == 4 and self.in_games():
+            return GAME_FIELDS.get(self.key, -1)
+        if self.depth == 5 and self.in_games():
+            opened_by = self.path[5]
+            if opened_by == HOME_TEAM_KEY:
+                if self.key == TEAM_NAME_KEY:
+                    return HOME_NAME
+                if self.key == SCORE_KEY:
+                    return HOME_SCORE
+            elif opened_by == AWAY_TEAM_KEY:
+                if self.key == TEAM_NAME_KEY:
+                    return AWAY_NAME
+                if self.key == SCORE_KEY:
+                    return AWAY_SCORE
+        return -1
+
+    # Turns the hash of the key just read into its KNOWN_KEYS hash, or UNKNOWN_KEY.
+    def resolve_key(self):
+        name = KNOWN_KEYS.get(self.key)
+        n = self.key_len
+        if name is None or len(name) != n:
+            return UNKNOWN_KEY
+        key_bytes = self.key_bytes
+        for i in range(n):
+            if key_bytes[i] != name[i]:
+                return UNKNOWN_KEY
+        return self.key
+
+    def keep(self, c):
+        if self.token_len < TOKEN_SIZE:
+            self.token[self.token_len] = c
+            self.token_len += 1
+
+    def end_string(self):
+        if self.slot >= 0:
+            self.values[self.slot] = str(self.token[0:self.token_len], "utf-8")
+            self.slot = -1
+
+    def end_scalar(self):
+        if self.slot >= 0:
+            raw = bytes(self.token[0:self.token_len])
+            try:
+                self.values[self.slot] = int(raw)
+            except ValueError:
+                self.values[self.slot] = None if raw == b"null" else str(raw, "utf-8")
+            self.slot = -1
+
+    def open_container(self, c):
+        if self.depth >= MAX_DEPTH:
+            raise ValueError("scoreboard nested too deep")
+        self.stack[self.depth] = c
+        self.depth += 1
+        self.path[self.depth] = self.key
+        self.key = 0
+        self.want_key = c == _OPEN_OBJECT
+        if self.depth == 4 and self.in_games():
+            for i in range(GAME_SLOTS):
+                self.values[i] = None
+
+    def close_container(self):
+        if self.depth == 4 and self.in_games():
+            if self.values[HOME_NAME] == self.team or self.values[AWAY_NAME] == self.team:
+                self.found = True
+                self.done = True
+        elif self.depth == 3 and self.path[2] == SCOREBOARD_KEY and self.path[3] == GAMES_KEY:
+            self.done = True
+        self.depth -= 1
+        self.want_key = False
+
+    # Scans the first 'n' bytes of 'buf'. Returns True once the game has been read or the
+    # games list has ended without it.
+    def feed(self, buf, n):
+        i = 0
+        while i < n:
+            c = buf[i]
+            i += 1
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif c == _BACKSLASH:
+                    self.escape = True
+                    continue
+                elif c == _QUOTE:
+                    self.in_string = False
+                    if self.want_key:
+                        self.want_key = False
+                        self.key = self.resolve_key()
+                    else:
+                        self.end_string()
+                    continue
+                if self.want_key:
+                    self.key = (self.key * 31 + c) & 0xFFFFFF
+                    if self.key_len < TOKEN_SIZE:
+                        self.key_bytes[self.key_len] = c
+                    self.key_len += 1
+                elif self.slot >= 0:
+                    self.keep(c)
+                continue
+
+            if self.in_scalar:
+                if c > 0x20 and c != _COMMA and c != _CLOSE_OBJECT and c != _CLOSE_ARRAY:
+                    self.keep(c)
+                    continue
+                self.in_scalar = False
+                self.end_scalar()
+
+            if c == _QUOTE:
+                self.in_string = True
+                if self.want_key:
+                    self.key = 0
+                    self.key_len = 0
+                else:
+                    self.slot = self.value_slot()
+                    self.token_len = 0
+            elif c == _OPEN_OBJECT or c == _OPEN_ARRAY:
+                self.open_container(c)
+            elif c == _CLOSE_OBJECT or c == _CLOSE_ARRAY:
+                self.close_container()
+                if self.done:
+                    return True
+            elif c == _COMMA:
+                self.want_key = self.stack[self.depth - 1] == _OPEN_OBJECT
+                if self.want_key:
+                    self.key = 0
+            elif c == _COLON or c <= 0x20:
+                pass
+            else:
+                self.in_scalar = True
+                self.slot = self.value_slot()
+                self.token_len = 0
+                self.keep(c)
+        return False
+
+_chunk = bytearray(CHUNK_SIZE)
+_scanner = scoreboard_scanner()
+
+# Starts an incremental read of the game 'team' plays in; see read_step(). 'length' is the
+# body's Content-Length, if known.
+def start_team_game(team, length=None):
+    _scanner.reset(team)
+    _scanner.length = length
+    _scanner.scanning = True
+
+# Reads one chunk from 'stream' (anything with readinto) into the shared buffer and scans
+# it. Once the game has been read the rest of the body is drained without scanning, so the
+# socket can be reused. Returns True at the end of the body.
+def read_step(stream):
+    n = stream.readinto(_chunk)
+    if not n:
+        return True
+    _scanner.bytes_read += n
+    if _scanner.scanning and _scanner.feed(_chunk, n):
+        _scanner.scanning = False
+    return False
+
+# True if the last read scanned far enough to know the answer and, when the length was given,
+# read the whole body. A body cut short must not be taken as a scoreboard.
+def read_complete():
+    if not _scanner.done:
+        return False
+    return _scanner.length is None or _scanner.bytes_read == _scanner.length
+
+# Result of the last read: (home name, home score, away name, away score, clock, status text,
+# status, period, gameTimeUTC, meta.time), or None if the team has no game on the board.
+def team_game():
+    if not _scanner.found:
+        return None
+    return tuple(_scanner.values)
+
+# Reads a whole scoreboard from 'stream' and returns team_game() for 'team'. Raises
+# ValueError if the read was not complete.
+def read_team_game(stream, team, length=None):
+    start_team_game(team, length)
+    while not read_step(stream):
+        pass
+    if not read_complete():
+        raise ValueError("scoreboard body incomplete")
+    return team_game()
+
+# Body bytes read by the last read, drained ones included.
+def bytes_read():
+    return _scanner.bytes_read
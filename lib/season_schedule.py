@@ -0,0 +1,115 @@
+"""
+Library for a team's season schedule stored as a sorted binary table
+=======================================================================================
+
+A team's whole season is downloaded once and kept in /cache as a small binary file, so the
+next-game screen is a binary search over local data instead of an API call. The table is
+refreshed every SEASON_REFRESH_SECS to pick up postponements; if a refresh fails the old
+table keeps working. boot.py makes CIRCUITPY writable for the file; when it is read-only
+the failed save is logged and the table only lives until the next reboot.
+
+A file is:
+
+    magic b"NBAS", version, team ID, game count (uint16), fetched at (uint32)   (12 bytes)
+    game count x (tip-off, home team ID, away team ID)     (uint32 + 2 bytes, sorted)
+
+Times are seconds on the time.mktime clock (see poll_scheduler.utc_to_epoch) and team IDs
+are balldontlie IDs (see teams.py).
+
+Author(s): Michael Ladderbush
+"""
+
+import struct
+
+SEASON_MAGIC = b"NBAS"
+SEASON_VERSION = 1
+SEASON_PATH = "/cache/season_{}.bin"
+SEASON_REFRESH_SECS = 3 * 24 * 3600
+SEASON_RETRY_SECS = 3600
+
+# A game stays "next" until this long after tip-off, so it is shown while it is played.
+GAME_WINDOW_SECS = 3 * 3600
+
+HEADER = "<4sBBHI"
+HEADER_SIZE = struct.calcsize(HEADER)
+RECORD = "<IBB"
+RECORD_SIZE = struct.calcsize(RECORD)
+
+class season_schedule:
+    def __init__(self, team_id):
+        self.team_id = team_id
+        self.path = SEASON_PATH.format(team_id)
+        self.table = bytearray()
+        self.fetched = 0
+        self.attempted = None
+        self.load()
+
+    def __len__(self):
+        return len(self.table) // RECORD_SIZE
+
+    def load(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return
+        if len(data) < HEADER_SIZE:
+            return
+        magic, version, team_id, count, fetched = struct.unpack_from(HEADER, data, 0)
+        if magic != SEASON_MAGIC or version != SEASON_VERSION or team_id != self.team_id:
+            print("Ignoring season file:", self.path)
+            return
+        if len(data) != HEADER_SIZE + count * RECORD_SIZE:
+            print("Truncated season file:", self.path)
+            return
+        self.table = bytearray(data[HEADER_SIZE:])
+        self.fetched = fetched
+
+    def save(self):
+        try:
+            with open(self.path, "wb") as f:
+                f.write(struct.pack(HEADER, SEASON_MAGIC, SEASON_VERSION, self.team_id, len(self), int(self.fetched)))
+                f.write(self.table)
+        except OSError as e:
+            print("Season schedule not saved to", self.path, "(read-only filesystem? see boot.py):", e)
+
+    # True when the table is missing or older than SEASON_REFRESH_SECS and no download was
+    # tried in the last SEASON_RETRY_SECS. Marks the attempt.
+    def refresh_due(self, now):
+        if now is None:
+            return False
+        if len(self) and now - self.fetched < SEASON_REFRESH_SECS:
+            return False
+        if self.attempted is not None and now - self.attempted < SEASON_RETRY_SECS:
+            return False
+        self.attempted = now
+        return True
+
+    # Replaces the table with (tip-off, home ID, away ID) records and saves it.
+    def replace(self, games, now):
+        games = sorted(games)
+        table = bytearray(len(games) * RECORD_SIZE)
+        for i, game in enumerate(games):
+            struct.pack_into(RECORD, table, i * RECORD_SIZE, int(game[0]), game[1], game[2])
+        self.table = table
+        self.fetched = now
+        self.save()
+
+    def tip_off(self, index):
+        return struct.unpack_from("<I", self.table, index * RECORD_SIZE)[0]
+
+    # (tip-off, home ID, away ID) of the first game that tipped off less than GAME_WINDOW_SECS
+    # before 'now' or later, or None when the season is over.
+    def next_game(self, now):
+        after = now - GAME_WINDOW_SECS
+        low = 0
+        high = len(self)
+        while low < high:
+            mid = (low + high) // 2
+            if self.tip_off(mid) < after:
+                low = mid + 1
+            else:
+                high = mid
+        if low == len(self):
+            return None
+        return struct.unpack_from(RECORD, self.table, low * RECORD_SIZE)
@@ -0,0 +1,87 @@
+"""
+Library for the NBA team registry
+=======================================================================================
+
+One record per team, built once at import. Every part of the app looks teams up here,
+by tricode, NBA teamId, balldontlie ID, nickname, full name or one of the common aliases,
+with a single dict lookup.
+
+Author(s): Michael Ladderbush
+"""
+
+# A team record. 'team_name' is the nickname as the NBA scoreboard spells it ("76ers",
+# "Trail Blazers") and 'logo' is the name of the team's logo asset (see logo_assets.py).
+class nba_team:
+    __slots__ = ("tricode", "nba_id", "bdl_id", "team_name", "full_name", "logo")
+
+    def __init__(self, tricode, nba_id, bdl_id, team_name, full_name, logo):
+        self.tricode = tricode
+        self.nba_id = nba_id
+        self.bdl_id = bdl_id
+        self.team_name = team_name
+        self.full_name = full_name
+        self.logo = logo
+
+_by_id = {}
+_by_name = {}
+
+# Adds a team to the registry under all of its keys and returns it.
+def register(tricode, nba_id, bdl_id, team_name, full_name, logo, aliases=()):
+    team = nba_team(tricode, nba_id, bdl_id, team_name, full_name, logo)
+    _by_id[nba_id] = team
+    _by_id[bdl_id] = team
+    for key in (tricode, team_name, full_name, logo) + aliases:
+        _by_name[key.lower()] = team
+    return team
+
+# Eastern Conference teams
+hawks = register("ATL", 1610612737, 1, "Hawks", "Atlanta Hawks", "hawks")
+celtics = register("BOS", 1610612738, 2, "Celtics", "Boston Celtics", "celtics")
+nets = register("BKN", 1610612751, 3, "Nets", "Brooklyn Nets", "nets")
+hornets = register("CHA", 1610612766, 4, "Hornets", "Charlotte Hornets", "hornets")
+bulls = register("CHI", 1610612741, 5, "Bulls", "Chicago Bulls", "bulls")
+cavaliers = register("CLE", 1610612739, 6, "Cavaliers", "Cleveland Cavaliers", "cavaliers", ("Cavs",))
+pistons = register("DET", 1610612765, 9, "Pistons", "Detroit Pistons", "pistons")
+pacers = register("IND", 1610612754, 12, "Pacers", "Indiana Pacers", "pacers")
+heat = register("MIA", 1610612748, 16, "Heat", "Miami Heat", "heat")
+bucks = register("MIL", 1610612749, 17, "Bucks", "Milwaukee Bucks", "bucks")
+knicks = register("NYK", 1610612752, 20, "Knicks", "New York Knicks", "knicks")
+magic = register("ORL", 1610612753, 22, "Magic", "Orlando Magic", "magic")
+sixers = register("PHI", 1610612755, 23, "76ers", "Philadelphia 76ers", "sixers")
+raptors = register("TOR", 1610612761, 28, "Raptors", "Toronto Raptors", "raptors")
+wizards = register("WAS", 1610612764, 30, "Wizards", "Washington Wizards", "wizards")
+
+# Western Conference teams
+mavericks = register("DAL", 1610612742, 7, "Mavericks", "Dallas Mavericks", "mavericks", ("Mavs",))
+nuggets = register("DEN", 1610612743, 8, "Nuggets", "Denver Nuggets", "nuggets")
+warriors = register("GSW", 1610612744, 10, "Warriors", "Golden State Warriors", "warriors")
+rockets = register("HOU", 1610612745, 11, "Rockets", "Houston Rockets", "rockets")
+clippers = register("LAC", 1610612746, 13, "Clippers", "Los Angeles Clippers", "clippers", ("LA Clippers",))
+lakers = register("LAL", 1610612747, 14, "Lakers", "Los Angeles Lakers", "lakers")
+grizzlies = register("MEM", 1610612763, 15, "Grizzlies", "Memphis Grizzlies", "grizzlies")
+timberwolves = register("MIN", 1610612750, 18, "Timberwolves", "Minnesota Timberwolves", "timberwolves", ("Wolves",))
+pelicans = register("NOP", 1610612740, 19, "Pelicans", "New Orleans Pelicans", "pelicans")
+thunder = register("OKC", 1610612760, 21, "Thunder", "Oklahoma City Thunder", "thunder")
+suns = register("PHX", 1610612756, 24, "Suns", "Phoenix Suns", "suns")
+trail_blazers = register("POR", 1610612757, 25, "Trail Blazers", "Portland Trail Blazers", "trail_blazers", ("Blazers",))
+kings = register("SAC", 1610612758, 26, "Kings", "Sacramento Kings", "kings")
+spurs = register("SAS", 1610612759, 27, "Spurs", "San Antonio Spurs", "spurs")
+jazz = register("UTA", 1610612762, 29, "Jazz", "Utah Jazz", "jazz")
+
+# Tricodes in menu order.
+TEAM_ABBRS = (
+    "ATL", "BKN", "BOS", "CHA", "CHI", "CLE", "DAL", "DEN", "DET",
+    "GSW", "HOU", "IND", "LAC", "LAL", "MEM", "MIA", "MIL", "MIN",
+    "NOP", "NYK", "OKC", "ORL", "PHI", "PHX", "POR", "SAC", "SAS",
+    "TOR", "UTA", "WAS",
+)
+
+# Looks a team up by tricode, nickname, full name or alias, ignoring case. Returns None if unknown.
+def find_team(name):
+    if not name:
+        return None
+    return _by_name.get(name.lower())
+
+# Looks a team up by NBA teamId or balldontlie ID. Returns None if unknown.
+def team_by_id(team_id):
+    return _by_id.get(team_id)
@@ -0,0 +1,102 @@
+"""
+Tests for the delayed playback buffer
+=======================================================================================
+
+Times are given relative to the buffer's origin, one entry per second like a running
+clock, so wraparound and delays can be checked exactly.
+
+Run from the repository root with: python -m unittest discover -s lib -p "test_*.py"
+
+Author(s): Michael Ladderbush
+"""
+
+import unittest
+
+from buffer_frame import *
+from game_state import game_state
+
+
+class frame_buffer_test(unittest.TestCase):
+    def setUp(self):
+        self.buffer = frame_buffer(size=8)
+        self.origin = self.buffer.origin_ms
+
+    # Records one entry a second from 'first' to 'last' seconds, the clock counting down from 600.
+    def record_secs(self, first, last):
+        for t in range(first, last + 1):
+            self.buffer.record(self.origin + t * 1000, t, 0, 600 - t, 1, 2)
+
+    # The home score (the recording second) shown at 'now' seconds with 'delay' seconds of delay.
+    def shown(self, now, delay):
+        i = self.buffer.playback(self.origin + now * 1000, delay * 1000)
+        return self.buffer.home_score[i]
+
+    def test_empty(self):
+        self.assertEqual(self.buffer.playback(self.origin, 0), -1)
+        self.assertEqual(len(self.buffer), 0)
+
+    def test_unchanged_state_is_not_recorded(self):
+        for t in range(5):
+            self.buffer.record(self.origin + t * 1000, 10, 8, 300, 2, 2)
+        self.assertEqual(len(self.buffer), 1)
+
+    def test_unknown_clock(self):
+        self.buffer.record(self.origin, 0, 0, None, 1, 1)
+        self.assertEqual(self.buffer.clock[self.buffer.playback(self.origin, 0)], NO_CLOCK)
+
+    def test_holds_the_oldest_entry_until_there_is_enough_history(self):
+        self.record_secs(0, 3)
+        for now in range(4):
+            self.assertEqual(self.shown(now, 5), 0)
+        self.assertEqual(self.shown(5, 5), 0)
+        self.record_secs(4, 6)
+        self.assertEqual(self.shown(6, 5), 1)
+
+    def test_delayed_entry(self):
+        self.record_secs(0, 6)
+        self.assertEqual(self.shown(6, 0), 6)
+        self.assertEqual(self.shown(6, 3), 3)
+        # Between recordings the newest entry at or before the target is shown.
+        self.assertEqual(self.shown(6.5, 3), 3)
+
+    def test_wraparound(self):
+        self.record_secs(0, 20)
+        self.assertEqual(len(self.buffer), 8)
+        oldest = self.buffer.slot(0)
+        self.assertEqual(self.buffer.home_score[oldest], 13)
+        self.assertEqual(self.shown(20, 0), 20)
+        self.assertEqual(self.shown(20, 4), 16)
+        self.assertEqual(self.shown(20, 7), 13)
+        # Older than anything left: the oldest entry, not a stale slot.
+        self.assertEqual(self.shown(20, 15), 13)
+        self.assertEqual(self.buffer.clock[self.buffer.playback(self.origin + 20000, 4000)], 600 - 16)
+
+    def test_delay_changed_at_runtime(self):
+        self.record_secs(0, 7)
+        self.assertEqual(self.shown(7, 2), 5)
+        # Longer delay: the board steps back to older entries it still has.
+        self.assertEqual(self.shown(7, 6), 1)
+        # Shorter delay: it catches up at once.
+        self.assertEqual(self.shown(7, 1), 6)
+        self.record_secs(8, 8)
+        self.assertEqual(self.shown(8, 1), 7)
+
+    def test_clear(self):
+        self.record_secs(0, 5)
+        self.buffer.clear()
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(self.buffer.playback(self.buffer.origin_ms, 0), -1)
+
+
+class set_delay_test(unittest.TestCase):
+    def test_clamped(self):
+        state = game_state(30)
+        self.assertEqual(state.delay_ms, 30000)
+        state.set_delay(MAX_DELAY_SECS + 60)
+        self.assertEqual(state.delay_ms, MAX_DELAY_SECS * 1000)
+        state.set_delay(-5)
+        self.assertEqual(state.delay_ms, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
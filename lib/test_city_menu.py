@@ -0,0 +1,65 @@
+"""
+Tests for the team selection menu layout
+=======================================================================================
+
+The drawing code runs on tools/fake_display. Its blit drops pixels past the bitmap edge,
+where the board's bitmaptools raises IndexError, so the layout is checked against the
+menu bitmap's size directly.
+
+Run from the repository root with: python -m unittest discover -s lib -p "test_*.py"
+
+Author(s): Michael Ladderbush
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools"))
+import fake_display
+
+fake_display.install()
+
+from draw_tools import *
+
+
+class menu_layout_test(unittest.TestCase):
+    def test_every_tricode_fits_the_bitmap(self):
+        for menu_idx, tricode in enumerate(TEAM_ABBRS):
+            x, y, width, height, pattern = menu_entry_letters(menu_idx)[-1]
+            self.assertLessEqual(x + width, menu_bitmap.width, tricode)
+            self.assertLessEqual(y + height, menu_bitmap.height, tricode)
+
+    def test_tricodes_stay_clear_of_the_next_columns_selector(self):
+        selector_x = glyph_ink("hyphen")[0]
+        for menu_idx, tricode in enumerate(TEAM_ABBRS):
+            col = menu_idx // MENU_ROWS
+            if col + 1 < len(MENU_COL_X):
+                x, y, width, height, pattern = menu_entry_letters(menu_idx)[-1]
+                self.assertLessEqual(x + width, MENU_COL_X[col + 1] + selector_x, tricode)
+
+    def test_moving_the_selector_leaves_the_tricodes(self):
+        menu_state["drawn"] = False
+        draw_city_menu()
+        before = bytes(menu_bitmap[i] for i in range(menu_bitmap.width * menu_bitmap.height))
+        for menu_idx in range(len(TEAM_ABBRS)):
+            draw_selector(menu_idx)
+        draw_selector(0)
+        rect_fill(menu_bitmap, *menu_slot(0), GLYPHS["hyphen"][0], GLYPHS["hyphen"][1], 0)
+        after = bytes(menu_bitmap[i] for i in range(menu_bitmap.width * menu_bitmap.height))
+        self.assertEqual(after, before)
+        hide_city_menu()
+
+    def test_letters_are_inked_edge_to_edge(self):
+        for menu_idx in range(len(TEAM_ABBRS)):
+            for x, y, width, height, pattern in menu_entry_letters(menu_idx):
+                left = [pattern[row * width] for row in range(height)]
+                right = [pattern[row * width + width - 1] for row in range(height)]
+                self.assertTrue(any(left) and any(right))
+
+    def test_entries_fit_the_columns(self):
+        self.assertLessEqual(len(TEAM_ABBRS), MENU_ROWS * len(MENU_COL_X))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Tests for the game clock model
+=======================================================================================
+
+Every update and read is given an explicit monotonic time, so the clock runs on the
+test's timeline instead of the host's.
+
+Run from the repository root with: python -m unittest discover -s lib -p "test_*.py"
+
+Author(s): Michael Ladderbush
+"""
+
+import unittest
+
+from game_clock import *
+from poll_scheduler import GAME_SCHEDULED, GAME_LIVE
+
+T0 = 1000 * 1000000000
+
+# Monotonic ns 'secs' seconds after T0.
+def at(secs):
+    return T0 + int(secs * 1000000000)
+
+
+class running_clock_test(unittest.TestCase):
+    def setUp(self):
+        self.clock = game_clock()
+
+    def test_no_sample_no_clock(self):
+        self.assertIsNone(self.clock.secs(at(0)))
+        self.clock.update(None, 1, GAME_LIVE, "a", at(0))
+        self.assertIsNone(self.clock.secs(at(1)))
+
+    def test_counts_down_between_polls(self):
+        self.clock.update(600, 1, GAME_LIVE, "a", at(0))
+        self.assertTrue(self.clock.running)
+        self.assertEqual(self.clock.secs(at(15)), 585)
+        self.assertEqual(self.clock.display_ms(at(15.5)), 584500)
+
+    def test_rounds_up_like_an_arena_clock(self):
+        self.clock.update(600, 1, GAME_LIVE, "a", at(0))
+        self.assertEqual(self.clock.secs(at(10.999)), 590)
+        self.assertEqual(self.clock.secs(at(11)), 589)
+
+    def test_never_below_zero(self):
+        self.clock.update(5, 4, GAME_LIVE, "a", at(0))
+        self.assertEqual(self.clock.secs(at(60)), 0)
+
+    def test_repeated_meta_time_is_ignored(self):
+        self.clock.update(600, 1, GAME_LIVE, "a", at(0))
+        self.clock.update(500, 1, GAME_LIVE, "a", at(10))
+        self.assertEqual(self.clock.samples, 1)
+        self.assertEqual(self.clock.secs(at(10)), 590)
+
+
+class stop_start_test(unittest.TestCase):
+    def setUp(self):
+        self.clock = game_clock()
+
+    def test_full_period_has_not_started(self):
+        self.clock.update(720, 1, GAME_LIVE, "a", at(0))
+        self.assertFalse(self.clock.running)
+        self.assertEqual(self.clock.secs(at(30)), 720)
+
+    def test_clock_that_did_not_move_is_stopped(self):
+        self.clock.update(300, 3, GAME_LIVE, "a", at(0))
+        self.clock.update(300, 3, GAME_LIVE, "b", at(10))
+        self.assertFalse(self.clock.running)
+        self.assertEqual(self.clock.secs(at(40)), 300)
+
+    def test_restarts_when_it_moves_again(self):
+        self.clock.update(300, 3, GAME_LIVE, "a", at(0))
+        self.clock.update(300, 3, GAME_LIVE, "b", at(10))
+        self.clock.update(295, 3, GAME_LIVE, "c", at(20))
+        self.assertTrue(self.clock.running)
+        # The board still shows 300 and works the 5 s off while it runs.
+        self.assertEqual(self.clock.secs(at(20)), 300)
+        self.assertEqual(self.clock.secs(at(20 + 5 / SLEW_RATE)), 295 - int(5 / SLEW_RATE))
+
+    def test_change_while_stopped_is_shown_at_once(self):
+        self.clock.update(300, 3, GAME_LIVE, "a", at(0))
+        self.clock.update(300, 3, GAME_LIVE, "b", at(10))
+        self.clock.update(302, 3, GAME_LIVE, "c", at(20))
+        self.assertFalse(self.clock.running)
+        self.assertEqual(self.clock.secs(at(20)), 302)
+        self.assertEqual(self.clock.offset_ms, 0)
+
+    def test_zero_and_not_live_are_stopped(self):
+        self.clock.update(0, 2, GAME_LIVE, "a", at(0))
+        self.assertFalse(self.clock.running)
+        self.clock.update(600, 1, GAME_SCHEDULED, "b", at(10))
+        self.assertFalse(self.clock.running)
+        self.assertEqual(self.clock.secs(at(20)), 600)
+
+    def test_new_period_starts_over(self):
+        self.clock.update(10, 1, GAME_LIVE, "a", at(0))
+        self.clock.update(715, 2, GAME_LIVE, "b", at(30))
+        self.assertTrue(self.clock.running)
+        self.assertEqual(self.clock.secs(at(30)), 715)
+        self.assertEqual(self.clock.offset_ms, 0)
+
+
+class slew_test(unittest.TestCase):
+    def setUp(self):
+        self.clock = game_clock()
+        self.clock.update(600, 1, GAME_LIVE, "a", at(0))
+
+    def test_small_error_is_worked_off_at_the_slew_rate(self):
+        # The board reads 590 at 10 s, the scoreboard says 588: the board is 2 s slow.
+        self.clock.update(588, 1, GAME_LIVE, "b", at(10))
+        self.assertEqual(self.clock.offset_ms, 2000)
+        self.assertEqual(self.clock.display_ms(at(10)), 590000)
+        self.assertEqual(self.clock.display_ms(at(14)), 584000 + 2000 - int(4000 * SLEW_RATE))
+        caught_up = 10 + 2 / SLEW_RATE
+        self.assertEqual(self.clock.display_ms(at(caught_up)), 588000 - int((caught_up - 10) * 1000))
+        self.assertEqual(self.clock.display_ms(at(caught_up + 5)), 588000 - int((caught_up - 5) * 1000))
+        self.assertEqual(self.clock.snaps, 0)
+
+    def test_board_running_fast_slows_down(self):
+        self.clock.update(592, 1, GAME_LIVE, "b", at(10))
+        self.assertEqual(self.clock.offset_ms, -2000)
+        self.assertEqual(self.clock.display_ms(at(10)), 590000)
+        self.assertEqual(self.clock.display_ms(at(14)), 588000 - 2000 + int(4000 * SLEW_RATE))
+        self.assertEqual(self.clock.display_ms(at(30)), 572000)
+
+    def test_display_never_jumps_while_slewing(self):
+        self.clock.update(586, 1, GAME_LIVE, "b", at(10))
+        last = self.clock.display_ms(at(10))
+        for tenth in range(1, 300):
+            ms = self.clock.display_ms(at(10 + tenth / 10))
+            step = last - ms
+            # Whole-millisecond rounding on both terms.
+            self.assertGreaterEqual(step, 100 * (1 - SLEW_RATE) - 2)
+            self.assertLessEqual(step, 100 * (1 + SLEW_RATE) + 2)
+            last = ms
+
+    def test_large_error_snaps(self):
+        self.clock.update(590 - SNAP_SECS - 1, 1, GAME_LIVE, "b", at(10))
+        self.assertEqual(self.clock.offset_ms, 0)
+        self.assertEqual(self.clock.snaps, 1)
+        self.assertEqual(self.clock.secs(at(10)), 590 - SNAP_SECS - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Tests for the resident logo cache
+=======================================================================================
+
+The logos are read from the repository's logos/ directory on tools/fake_display. Both
+logo slots start empty in every test, and each test builds its own logo_provider.
+
+Run from the repository root with: python -m unittest discover -s lib -p "test_*.py"
+
+Author(s): Michael Ladderbush
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+import fake_display
+
+fake_display.install()
+import logo_assets
+
+logo_assets.LOGO_DIRS = (os.path.join(ROOT, "logos"),)
+
+from draw_tools import *
+
+TEAMS = [find_team(tricode) for tricode in TEAM_ABBRS]
+
+
+class logo_provider_test(unittest.TestCase):
+    def setUp(self):
+        for slot in logo_slots:
+            slot.team = None
+        self.cache = logo_provider(capacity=3)
+
+    def tearDown(self):
+        for slot in logo_slots:
+            slot.team = None
+
+    def resident_teams(self):
+        return [logo.team for logo in self.cache.resident]
+
+    def test_stays_at_capacity(self):
+        bitmaps = set()
+        for team in TEAMS:
+            bitmaps.add(id(self.cache.get(team).bitmap))
+            self.assertLessEqual(len(self.cache.resident), 3)
+        self.assertEqual(len(self.cache.resident), 3)
+        self.assertEqual(self.cache.loads, len(TEAMS))
+        # Evicted bitmaps are reused, not reallocated.
+        self.assertEqual(len(bitmaps), 3)
+
+    def test_capacity_covers_both_slots(self):
+        self.assertEqual(logo_provider(capacity=1).capacity, len(logo_slots))
+
+    def test_hit_does_not_load(self):
+        logo = self.cache.get(TEAMS[0])
+        self.assertIs(self.cache.get(TEAMS[0]), logo)
+        self.assertEqual((self.cache.loads, self.cache.hits), (1, 1))
+
+    def test_least_recently_used_is_reused(self):
+        first = self.cache.get(TEAMS[0])
+        second = self.cache.get(TEAMS[1])
+        self.cache.get(TEAMS[2])
+        # Using the first again makes the second the least recently used.
+        self.cache.get(TEAMS[0])
+        fourth = self.cache.get(TEAMS[3])
+        self.assertIs(fourth.bitmap, second.bitmap)
+        self.assertEqual(self.resident_teams(), [TEAMS[2], TEAMS[0], TEAMS[3]])
+        self.assertIn(first, self.cache.resident)
+
+    def test_logos_on_screen_are_never_evicted(self):
+        logo_slots[0].team = TEAMS[0]
+        logo_slots[1].team = TEAMS[1]
+        self.cache.get(TEAMS[0])
+        self.cache.get(TEAMS[1])
+        for team in TEAMS[2:]:
+            self.cache.get(team)
+            self.assertIn(TEAMS[0], self.resident_teams())
+            self.assertIn(TEAMS[1], self.resident_teams())
+        self.assertEqual(len(self.cache.resident), 3)
+
+    def test_outgoing_slot_logo_can_go(self):
+        # Capacity 2 with both slots filled: only the slot being replaced can make room.
+        cache = logo_provider(capacity=2)
+        logo_slots[0].team = TEAMS[0]
+        logo_slots[1].team = TEAMS[1]
+        home = cache.get(TEAMS[0])
+        cache.get(TEAMS[1])
+        away = cache.get(TEAMS[2], 1)
+        self.assertEqual([logo.team for logo in cache.resident], [TEAMS[0], TEAMS[2]])
+        self.assertIn(home, cache.resident)
+        self.assertEqual(len(cache.resident), 2)
+        self.assertIsNot(away.bitmap, home.bitmap)
+
+    def test_draw_logo_keeps_both_slots_resident(self):
+        for i in range(0, len(TEAMS) - 1, 2):
+            draw_logo(TEAMS[i], 0, 0, 0)
+            draw_logo(TEAMS[i + 1], 0, 0, 1)
+            shown = [slot.team for slot in logo_slots]
+            resident = [logo.team for logo in logo_cache.resident]
+            self.assertIn(shown[0], resident)
+            self.assertIn(shown[1], resident)
+            self.assertLessEqual(len(resident), logo_cache.capacity)
+
+
+if __name__ == "__main__":
+    unittest.main()
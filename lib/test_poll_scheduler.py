@@ -0,0 +1,130 @@
+"""
+Tests for the poll scheduler's cadence
+=======================================================================================
+
+Run from the repository root with: python -m unittest discover -s lib -p "test_*.py"
+
+Author(s): Michael Ladderbush
+"""
+
+import unittest
+
+from poll_scheduler import *
+
+TIP_OFF_UTC = "2025-04-23T23:00:00Z"
+
+
+class state_interval_test(unittest.TestCase):
+    def setUp(self):
+        self.poller = poll_scheduler()
+        self.tip_off = utc_to_epoch(TIP_OFF_UTC)
+
+    def interval(self, game_status, period=1, clock_secs=None, now_utc=None):
+        return self.poller.next_poll_in(game_status, period, clock_secs, TIP_OFF_UTC, None, now_utc)
+
+    def test_live_clock_running(self):
+        self.assertEqual(self.interval(GAME_LIVE, 2, 300), LIVE_POLL_SECS)
+        self.assertEqual(self.poller.reason, "live")
+
+    def test_live_clock_unknown(self):
+        self.assertEqual(self.interval(GAME_LIVE, 1, None), LIVE_POLL_SECS)
+
+    def test_clutch_only_late_in_the_fourth_or_overtime(self):
+        self.assertEqual(self.interval(GAME_LIVE, 4, CLUTCH_CLOCK_SECS), CLUTCH_POLL_SECS)
+        self.assertEqual(self.interval(GAME_LIVE, 5, 30), CLUTCH_POLL_SECS)
+        self.assertEqual(self.interval(GAME_LIVE, 3, 30), LIVE_POLL_SECS)
+        self.assertEqual(self.interval(GAME_LIVE, 4, CLUTCH_CLOCK_SECS + 1), LIVE_POLL_SECS)
+
+    def test_halftime(self):
+        self.assertEqual(self.interval(GAME_LIVE, 2, 0), HALFTIME_POLL_SECS)
+        self.assertEqual(self.poller.reason, "halftime")
+
+    def test_break_between_other_periods(self):
+        self.assertEqual(self.interval(GAME_LIVE, 1, 0), BREAK_POLL_SECS)
+        self.assertEqual(self.interval(GAME_LIVE, 3, 0), BREAK_POLL_SECS)
+
+    def test_final(self):
+        self.assertEqual(self.interval(GAME_FINAL, 4, 0), FINAL_POLL_SECS)
+
+    def test_scheduled_without_time(self):
+        self.assertEqual(self.interval(GAME_SCHEDULED), SCHED_POLL_SECS)
+        self.assertEqual(self.poller.next_poll_in(GAME_SCHEDULED, 1, None, "not a time", None, self.tip_off),
+                         SCHED_POLL_SECS)
+
+    def test_pregame_wakes_before_tip_off(self):
+        now = self.tip_off - PREGAME_LEAD_SECS - 600
+        self.assertEqual(self.interval(GAME_SCHEDULED, now_utc=now), 600)
+        self.assertEqual(self.poller.reason, "waiting for tip-off")
+
+    def test_pregame_wake_up_clamped_to_max(self):
+        now = self.tip_off - 2 * 86400
+        self.assertEqual(self.interval(GAME_SCHEDULED, now_utc=now), MAX_SCHED_POLL_SECS)
+
+    def test_pregame_wake_up_clamped_to_min(self):
+        now = self.tip_off - PREGAME_LEAD_SECS - 1
+        self.assertEqual(self.interval(GAME_SCHEDULED, now_utc=now), PREGAME_POLL_SECS)
+
+    def test_past_tip_off_polls_pregame(self):
+        for now in (self.tip_off - PREGAME_LEAD_SECS, self.tip_off + 600):
+            self.assertEqual(self.interval(GAME_SCHEDULED, now_utc=now), PREGAME_POLL_SECS)
+            self.assertEqual(self.poller.reason, "tip-off")
+
+
+class stale_backoff_test(unittest.TestCase):
+    def test_repeated_meta_time_doubles_up_to_the_limit(self):
+        poller = poll_scheduler()
+        intervals = [poller.next_poll_in(GAME_LIVE, 2, 300, None, "2025-04-23 23:30:00") for _ in range(5)]
+        limit = max(LIVE_POLL_SECS, min(LIVE_POLL_SECS * STALE_MAX_FACTOR, STALE_MAX_SECS))
+        self.assertEqual(intervals[0], LIVE_POLL_SECS)
+        self.assertEqual(intervals[1], min(LIVE_POLL_SECS * 2, limit))
+        self.assertEqual(intervals[-1], limit)
+        self.assertTrue(all(i <= limit for i in intervals))
+
+    def test_new_meta_time_resets(self):
+        poller = poll_scheduler()
+        poller.next_poll_in(GAME_LIVE, 2, 300, None, "a")
+        poller.next_poll_in(GAME_LIVE, 2, 300, None, "a")
+        self.assertEqual(poller.next_poll_in(GAME_LIVE, 2, 300, None, "b"), LIVE_POLL_SECS)
+        self.assertEqual(poller.stale_polls, 0)
+
+    def test_clutch_stays_within_twenty_seconds(self):
+        poller = poll_scheduler()
+        for _ in range(10):
+            self.assertLessEqual(poller.next_poll_in(GAME_LIVE, 4, 60, None, "same"), 20)
+
+    def test_unknown_meta_time_never_backs_off(self):
+        poller = poll_scheduler()
+        for _ in range(3):
+            self.assertEqual(poller.next_poll_in(GAME_LIVE, 2, 300, None, None), LIVE_POLL_SECS)
+
+
+class retry_backoff_test(unittest.TestCase):
+    def test_failures_double_up_to_the_limit(self):
+        poller = poll_scheduler()
+        intervals = [poller.retry_in() for _ in range(10)]
+        self.assertEqual(intervals[0], RETRY_POLL_SECS)
+        self.assertEqual(intervals[1], RETRY_POLL_SECS * 2)
+        self.assertEqual(intervals[-1], RETRY_MAX_SECS)
+        self.assertEqual(poller.reason, "retry x10")
+
+    def test_successful_poll_resets(self):
+        poller = poll_scheduler()
+        poller.retry_in()
+        poller.retry_in()
+        poller.next_poll_in(GAME_LIVE, 2, 300)
+        self.assertEqual(poller.failed_polls, 0)
+        self.assertEqual(poller.retry_in(), RETRY_POLL_SECS)
+
+
+class utc_to_epoch_test(unittest.TestCase):
+    def test_parses_scoreboard_times(self):
+        self.assertEqual(utc_to_epoch("2025-04-23T23:00:30Z") - utc_to_epoch(TIP_OFF_UTC), 30)
+        self.assertEqual(utc_to_epoch("2025-04-24T00:00:00.5Z") - utc_to_epoch(TIP_OFF_UTC), 3600)
+
+    def test_bad_input(self):
+        self.assertIsNone(utc_to_epoch(None))
+        self.assertIsNone(utc_to_epoch("tonight"))
+
+
+if __name__ == "__main__":
+    unittest.main()
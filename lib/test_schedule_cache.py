@@ -0,0 +1,107 @@
+"""
+Tests for the next-game schedule cache
+=======================================================================================
+
+Each test keeps its cache file in a temporary directory. Times are plain numbers on the
+time.mktime clock.
+
+Run from the repository root with: python -m unittest discover -s lib -p "test_*.py"
+
+Author(s): Michael Ladderbush
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from schedule_cache import *
+
+NOW = 1745000000
+GAME = ("2025-04-25", "7:00 PM", "Boston Celtics", "Orlando Magic")
+
+
+class schedule_cache_test(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "schedule_cache.json")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_fresh_hit(self):
+        cache = schedule_cache(self.path)
+        cache.put(2, "2025-04-24", GAME, NOW, NOW + 3600)
+        self.assertEqual(cache.get(2, "2025-04-24", NOW + 60), GAME)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_read_back_after_reboot(self):
+        schedule_cache(self.path).put(2, "2025-04-24", GAME, NOW, NOW + 3600)
+        cache = schedule_cache(self.path)
+        self.assertEqual(cache.get(2, "2025-04-24", NOW + 60), GAME)
+
+    def test_other_team_or_date_misses(self):
+        cache = schedule_cache(self.path)
+        cache.put(2, "2025-04-24", GAME, NOW, NOW + 3600)
+        self.assertIsNone(cache.get(3, "2025-04-24", NOW))
+        self.assertIsNone(cache.get(2, "2025-04-25", NOW))
+        self.assertEqual(cache.misses, 2)
+
+    def test_expires_at_tip_off(self):
+        cache = schedule_cache(self.path)
+        cache.put(2, "2025-04-24", GAME, NOW, NOW + 3600)
+        self.assertIsNone(cache.get(2, "2025-04-24", NOW + 3600))
+        self.assertIsNone(schedule_cache(self.path).get(2, "2025-04-24", NOW + 7200))
+
+    def test_default_ttl_without_tip_off(self):
+        cache = schedule_cache(self.path)
+        cache.put(2, "2025-04-24", GAME, NOW)
+        self.assertEqual(cache.get(2, "2025-04-24", NOW + DEFAULT_TTL_SECS - 1), GAME)
+        self.assertIsNone(cache.get(2, "2025-04-24", NOW + DEFAULT_TTL_SECS))
+
+    def test_unsynced_clock_never_hits_or_stores(self):
+        cache = schedule_cache(self.path)
+        cache.put(2, "2025-04-24", GAME, None, NOW + 3600)
+        self.assertFalse(os.path.exists(self.path))
+        cache.put(2, "2025-04-24", GAME, NOW, NOW + 3600)
+        self.assertIsNone(cache.get(2, "2025-04-24", None))
+
+    def test_expired_entries_are_dropped_and_size_is_capped(self):
+        cache = schedule_cache(self.path)
+        cache.put(1, "2025-04-20", GAME, NOW - 7200, NOW - 3600)
+        for team_id in range(2, SCHEDULE_CACHE_ENTRIES + 4):
+            cache.put(team_id, "2025-04-24", GAME, NOW, NOW + team_id)
+        self.assertEqual(len(cache.entries), SCHEDULE_CACHE_ENTRIES)
+        self.assertNotIn(cache.key(1, "2025-04-20"), cache.entries)
+        # The entries that expire soonest went first.
+        self.assertNotIn(cache.key(2, "2025-04-24"), cache.entries)
+        self.assertIn(cache.key(SCHEDULE_CACHE_ENTRIES + 3, "2025-04-24"), cache.entries)
+
+    def test_missing_file(self):
+        cache = schedule_cache(self.path)
+        self.assertEqual(cache.entries, {})
+        self.assertIsNone(cache.get(2, "2025-04-24", NOW))
+
+    def test_corrupt_file(self):
+        for text in ("{\"2|2025-04-24\": [17", "not json", "[1, 2, 3]"):
+            with open(self.path, "w") as f:
+                f.write(text)
+            cache = schedule_cache(self.path)
+            self.assertEqual(cache.entries, {}, text)
+            self.assertIsNone(cache.get(2, "2025-04-24", NOW))
+            # The next lookup overwrites it.
+            cache.put(2, "2025-04-24", GAME, NOW, NOW + 3600)
+            self.assertEqual(schedule_cache(self.path).get(2, "2025-04-24", NOW), GAME)
+
+    def test_unwritable_path_keeps_the_cache_in_memory(self):
+        cache = schedule_cache(os.path.join(self.dir.name, "missing", "schedule_cache.json"))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            cache.put(2, "2025-04-24", GAME, NOW, NOW + 3600)
+        self.assertIn("not saved", output.getvalue())
+        self.assertEqual(cache.get(2, "2025-04-24", NOW), GAME)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+"""
+Tests for the conditional scoreboard fetch
+=======================================================================================
+
+scoreboard_fetch runs against a scripted session in place of API_Connection.http, serving
+ApiExample.json with an ETag. The board's network modules (wifi, socketpool, adafruit_ntp)
+are replaced by empty stand-ins when they are missing, as tools/simulator.py does, since
+the fetch never reaches them.
+
+Run from the repository root with: python -m unittest discover -s lib -p "test_*.py"
+
+Author(s): Michael Ladderbush
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import types
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+import fake_display
+
+fake_display.install()
+
+# Registers an empty stand-in for a board module that cannot be imported here.
+def stand_in(name, **attrs):
+    try:
+        __import__(name)
+    except ImportError:
+        module = types.ModuleType(name)
+        module.__dict__.update(attrs)
+        sys.modules[name] = module
+        return module
+
+class _pool:
+    def __init__(self, radio):
+        pass
+
+stand_in("wifi", radio=None)
+stand_in("socketpool", SocketPool=_pool)
+stand_in("adafruit_ntp", NTP=None)
+typing = stand_in("circuitpython_typing")
+if typing is not None:
+    typing.socket = stand_in("circuitpython_typing.socket", CircuitPythonSocketType=object,
+                             InterfaceType=object, SocketpoolModuleType=object, SocketType=object,
+                             SSLContextType=object)
+
+import API_Connection
+from API_Connection import *
+from test_scoreboard_parser import load_example
+
+
+class fake_response:
+    def __init__(self, status, headers, body):
+        self.status_code = status
+        self.headers = headers
+        self.body = body
+        self.pos = 0
+        self.socket = None
+
+    def _readinto(self, buf):
+        n = min(len(buf), 1024, len(self.body) - self.pos)
+        buf[0:n] = self.body[self.pos:self.pos + n]
+        self.pos += n
+        return n
+
+
+# Answers every request with the current 'body' and 'etag', or a 304 when the request's
+# If-None-Match matches the ETag.
+class fake_session:
+    def __init__(self, body, etag):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+        self.responses = []
+        self.closed = []
+
+    def connect(self, url):
+        pass
+
+    def send(self, url, headers=None):
+        headers = dict(headers or {})
+        self.requests.append(headers)
+        if headers.get("If-None-Match") == self.etag:
+            response = fake_response(304, {"etag": self.etag}, b"")
+        else:
+            response = fake_response(200, {"etag": self.etag, "content-length": str(len(self.body))},
+                                     self.body)
+        self.responses.append(response)
+        return response
+
+    def close(self, response, complete=True):
+        self.closed.append(complete)
+
+
+class conditional_fetch_test(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.document = load_example()
+        game = cls.document["scoreboard"]["games"][0]
+        cls.team = game["homeTeam"]["teamName"]
+
+    def setUp(self):
+        self.saved_http = API_Connection.http
+        for key in scoreboard_cache:
+            scoreboard_cache[key] = None
+        for key in fetch_stats:
+            fetch_stats[key] = 0
+        self.session = fake_session(self.body(0), '"1"')
+        API_Connection.http = self.session
+
+    def tearDown(self):
+        API_Connection.http = self.saved_http
+
+    # fetch_game() without its console output.
+    def fetch(self, team):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fetch_game(team)
+
+    # ApiExample.json with 'extra' points on the home score of the first game.
+    def body(self, extra):
+        document = json.loads(json.dumps(self.document))
+        home = document["scoreboard"]["games"][0]["homeTeam"]
+        home["score"] = int(home["score"]) + extra
+        return json.dumps(document).encode()
+
+    def test_first_fetch_is_unconditional_and_cached(self):
+        result = self.fetch(self.team)
+        self.assertEqual(self.session.requests, [{}])
+        self.assertEqual(scoreboard_cache["etag"], '"1"')
+        self.assertEqual(scoreboard_cache["team"], self.team)
+        self.assertEqual(result[0], int(self.document["scoreboard"]["games"][0]["homeTeam"]["score"]))
+
+    def test_not_modified_reuses_the_cached_game(self):
+        first = self.fetch(self.team)
+        body_bytes = fetch_stats["body_bytes"]
+        second = self.fetch(self.team)
+
+        self.assertEqual(self.session.requests[1]["If-None-Match"], '"1"')
+        self.assertEqual(self.session.responses[1].status_code, 304)
+        self.assertEqual(second, first)
+        self.assertEqual(fetch_stats["parses_skipped"], 1)
+        # No body was read for the 304.
+        self.assertEqual(self.session.responses[1].pos, 0)
+        self.assertEqual(fetch_stats["body_bytes"], body_bytes)
+        self.assertEqual(self.session.closed, [True, True])
+
+    def test_new_etag_replaces_the_cache(self):
+        first = self.fetch(self.team)
+        self.session.body = self.body(3)
+        self.session.etag = '"2"'
+        second = self.fetch(self.team)
+
+        self.assertEqual(self.session.requests[1]["If-None-Match"], '"1"')
+        self.assertEqual(second[0], first[0] + 3)
+        self.assertEqual(scoreboard_cache["etag"], '"2"')
+        with contextlib.redirect_stdout(io.StringIO()):
+            cached = team_result(self.team, scoreboard_cache["game"])
+        self.assertEqual(cached, second)
+        self.assertEqual(fetch_stats["parses_skipped"], 0)
+
+        # And the new validator is the one sent next.
+        self.assertEqual(self.fetch(self.team), second)
+        self.assertEqual(self.session.requests[2]["If-None-Match"], '"2"')
+
+    def test_other_team_is_not_conditional(self):
+        self.fetch(self.team)
+        other = self.document["scoreboard"]["games"][0]["awayTeam"]["teamName"]
+        self.fetch(other)
+        self.assertEqual(self.session.requests[1], {})
+
+    def test_truncated_body_keeps_the_previous_entry(self):
+        first = self.fetch(self.team)
+        game = scoreboard_cache["game"]
+        body = self.body(5)
+        self.session.body = body
+        self.session.etag = '"3"'
+        # Content-Length promises the whole body, only half arrives.
+        send = self.session.send
+
+        def short_send(url, headers=None):
+            response = send(url, headers)
+            response.body = body[:len(body) // 2]
+            return response
+
+        self.session.send = short_send
+        self.assertEqual(self.fetch(self.team), FETCH_ERROR)
+        self.assertEqual(scoreboard_cache["etag"], '"1"')
+        self.assertIs(scoreboard_cache["game"], game)
+        self.assertEqual(self.session.closed[-1], False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Tests for the streaming scoreboard scanner
+=======================================================================================
+
+Every read is checked against json.loads on the same bytes: ApiExample.json fed in chunks
+of different sizes, keys whose hash collides with the ones the scanner looks for, and
+bodies cut short.
+
+Run from the repository root with: python -m unittest discover -s lib -p "test_*.py"
+
+Author(s): Michael Ladderbush
+"""
+
+import ast
+import json
+import os
+import unittest
+
+from scoreboard_parser import *
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLE_PATH = os.path.join(ROOT, "ApiExample.json")
+
+
+# ApiExample.json is a console capture of the printed dict; returns the document it holds.
+def load_example():
+    with open(EXAMPLE_PATH, "r") as f:
+        text = f.read()
+    return ast.literal_eval(text[text.find("{"):].strip().splitlines()[0])
+
+# What the scanner should return for 'team', read from the parsed document.
+def expected_game(document, team):
+    for game in document["scoreboard"]["games"]:
+        home = game["homeTeam"]
+        away = game["awayTeam"]
+        if team in (home["teamName"], away["teamName"]):
+            return (home["teamName"], home["score"], away["teamName"], away["score"], game["gameClock"],
+                    game["gameStatusText"], game["gameStatus"], game["period"], game["gameTimeUTC"],
+                    document["meta"]["time"])
+    return None
+
+# A key of the same length and running hash as 'name', made by moving 31 from one byte to
+# the one before it: the last byte for 'variant' 0, the one before that for 1.
+def colliding_key(name, variant=0):
+    i = len(name) - 1 - variant
+    collided = name[:i - 1] + chr(ord(name[i - 1]) + 1) + chr(ord(name[i]) - 31) + name[i + 1:]
+    assert key_hash(collided.encode()) == key_hash(name.encode()) and collided != name
+    return collided
+
+# Copy of 'obj' with colliding keys holding 'decoy' before and after each key in 'names'.
+def with_decoys(obj, names, decoy):
+    out = {}
+    for key in names:
+        if key in obj:
+            out[colliding_key(key, 0)] = decoy
+    out.update(obj)
+    for key in names:
+        if key in obj:
+            out[colliding_key(key, 1)] = decoy
+    return out
+
+
+class chunked_stream:
+    def __init__(self, data, chunk):
+        self.data = data
+        self.chunk = chunk
+        self.pos = 0
+
+    def readinto(self, buf):
+        n = min(len(buf), self.chunk, len(self.data) - self.pos)
+        buf[0:n] = self.data[self.pos:self.pos + n]
+        self.pos += n
+        return n
+
+
+class scoreboard_parser_test(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.document = load_example()
+        cls.payload = json.dumps(cls.document).encode()
+        cls.teams = []
+        for game in cls.document["scoreboard"]["games"]:
+            cls.teams.append(game["homeTeam"]["teamName"])
+            cls.teams.append(game["awayTeam"]["teamName"])
+
+    def read(self, payload, team, chunk=CHUNK_SIZE, length=None):
+        return read_team_game(chunked_stream(payload, chunk), team, length)
+
+    def test_every_team_matches_json(self):
+        self.assertTrue(self.teams)
+        for team in self.teams:
+            self.assertEqual(self.read(self.payload, team), expected_game(self.document, team))
+
+    def test_team_not_on_the_board(self):
+        self.assertIsNone(self.read(self.payload, "Not A Team"))
+        self.assertTrue(read_complete())
+
+    def test_split_chunks(self):
+        team = self.teams[-1]
+        expected = expected_game(self.document, team)
+        for chunk in (1, 2, 3, 7, 64, 511, CHUNK_SIZE):
+            self.assertEqual(self.read(self.payload, team, chunk), expected, chunk)
+
+    def test_compact_separators(self):
+        payload = json.dumps(self.document, separators=(",", ":")).encode()
+        for team in self.teams:
+            self.assertEqual(self.read(payload, team), expected_game(self.document, team))
+
+    def test_whole_body_is_counted(self):
+        self.read(self.payload, self.teams[0], length=len(self.payload))
+        self.assertEqual(bytes_read(), len(self.payload))
+        self.assertTrue(read_complete())
+
+    def test_colliding_keys_are_skipped(self):
+        document = json.loads(self.payload)
+        games = []
+        for game in document["scoreboard"]["games"]:
+            game["homeTeam"] = with_decoys(game["homeTeam"], ("teamName", "score"), 999)
+            game["awayTeam"] = with_decoys(game["awayTeam"], ("teamName", "score"), "Decoys")
+            game = with_decoys(game, ("gameClock", "gameStatus", "gameStatusText", "period",
+                                      "homeTeam", "awayTeam"), {"teamName": self.teams[0]})
+            games.append(game)
+        # A decoy games list before the real one must not end the scan.
+        document["scoreboard"] = with_decoys(dict(document["scoreboard"], games=games), ("games",),
+                                             [{"homeTeam": {"teamName": "Decoys"}}])
+        document["meta"] = with_decoys(document["meta"], ("time",), "decoy time")
+        document = with_decoys(document, ("meta", "scoreboard"), {"games": []})
+        payload = json.dumps(document).encode()
+
+        parsed = json.loads(payload)
+        for team in self.teams + ["Decoys"]:
+            self.assertEqual(self.read(payload, team), expected_game(parsed, team), team)
+
+    def test_truncated_body_fails_like_json(self):
+        team = self.teams[-1]
+        length = len(self.payload)
+        for cut in (0, 1, length // 3, length // 2, length - 2, length - 1):
+            body = self.payload[:cut]
+            with self.assertRaises(ValueError):
+                json.loads(body)
+            with self.assertRaises(ValueError):
+                self.read(body, team, length=length)
+            self.assertFalse(read_complete())
+
+    def test_truncated_before_the_game_without_length(self):
+        team = self.teams[-1]
+        with self.assertRaises(ValueError):
+            self.read(self.payload[:len(self.payload) // 2], team)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Tests for the season schedule table
+=======================================================================================
+
+Each test keeps its season file in a temporary directory. Times are plain numbers on the
+time.mktime clock and the games are (tip-off, home team ID, away team ID) tuples.
+
+Run from the repository root with: python -m unittest discover -s lib -p "test_*.py"
+
+Author(s): Michael Ladderbush
+"""
+
+import os
+import tempfile
+import unittest
+
+import season_schedule as season_file
+from season_schedule import *
+
+TEAM_ID = 2
+DAY = 24 * 3600
+FIRST = 1745000000
+GAMES = [(FIRST + i * 2 * DAY, TEAM_ID, 10 + i) for i in range(5)]
+
+
+class next_game_test(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.saved_path = season_file.SEASON_PATH
+        season_file.SEASON_PATH = os.path.join(self.dir.name, "season_{}.bin")
+        self.schedule = season_schedule(TEAM_ID)
+        # Stored out of order; replace() sorts them.
+        self.schedule.replace(reversed(GAMES), FIRST - DAY)
+
+    def tearDown(self):
+        season_file.SEASON_PATH = self.saved_path
+        self.dir.cleanup()
+
+    def test_before_the_first_game(self):
+        self.assertEqual(self.schedule.next_game(FIRST - 30 * DAY), GAMES[0])
+        self.assertEqual(self.schedule.next_game(FIRST - 1), GAMES[0])
+
+    def test_exact_tip_off(self):
+        for game in GAMES:
+            self.assertEqual(self.schedule.next_game(game[0]), game)
+
+    def test_between_games(self):
+        self.assertEqual(self.schedule.next_game(GAMES[1][0] + DAY), GAMES[2])
+
+    def test_game_stays_next_while_it_is_played(self):
+        tip_off = GAMES[2][0]
+        self.assertEqual(self.schedule.next_game(tip_off + GAME_WINDOW_SECS), GAMES[2])
+        self.assertEqual(self.schedule.next_game(tip_off + GAME_WINDOW_SECS + 1), GAMES[3])
+
+    def test_after_the_last_game(self):
+        tip_off = GAMES[-1][0]
+        self.assertEqual(self.schedule.next_game(tip_off + 1), GAMES[-1])
+        self.assertIsNone(self.schedule.next_game(tip_off + GAME_WINDOW_SECS + 1))
+        self.assertIsNone(self.schedule.next_game(tip_off + 30 * DAY))
+
+    def test_no_remaining_games(self):
+        empty = season_schedule(TEAM_ID + 1)
+        self.assertEqual(len(empty), 0)
+        self.assertIsNone(empty.next_game(FIRST))
+        empty.replace([], FIRST)
+        self.assertIsNone(empty.next_game(FIRST))
+
+    def test_read_back_after_reboot(self):
+        schedule = season_schedule(TEAM_ID)
+        self.assertEqual(len(schedule), len(GAMES))
+        self.assertEqual(schedule.next_game(GAMES[3][0]), GAMES[3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Microbenchmarks for the draw_tools blit engine
+=======================================================================================
+
+Compares pixels per second of the rect_fill / blit_pattern based helpers against the
+per-pixel loops they replaced (kept below as legacy_* reference copies).
+
+On the host the drawing libraries run on tools/fake_display/, so the numbers measure the
+row-write fallback. On the board copy this file next to code.py and run `import bench_blit`
+from the REPL to measure the bitmaptools path.
+
+Author(s): Michael Ladderbush
+"""
+
+import sys
+import time
+
+try:
+    import os
+    import fake_display
+
+    fake_display.install()
+    _root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, os.path.join(_root, "lib"))
+
+    import logo_assets
+
+    logo_assets.LOGO_DIRS = (os.path.join(_root, "logos"),)
+except ImportError:
+    pass
+
+from draw_tools import *
+
+
+# Reference copies of the per-pixel helpers the blit engine replaced.
+def legacy_draw_pixel(bitmap, x, y, my_color):
+    bitmap[x, y] = my_color
+
+def legacy_draw_column_singular(bitmap, length, x, my_color):
+    for y in range(length):
+        legacy_draw_pixel(bitmap, x, y, my_color)
+
+def legacy_draw_columns(bitmap, start_loc, num_columns, length, my_color):
+    for column in range(start_loc, start_loc + num_columns):
+        legacy_draw_column_singular(bitmap, length, column, my_color)
+
+def legacy_draw_row_singular(bitmap, length, y, my_color):
+    for x in range(length):
+        legacy_draw_pixel(bitmap, x, y, my_color)
+
+def legacy_clear_area(bitmap, x0, y0, w, h, bg=0):
+    for y in range(y0, y0 + h):
+        for x in range(x0, x0 + w):
+            bitmap[x, y] = bg
+
+def legacy_draw_sprite(bitmap, x, y, width, height, size, pattern, palette, bg_index=0, draw_bg=False):
+    scaled_pattern, new_width, new_height = scale_pattern(pattern, width, height, size)
+    for row in range(new_height):
+        for col in range(new_width):
+            value = scaled_pattern[row * new_width + col]
+            if value == 0:
+                if draw_bg:
+                    bitmap[x + col, y + row] = bg_index
+                continue
+            bitmap[x + col, y + row] = value
+
+
+def _time(fn, repeat):
+    start = time.monotonic_ns()
+    for _ in range(repeat):
+        fn()
+    return (time.monotonic_ns() - start) / 1e9
+
+
+# (name, pixels per call, legacy call, blit engine call)
+_glyph_w, _glyph_h, _glyph_pattern = GLYPHS["8"]
+_logo_packed = bytes(read_logo(celtics.logo)[3])
+_logo_pattern = bytearray()
+for _run in _logo_packed:
+    _logo_pattern.extend(bytes((_run & 0x0F,)) * ((_run >> 4) + 1))
+CASES = (
+    ("draw_columns 64x64", 64 * 64,
+     lambda: legacy_draw_columns(background_bitmap, 0, 64, 64, 4),
+     lambda: draw_columns(background_bitmap, 0, 64, 64, 4)),
+    ("draw_row_singular 64", 64,
+     lambda: legacy_draw_row_singular(decal_bitmap, 64, 46, 2),
+     lambda: draw_row_singular(decal_bitmap, 64, 46, 2)),
+    ("clear_area 64x64", 64 * 64,
+     lambda: legacy_clear_area(letter_bitmap, 0, 0, 64, 64),
+     lambda: clear_area(letter_bitmap, 0, 0, 64, 64)),
+    ("glyph 4x5 size 2", 8 * 10,
+     lambda: legacy_draw_sprite(decal_bitmap, 9, 34, _glyph_w, _glyph_h, 2, _glyph_pattern, decal_palette, 0, True),
+     lambda: draw_glyph(decal_bitmap, "8", 9, 34, 2)),
+    ("logo 32x32", 32 * 32,
+     lambda: legacy_draw_sprite(home_logo_slot.bitmap, 0, 0, 32, 32, 1, _logo_pattern, None, 0, True),
+     lambda: draw_packed_pattern(home_logo_slot.bitmap, 0, 0, 32, _logo_packed)),
+)
+
+
+def run(repeat=20):
+    print("engine:", "bitmaptools" if bitmaptools is not None else "row writes")
+    print("{:24s} {:>14s} {:>14s} {:>8s}".format("case", "legacy px/s", "blit px/s", "speedup"))
+    for name, pixels, legacy, blit in CASES:
+        legacy_rate = pixels * repeat / _time(legacy, repeat)
+        blit_rate = pixels * repeat / _time(blit, repeat)
+        print("{:24s} {:14.0f} {:14.0f} {:7.1f}x".format(name, legacy_rate, blit_rate, blit_rate / legacy_rate))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
+else:
+    run()
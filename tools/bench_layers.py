@@ -0,0 +1,83 @@
+"""
+Host-side benchmark for the displayio layer stack
+=======================================================================================
+
+Loads a logo_bitmaps module under CPython on tools/fake_display, then counts how many
+layers the compositor has to walk on a full refresh.
+
+displayio fills each dirty pixel by walking the root group's children from the top down,
+so every TileGrid covering a pixel is one layer composite for that pixel. 'composites' is
+the worst case (every pixel dirty, every layer transparent at that pixel); 'refresh' is
+what fake_display's compositor actually visited for a full refresh of the module's
+freshly initialised layers.
+
+Usage:
+    python tools/bench_layers.py                      # the current lib/logo_bitmaps.py
+    git show <rev>:lib/logo_bitmaps.py > /tmp/old.py
+    python tools/bench_layers.py /tmp/old.py lib/logo_bitmaps.py
+
+Author(s): Michael Ladderbush
+"""
+
+import importlib.util
+import os
+import sys
+
+import fake_display
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULE = os.path.join(ROOT, "lib", "logo_bitmaps.py")
+
+
+def _load(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Returns (layers, layers touched per refresh, layer composites per refresh, bitmap pixels).
+def measure(module):
+    display = module.display
+    screen_w = display.width
+    screen_h = display.height
+
+    layers = list(display.root_group)
+    composites = 0
+    touched = 0
+    for tilegrid in layers:
+        x0 = max(tilegrid.x, 0)
+        y0 = max(tilegrid.y, 0)
+        x1 = min(tilegrid.x + tilegrid.bitmap.width, screen_w)
+        y1 = min(tilegrid.y + tilegrid.bitmap.height, screen_h)
+        if x1 > x0 and y1 > y0:
+            touched += 1
+            composites += (x1 - x0) * (y1 - y0)
+
+    bitmaps = []
+    for tilegrid in layers:
+        if not any(tilegrid.bitmap is b for b in bitmaps):
+            bitmaps.append(tilegrid.bitmap)
+    pixels = sum(b.width * b.height for b in bitmaps)
+
+    fake_display.reset_stats()
+    display.root_group = display.root_group
+    display.refresh()
+
+    return len(layers), touched, composites, fake_display.stats["composites"], pixels
+
+
+def main(argv):
+    paths = argv[1:] or [DEFAULT_MODULE]
+    fake_display.install()
+
+    print(f"{'module':40s} {'depth':>6s} {'layers':>7s} {'composites':>11s} {'refresh':>8s} {'bitmap px':>10s}")
+    for i, path in enumerate(paths):
+        module = _load(path, f"_bench_logo_bitmaps_{i}")
+        depth, touched, composites, refreshed, pixels = measure(module)
+        label = os.path.relpath(path, ROOT) if path.startswith(ROOT) else path
+        print(f"{label:40s} {depth:6d} {touched:7d} {composites:11d} {refreshed:8d} {pixels:10d}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
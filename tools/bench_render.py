@@ -0,0 +1,233 @@
+"""
+Benchmark suite for the rendering hot paths
+=======================================================================================
+
+Times every drawing entry point the app uses (draw_sprite, cached glyphs at size 1 and 2,
+logo decode and swap, the scene's draw_frame for a full repaint and a clock tick,
+draw_city_menu laying the menu out and showing it once laid out, draw_selector and
+draw_future_game) and reports for each:
+
+    ops/s       calls per second, best batch of 'repeat' calls over MEASURE_SECS
+    px/op       pixels stored per call (host only, counted by tools/fake_display)
+    heap B/op   heap allocated per call: gc.mem_alloc() growth with gc disabled on the
+                board, tracemalloc's peak for one call on the host
+
+The results are compared against tools/bench_render_baseline.json. More pixels or more
+heap per call than the baseline is a regression and makes the host run exit with status
+1; ops/s below BASELINE_SPEED_FACTOR of the baseline is reported as slower, since it
+depends on the machine.
+
+Usage:
+    python tools/bench_render.py [repeat]          # compare against the baseline
+    python tools/bench_render.py --save [repeat]   # record the baseline
+
+On the board copy this file (and the baseline, if wanted) next to code.py and run
+`import bench_render` from the REPL. That is the timing mode: it uses the real display
+and bitmaptools and reads and writes the "device" section of the baseline.
+
+Author(s): Michael Ladderbush
+"""
+
+import gc
+import json
+import sys
+import time
+
+try:
+    import os
+    import tracemalloc
+    import fake_display
+
+    fake_display.install()
+    import logo_assets
+
+    logo_assets.LOGO_DIRS = (os.path.join(fake_display.ROOT, "logos"),)
+    BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_render_baseline.json")
+    PLATFORM = "host"
+except ImportError:
+    fake_display = None
+    tracemalloc = None
+    BASELINE_PATH = "bench_render_baseline.json"
+    PLATFORM = "device"
+
+from draw_tools import *
+from scene import scene
+
+BASELINE_SPEED_FACTOR = 0.7
+MEASURE_SECS = 0.25
+# Heap growth smaller than this is measurement noise.
+HEAP_SLACK_BYTES = 64
+
+
+class bench_frame:
+    def __init__(self, opponent, clock):
+        self.team = celtics
+        self.home_score = 101
+        self.away_score = 99
+        self.opponent = opponent
+        self.clock = clock
+        self.game_time = "Q3 5:59"
+        self.game_status = 2
+        self.period = 3
+
+
+_scene = scene()
+_frame = bench_frame("Knicks", "05:59")
+_glyph_w, _glyph_h, _glyph_pattern = GLYPHS["8"]
+_ticks = ["05:%02d" % s for s in range(60)]
+_tick = [0]
+_opponents = (knicks, lakers)
+_swap = [0]
+_selector = [0]
+
+
+def full_frame():
+    _scene.invalidate()
+    _scene.draw_frame(_frame)
+
+def clock_tick():
+    _tick[0] = (_tick[0] + 1) % len(_ticks)
+    _frame.clock = _ticks[_tick[0]]
+    _scene.draw_frame(_frame)
+
+def logo_swap():
+    _swap[0] ^= 1
+    draw_logo(_opponents[_swap[0]], 0, 0, 1)
+
+def logo_decode():
+    width, height, palette, packed = read_logo(lakers.logo)
+    draw_packed_pattern(home_logo_slot.bitmap, 0, 0, width, packed)
+
+# The first draw_city_menu(), which lays out every tricode in TEAM_ABBRS.
+def menu_layout():
+    menu_state["drawn"] = False
+    draw_city_menu()
+
+def selector():
+    _selector[0] = (_selector[0] + 1) % 30
+    draw_selector(_selector[0])
+
+
+# (name, call)
+CASES = (
+    ("draw_sprite size 1", lambda: draw_sprite(decal_bitmap, 9, 34, _glyph_w, _glyph_h, 1, _glyph_pattern, decal_palette, 0, True)),
+    ("draw_sprite size 2", lambda: draw_sprite(decal_bitmap, 9, 34, _glyph_w, _glyph_h, 2, _glyph_pattern, decal_palette, 0, True)),
+    ("draw_glyph size 1", lambda: draw_glyph(decal_bitmap, "8", 9, 34, 1)),
+    ("draw_glyph size 2", lambda: draw_glyph(decal_bitmap, "8", 9, 34, 2)),
+    ("logo decode 32x32", logo_decode),
+    ("draw_logo swap", logo_swap),
+    ("draw_frame full", full_frame),
+    ("draw_frame clock tick", clock_tick),
+    ("draw_city_menu layout", menu_layout),
+    ("draw_city_menu show", draw_city_menu),
+    ("draw_selector", selector),
+    ("draw_future_game", lambda: draw_future_game("2025-04-25", "7:00 PM", "Boston Celtics", "New York Knicks", False)),
+)
+
+
+def _pixel_writes():
+    return fake_display.stats["pixel_writes"] if fake_display is not None else None
+
+
+# Returns (ops/s, pixels per call, heap bytes per call) for 'fn'.
+def measure(fn, repeat):
+    # Two warm-up calls, so caches and both sides of the alternating cases are loaded.
+    fn()
+    fn()
+
+    start = _pixel_writes()
+    fn()
+    pixels = _pixel_writes() - start if start is not None else None
+
+    if tracemalloc is not None:
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        heap = tracemalloc.get_traced_memory()[1] - base
+        tracemalloc.stop()
+    else:
+        gc.collect()
+        gc.disable()
+        base = gc.mem_alloc()
+        for _ in range(repeat):
+            fn()
+        heap = (gc.mem_alloc() - base) // repeat
+        gc.enable()
+
+    # Best batch of 'repeat' calls over at least MEASURE_SECS, to ride out scheduler noise.
+    gc.collect()
+    best = 0
+    end = time.monotonic_ns() + int(MEASURE_SECS * 1e9)
+    while True:
+        start = time.monotonic_ns()
+        for _ in range(repeat):
+            fn()
+        now = time.monotonic_ns()
+        best = max(best, repeat * 1e9 / max(now - start, 1))
+        if now >= end:
+            return best, pixels, heap
+
+
+def load_baseline():
+    try:
+        with open(BASELINE_PATH, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(baseline):
+    with open(BASELINE_PATH, "w") as f:
+        try:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+        except TypeError:
+            # CircuitPython's json has no formatting options.
+            json.dump(baseline, f)
+
+
+# Runs every case. With 'save' the results become the baseline; otherwise they are
+# compared against it. Returns the number of regressions.
+def run(repeat=20, save=False):
+    baseline = load_baseline()
+    previous = baseline.get(PLATFORM, {})
+    results = {}
+    regressions = 0
+
+    print("platform:", PLATFORM, "engine:", "bitmaptools" if bitmaptools is not None else "row writes")
+    print("{:24s} {:>10s} {:>8s} {:>10s}  {}".format("case", "ops/s", "px/op", "heap B/op", "vs baseline"))
+    for name, fn in CASES:
+        rate, pixels, heap = measure(fn, repeat)
+        results[name] = {"ops_per_sec": round(rate, 1), "pixel_writes": pixels, "heap_bytes": heap}
+
+        notes = []
+        old = previous.get(name)
+        if old is None:
+            notes.append("new")
+        else:
+            if pixels is not None and old.get("pixel_writes") is not None and pixels > old["pixel_writes"]:
+                notes.append("REGRESSION px {} > {}".format(pixels, old["pixel_writes"]))
+                regressions += 1
+            if heap > old["heap_bytes"] + HEAP_SLACK_BYTES:
+                notes.append("REGRESSION heap {} > {}".format(heap, old["heap_bytes"]))
+                regressions += 1
+            if rate < old["ops_per_sec"] * BASELINE_SPEED_FACTOR:
+                notes.append("slower {:.0f}%".format(100 - 100 * rate / old["ops_per_sec"]))
+        print("{:24s} {:10.0f} {:>8s} {:10d}  {}".format(
+            name, rate, "-" if pixels is None else str(pixels), heap, ", ".join(notes) or "ok"))
+
+    if save:
+        baseline[PLATFORM] = results
+        save_baseline(baseline)
+        print("baseline saved to", BASELINE_PATH)
+    elif regressions:
+        print(regressions, "regression(s)")
+    return regressions
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    save = "--save" in args
+    args = [a for a in args if a != "--save"]
+    sys.exit(1 if run(int(args[0]) if args else 20, save) else 0)
+elif PLATFORM == "device":
+    run()
@@ -0,0 +1,115 @@
+"""
+Host-side benchmark for the streaming scoreboard parser
+=======================================================================================
+
+Runs fetch_game's two ways of reading todaysScoreboard_00.json over the recorded payloads
+in the repo and reports the peak heap and time per team:
+
+    json.load      what response.json() did: build the whole document, then pick the game
+    stream         lib/scoreboard_parser.py: scan 512 byte chunks, keep ten fields
+
+ApiExample.json is a serial console capture with the scoreboard printed as a Python dict,
+so it is converted back to the JSON the API sends. lib/Notepad.json is used as is. Both
+readers are fed from an in-memory stream through readinto, the same call the board makes
+on the socket. Peak heap comes from tracemalloc, so it is only the CPython picture; the
+board's objects are smaller but the ratio holds. The times are CPython's too, where json is
+written in C and the scanner is not, so the scanner looks slower here than it is next to the
+board's socket reads.
+
+Usage:
+    python tools/bench_scoreboard.py [repeat]
+
+Author(s): Michael Ladderbush
+"""
+
+import ast
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "lib"))
+
+import scoreboard_parser
+
+PAYLOADS = (
+    os.path.join(ROOT, "ApiExample.json"),
+    os.path.join(ROOT, "lib", "Notepad.json"),
+)
+
+
+# Returns the payload as the bytes the API would send.
+def load_payload(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        json.loads(data)
+        return data
+    except ValueError:
+        text = data.decode("utf-8")
+        line = text[text.find("{"):].strip().splitlines()[0]
+        return json.dumps(ast.literal_eval(line)).encode("utf-8")
+
+
+# fetch_game before the streaming parser: load everything, then look for the team.
+def read_with_json(stream, team):
+    data = json.load(stream)
+    for game in data.get("scoreboard", {}).get("games", []):
+        home = game.get("homeTeam", {})
+        away = game.get("awayTeam", {})
+        if team == home.get("teamName") or team == away.get("teamName"):
+            return (home.get("teamName"), home.get("score"), away.get("teamName"), away.get("score"),
+                    game.get("gameClock"), game.get("gameStatusText"), game.get("gameStatus"),
+                    game.get("period"), game.get("gameTimeUTC"), data.get("meta", {}).get("time"))
+    return None
+
+
+# Returns (result, peak heap bytes, seconds per call).
+def measure(reader, payload, team, repeat):
+    stream = io.BytesIO(payload)
+    tracemalloc.start()
+    result = reader(stream, team)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        reader(io.BytesIO(payload), team)
+    elapsed = (time.perf_counter() - start) / repeat
+    return result, peak, elapsed
+
+
+def team_names(payload):
+    names = []
+    for game in json.loads(payload)["scoreboard"]["games"]:
+        names.append(game["homeTeam"]["teamName"])
+        names.append(game["awayTeam"]["teamName"])
+    return names
+
+
+def run(repeat=20):
+    row = "{:16s} {:>9s} {:>9s} {:>7s} {:>9s} {:>9s}"
+    for path in PAYLOADS:
+        payload = load_payload(path)
+        names = team_names(payload)
+        print(f"{os.path.relpath(path, ROOT)}: {len(payload)} bytes, {len(names) // 2} games")
+        print(row.format("team", "json peak", "scan peak", "ratio", "json ms", "scan ms"))
+
+        worst_ratio = None
+        for team in names[0::2] + ["(no game)"]:
+            expected, json_peak, json_time = measure(read_with_json, payload, team, repeat)
+            result, scan_peak, scan_time = measure(scoreboard_parser.read_team_game, payload, team, repeat)
+            if result != expected:
+                raise AssertionError(f"{team}: {result} != {expected}")
+            ratio = json_peak / max(scan_peak, 1)
+            worst_ratio = ratio if worst_ratio is None else min(worst_ratio, ratio)
+            print("{:16s} {:9d} {:9d} {:6.0f}x {:9.2f} {:9.2f}".format(
+                team, json_peak, scan_peak, ratio, json_time * 1000, scan_time * 1000))
+        print(f"smallest heap saving: {worst_ratio:.0f}x\n")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
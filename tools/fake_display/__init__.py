@@ -0,0 +1,84 @@
+"""
+Host-side stand-in for displayio, rgbmatrix and framebufferio
+=======================================================================================
+
+Enough of the CircuitPython display stack for the drawing libraries, and the vendored
+adafruit_matrixportal.matrix that sets it up, to run unmodified under CPython. Call
+install() before importing logo_bitmaps or draw_tools; it registers displayio, rgbmatrix,
+framebufferio and board and puts lib/ on sys.path. bitmaptools is left out, so
+draw_tools takes its row-write fallback.
+
+Counters since the last reset_stats():
+
+    pixel_writes        pixels stored into any Bitmap
+    refreshes           FramebufferDisplay.refresh() calls
+    refreshed_pixels    pixels in the dirty areas those refreshes redrew
+    composites          layers visited while compositing those pixels
+
+snapshot() refreshes the display and returns the frame; save_png() and save_ppm() write it
+out so frames can be compared between revisions. NumPy is used for compositing when it is
+installed and is not needed otherwise.
+
+Author(s): Michael Ladderbush
+"""
+
+import os
+import struct
+import sys
+import zlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LIB = os.path.join(ROOT, "lib")
+
+stats = {"pixel_writes": 0, "refreshes": 0, "refreshed_pixels": 0, "composites": 0}
+
+
+def reset_stats():
+    for key in stats:
+        stats[key] = 0
+
+
+# Registers the stand-ins under the module names the drawing libraries import.
+def install():
+    from . import board, displayio, framebufferio, rgbmatrix
+
+    sys.modules["displayio"] = displayio
+    sys.modules["framebufferio"] = framebufferio
+    sys.modules["rgbmatrix"] = rgbmatrix
+    sys.modules["board"] = board
+    if LIB not in sys.path:
+        sys.path.insert(0, LIB)
+
+
+# The display logo_bitmaps set up.
+def display():
+    return sys.modules["logo_bitmaps"].display
+
+
+# Refreshes the display and returns (width, height, RGB bytes).
+def snapshot(target=None):
+    target = target or display()
+    target.refresh()
+    return target.width, target.height, target.rgb_bytes()
+
+
+def save_ppm(path, target=None):
+    width, height, rgb = snapshot(target)
+    with open(path, "wb") as f:
+        f.write(b"P6\n%d %d\n255\n" % (width, height))
+        f.write(rgb)
+
+
+def save_png(path, target=None):
+    width, height, rgb = snapshot(target)
+    stride = width * 3
+    raw = b"".join(b"\x00" + rgb[y * stride:(y + 1) * stride] for y in range(height))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(raw)))
+        f.write(chunk(b"IEND", b""))
@@ -0,0 +1,27 @@
+"""
+Host-side stand-in for board
+=======================================================================================
+
+Any pin name resolves to a placeholder, so the pin setup in adafruit_matrixportal.matrix
+runs whatever board os.uname() reports.
+
+Author(s): Michael Ladderbush
+"""
+
+board_id = "host"
+
+
+class Pin:
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return "board." + self.name
+
+
+def __getattr__(name):
+    if name.startswith("__"):
+        raise AttributeError(name)
+    pin = Pin(name)
+    globals()[name] = pin
+    return pin
@@ -0,0 +1,201 @@
+"""
+Host-side stand-in for displayio
+=======================================================================================
+
+Bitmap, Palette, TileGrid, Group and ColorConverter with the parts of the CircuitPython API
+the drawing libraries use. Bitmaps keep one byte per pixel and track the rectangle written
+since the last refresh, like displayio's dirty areas, so FramebufferDisplay.refresh() only
+composites what changed. TileGrids are single-tile, which is all this project creates.
+
+Every pixel store adds to stats["pixel_writes"] and the bitmap's own 'writes' counter.
+
+Author(s): Michael Ladderbush
+"""
+
+from . import stats
+
+
+class Colorspace:
+    RGB888 = "RGB888"
+    RGB565 = "RGB565"
+    RGB555 = "RGB555"
+    L8 = "L8"
+
+
+class Bitmap:
+    def __init__(self, width, height, value_count):
+        if value_count > 256:
+            raise ValueError("value_count must be 256 or less")
+        self.width = width
+        self.height = height
+        self.value_count = value_count
+        self.pixels = bytearray(width * height)
+        self.writes = 0
+        self.dirty = None
+        self.mark_dirty(0, 0, width, height)
+
+    # Grows the dirty rectangle to cover [x0, x1) x [y0, y1).
+    def mark_dirty(self, x0, y0, x1, y1):
+        dirty = self.dirty
+        if dirty is None:
+            self.dirty = [x0, y0, x1, y1]
+            return
+        if x0 < dirty[0]:
+            dirty[0] = x0
+        if y0 < dirty[1]:
+            dirty[1] = y0
+        if x1 > dirty[2]:
+            dirty[2] = x1
+        if y1 > dirty[3]:
+            dirty[3] = y1
+
+    def _index(self, key):
+        if isinstance(key, tuple):
+            x, y = key
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise IndexError("pixel out of bounds")
+            return y * self.width + x
+        if not 0 <= key < len(self.pixels):
+            raise IndexError("pixel out of bounds")
+        return key
+
+    def __setitem__(self, key, value):
+        if not 0 <= value < self.value_count:
+            raise ValueError("value out of range")
+        index = self._index(key)
+        self.pixels[index] = value
+        self.writes += 1
+        stats["pixel_writes"] += 1
+        y, x = divmod(index, self.width)
+        self.mark_dirty(x, y, x + 1, y + 1)
+
+    def __getitem__(self, key):
+        return self.pixels[self._index(key)]
+
+    def fill(self, value):
+        self.pixels[:] = bytes((value,)) * len(self.pixels)
+        self.writes += len(self.pixels)
+        stats["pixel_writes"] += len(self.pixels)
+        self.mark_dirty(0, 0, self.width, self.height)
+
+
+class Palette:
+    def __init__(self, color_count, dither=False):
+        self._colors = [0] * color_count
+        self.transparent = bytearray(color_count)
+        self.changed = True
+
+    def __setitem__(self, index, color):
+        self._colors[index] = color
+        self.changed = True
+
+    def __getitem__(self, index):
+        return self._colors[index]
+
+    def __len__(self):
+        return len(self._colors)
+
+    def make_transparent(self, index):
+        self.transparent[index] = 1
+        self.changed = True
+
+    def make_opaque(self, index):
+        self.transparent[index] = 0
+        self.changed = True
+
+    def is_transparent(self, index):
+        return bool(self.transparent[index])
+
+
+class ColorConverter:
+    def __init__(self, *, input_colorspace=Colorspace.RGB888, dither=False):
+        self.input_colorspace = input_colorspace
+        self.transparent = None
+
+    # Returns 'color' as RGB888.
+    def convert(self, color):
+        if self.input_colorspace == Colorspace.RGB565:
+            r = (color >> 11) & 0x1F
+            g = (color >> 5) & 0x3F
+            b = color & 0x1F
+            return ((r * 255 // 31) << 16) | ((g * 255 // 63) << 8) | (b * 255 // 31)
+        return color & 0xFFFFFF
+
+    def make_transparent(self, color):
+        self.transparent = color
+
+    def make_opaque(self, color):
+        self.transparent = None
+
+
+class TileGrid:
+    def __init__(self, bitmap, *, pixel_shader, width=1, height=1, tile_width=None,
+                 tile_height=None, default_tile=0, x=0, y=0):
+        if width != 1 or height != 1:
+            raise NotImplementedError("only single-tile TileGrids are simulated")
+        self._bitmap = bitmap
+        self._pixel_shader = pixel_shader
+        self._x = x
+        self._y = y
+        self._hidden = False
+        # Display area covered since the last refresh, for moves and swaps.
+        self.moved = True
+
+    def _swap(self, name, value):
+        if getattr(self, name) is not value:
+            setattr(self, name, value)
+            self.moved = True
+
+    bitmap = property(lambda self: self._bitmap, lambda self, v: self._swap("_bitmap", v))
+    pixel_shader = property(lambda self: self._pixel_shader, lambda self, v: self._swap("_pixel_shader", v))
+    x = property(lambda self: self._x, lambda self, v: self._swap("_x", v))
+    y = property(lambda self: self._y, lambda self, v: self._swap("_y", v))
+    hidden = property(lambda self: self._hidden, lambda self, v: self._swap("_hidden", v))
+
+    @property
+    def width(self):
+        return self._bitmap.width
+
+    @property
+    def height(self):
+        return self._bitmap.height
+
+
+class Group(list):
+    def __init__(self, *, scale=1, x=0, y=0):
+        super().__init__()
+        if scale != 1:
+            raise NotImplementedError("only scale=1 Groups are simulated")
+        self.scale = scale
+        self.x = x
+        self.y = y
+        self.hidden = False
+        self.changed = True
+
+    def append(self, layer):
+        super().append(layer)
+        self.changed = True
+
+    def insert(self, index, layer):
+        super().insert(index, layer)
+        self.changed = True
+
+    def remove(self, layer):
+        super().remove(layer)
+        self.changed = True
+
+    def pop(self, index=-1):
+        self.changed = True
+        return super().pop(index)
+
+    def __setitem__(self, index, layer):
+        super().__setitem__(index, layer)
+        self.changed = True
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.changed = True
+
+
+def release_displays():
+    pass
@@ -0,0 +1,206 @@
+"""
+Host-side stand-in for framebufferio
+=======================================================================================
+
+FramebufferDisplay composites its root_group into an RGB frame when refresh() is called,
+the way displayio does on the board: only the union of the dirty areas is redrawn, and
+each pixel in it walks the layers from the top down until it hits an opaque one. Every
+layer visited for a pixel adds to stats["composites"].
+
+With NumPy installed the frame is an (height, width, 3) uint8 array and layers are
+composited a whole rectangle at a time; without it the frame is a bytearray of RGB
+triples and the walk is done pixel by pixel. The results are the same.
+
+Nothing refreshes in the background on the host. Call refresh(), or fake_display.snapshot()
+which refreshes first.
+
+Author(s): Michael Ladderbush
+"""
+
+from . import stats
+from .displayio import Group, TileGrid
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class FramebufferDisplay:
+    def __init__(self, framebuffer, *, rotation=0, auto_refresh=True):
+        if rotation:
+            raise NotImplementedError("only rotation=0 is simulated")
+        self.framebuffer = framebuffer
+        self.width = framebuffer.width
+        self.height = framebuffer.height
+        self.rotation = rotation
+        self.auto_refresh = auto_refresh
+        self.brightness = 1.0
+        self._root_group = None
+        self._areas = {}
+        if numpy is not None:
+            self.frame = numpy.zeros((self.height, self.width, 3), dtype=numpy.uint8)
+        else:
+            self.frame = bytearray(self.width * self.height * 3)
+        self._full = True
+
+    @property
+    def root_group(self):
+        return self._root_group
+
+    @root_group.setter
+    def root_group(self, group):
+        self._root_group = group
+        self._full = True
+
+    # (tilegrid, display x, display y) for every visible tile grid, bottom to top.
+    def layers(self):
+        out = []
+        if self._root_group is not None:
+            self._collect(self._root_group, 0, 0, out)
+        return out
+
+    def _collect(self, layer, x, y, out):
+        if layer.hidden:
+            return
+        if isinstance(layer, Group):
+            if layer.changed:
+                self._full = True
+                layer.changed = False
+            for child in layer:
+                self._collect(child, x + layer.x, y + layer.y, out)
+        elif isinstance(layer, TileGrid):
+            out.append((layer, x + layer.x, y + layer.y))
+
+    # Union of the areas to redraw as [x0, y0, x1, y1] clipped to the screen, or None.
+    def _dirty_area(self, layers):
+        area = None
+        seen = {}
+        for tilegrid, x, y in layers:
+            rect = (x, y, x + tilegrid.width, y + tilegrid.height)
+            key = id(tilegrid)
+            seen[key] = rect
+            old = self._areas.get(key)
+            rects = []
+            palette = tilegrid.pixel_shader
+            if self._full or tilegrid.moved or old != rect or getattr(palette, "changed", False):
+                rects.append(rect)
+                if old is not None and old != rect:
+                    rects.append(old)
+            elif tilegrid.bitmap.dirty is not None:
+                d = tilegrid.bitmap.dirty
+                rects.append((x + d[0], y + d[1], x + d[2], y + d[3]))
+            for r in rects:
+                if area is None:
+                    area = list(r)
+                else:
+                    area = [min(area[0], r[0]), min(area[1], r[1]), max(area[2], r[2]), max(area[3], r[3])]
+        # Layers that went away leave their old area to repaint.
+        for key, old in self._areas.items():
+            if key not in seen:
+                area = list(old) if area is None else [min(area[0], old[0]), min(area[1], old[1]),
+                                                       max(area[2], old[2]), max(area[3], old[3])]
+        if self._full:
+            area = [0, 0, self.width, self.height]
+        self._areas = seen
+        if area is None:
+            return None
+        area = [max(area[0], 0), max(area[1], 0), min(area[2], self.width), min(area[3], self.height)]
+        if area[0] >= area[2] or area[1] >= area[3]:
+            return None
+        return area
+
+    # Composites the dirty area into 'frame'. Returns True if anything was redrawn.
+    def refresh(self, *, target_frames_per_second=None, minimum_frames_per_second=0):
+        layers = self.layers()
+        area = self._dirty_area(layers)
+        for tilegrid, _, _ in layers:
+            tilegrid.moved = False
+            tilegrid.bitmap.dirty = None
+            if hasattr(tilegrid.pixel_shader, "changed"):
+                tilegrid.pixel_shader.changed = False
+        self._full = False
+        stats["refreshes"] += 1
+        if area is None:
+            return False
+        x0, y0, x1, y1 = area
+        stats["refreshed_pixels"] += (x1 - x0) * (y1 - y0)
+        if numpy is not None:
+            self._composite_numpy(layers, x0, y0, x1, y1)
+        else:
+            self._composite(layers, x0, y0, x1, y1)
+        return True
+
+    def _composite(self, layers, x0, y0, x1, y1):
+        frame = self.frame
+        top_down = layers[::-1]
+        composites = 0
+        for py in range(y0, y1):
+            for px in range(x0, x1):
+                color = 0
+                for tilegrid, x, y in top_down:
+                    bx = px - x
+                    by = py - y
+                    bitmap = tilegrid.bitmap
+                    if not (0 <= bx < bitmap.width and 0 <= by < bitmap.height):
+                        continue
+                    composites += 1
+                    index = bitmap.pixels[by * bitmap.width + bx]
+                    palette = tilegrid.pixel_shader
+                    if index >= len(palette) or palette.transparent[index]:
+                        continue
+                    color = palette[index]
+                    break
+                i = (py * self.width + px) * 3
+                frame[i] = (color >> 16) & 0xFF
+                frame[i + 1] = (color >> 8) & 0xFF
+                frame[i + 2] = color & 0xFF
+        stats["composites"] += composites
+
+    def _composite_numpy(self, layers, x0, y0, x1, y1):
+        h = y1 - y0
+        w = x1 - x0
+        out = numpy.zeros((h, w, 3), dtype=numpy.uint8)
+        filled = numpy.zeros((h, w), dtype=bool)
+        composites = 0
+        for tilegrid, x, y in layers[::-1]:
+            bitmap = tilegrid.bitmap
+            lx0 = max(x0, x)
+            ly0 = max(y0, y)
+            lx1 = min(x1, x + bitmap.width)
+            ly1 = min(y1, y + bitmap.height)
+            if lx0 >= lx1 or ly0 >= ly1:
+                continue
+            palette = tilegrid.pixel_shader
+            pixels = numpy.frombuffer(bitmap.pixels, dtype=numpy.uint8).reshape(bitmap.height, bitmap.width)
+            sub = pixels[ly0 - y:ly1 - y, lx0 - x:lx1 - x]
+            region = (slice(ly0 - y0, ly1 - y0), slice(lx0 - x0, lx1 - x0))
+            open_px = ~filled[region]
+            composites += int(open_px.sum())
+
+            lut = numpy.zeros((256, 3), dtype=numpy.uint8)
+            opaque = numpy.zeros(256, dtype=bool)
+            for i in range(len(palette)):
+                color = palette[i]
+                lut[i] = ((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF)
+                opaque[i] = not palette.transparent[i]
+            take = open_px & opaque[sub]
+            out[region][take] = lut[sub][take]
+            filled[region] |= take
+        self.frame[y0:y1, x0:x1] = out
+        stats["composites"] += composites
+
+    # The composited color of (x, y) as 0xRRGGBB.
+    def pixel(self, x, y):
+        if numpy is not None:
+            r, g, b = (int(c) for c in self.frame[y, x])
+        else:
+            i = (y * self.width + x) * 3
+            r, g, b = self.frame[i], self.frame[i + 1], self.frame[i + 2]
+        return (r << 16) | (g << 8) | b
+
+    # The frame as bytes of RGB triples, row by row.
+    def rgb_bytes(self):
+        if numpy is not None:
+            return self.frame.tobytes()
+        return bytes(self.frame)
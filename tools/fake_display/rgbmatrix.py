@@ -0,0 +1,26 @@
+"""
+Host-side stand-in for rgbmatrix
+=======================================================================================
+
+RGBMatrix only records its size and settings; FramebufferDisplay does the drawing.
+
+Author(s): Michael Ladderbush
+"""
+
+
+class RGBMatrix:
+    def __init__(self, *, width, bit_depth, rgb_pins, addr_pins, clock_pin, latch_pin,
+                 output_enable_pin, height=0, tile=1, serpentine=True, doublebuffer=True,
+                 framebuffer=None):
+        self.width = width
+        self.height = height or 2 * len(rgb_pins) // 6 * (1 << len(addr_pins))
+        self.bit_depth = bit_depth
+        self.tile = tile
+        self.brightness = 1.0
+        self.paused = False
+
+    def refresh(self):
+        pass
+
+    def deinit(self):
+        pass
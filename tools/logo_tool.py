@@ -0,0 +1,187 @@
+"""
+Host-side converter for team logo assets
+=======================================================================================
+
+Turns a BMP into the indexed binary logo format read by lib/logo_assets.py and can print
+an asset back as text for checking.
+
+The BMP is center cropped (or padded) to 32x32. The top-left pixel's color becomes the
+transparent index 0. If the art uses more than 15 other colors, the 15 most used colors are
+kept and every other pixel is mapped to the nearest of them.
+
+Usage:
+    python tools/logo_tool.py bmp bmps/celtics_logo.bmp logos/celtics.logo
+    python tools/logo_tool.py dump logos/celtics.logo
+
+Copy the .logo file to /logos on CIRCUITPY or /logos on the SD card.
+
+Author(s): Michael Ladderbush
+"""
+
+import struct
+import sys
+
+LOGO_MAGIC = b"NBAL"
+LOGO_VERSION = 1
+LOGO_SIZE = 32
+MAX_COLORS = 16
+MAX_RUN = 16
+
+
+# Packs a flat list of palette indexes into run-length bytes, row by row.
+# Each byte is one run: low nibble palette index, high nibble run length minus one.
+def pack(pattern, width):
+    out = bytearray()
+    for start in range(0, len(pattern), width):
+        row = pattern[start:start + width]
+        i = 0
+        while i < width:
+            value = row[i]
+            if not 0 <= value < MAX_COLORS:
+                raise ValueError(f"palette index {value} does not fit in a nibble")
+            run = 1
+            while i + run < width and run < MAX_RUN and row[i + run] == value:
+                run += 1
+            out.append(((run - 1) << 4) | value)
+            i += run
+    return bytes(out)
+
+
+# Expands run-length bytes back into a flat bytearray of palette indexes.
+def unpack(packed):
+    out = bytearray()
+    for run in packed:
+        out.extend(bytes((run & 0x0F,)) * ((run >> 4) + 1))
+    return out
+
+
+def write_logo(path, width, height, colors, pattern):
+    if len(colors) > MAX_COLORS:
+        raise ValueError("a logo can use at most 16 colors")
+    with open(path, "wb") as f:
+        f.write(LOGO_MAGIC + bytes((LOGO_VERSION, width, height, len(colors))))
+        for color in colors:
+            f.write(bytes(((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF)))
+        f.write(pack(pattern, width))
+
+
+def read_logo(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[0:4] != LOGO_MAGIC or data[4] != LOGO_VERSION:
+        raise ValueError(f"{path} is not a version {LOGO_VERSION} logo asset")
+    width, height, count = data[5], data[6], data[7]
+    colors = [int.from_bytes(data[8 + 3 * i:11 + 3 * i], "big") for i in range(count)]
+    pattern = unpack(data[8 + 3 * count:])
+    if len(pattern) != width * height:
+        raise ValueError(f"{path} pattern does not match {width}x{height}")
+    return width, height, colors, pattern
+
+
+# Reads an uncompressed 1, 4, 8, 24 or 32 bit BMP as rows of 0xRRGGBB colors, top row first.
+def read_bmp(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[0:2] != b"BM":
+        raise ValueError(f"{path} is not a BMP")
+
+    offset = struct.unpack_from("<I", data, 10)[0]
+    header_size, width, height, _, bpp, compression = struct.unpack_from("<IiiHHI", data, 14)
+    if compression not in (0, 3):
+        raise ValueError(f"{path} is compressed; save it as an uncompressed BMP")
+
+    palette = []
+    if bpp <= 8:
+        count = struct.unpack_from("<I", data, 46)[0] or (1 << bpp)
+        for i in range(count):
+            b, g, r = data[14 + header_size + 4 * i:17 + header_size + 4 * i]
+            palette.append((r << 16) | (g << 8) | b)
+
+    stride = ((width * bpp + 31) // 32) * 4
+    rows = []
+    for y in range(abs(height)):
+        row = data[offset + y * stride:offset + (y + 1) * stride]
+        pixels = []
+        for x in range(width):
+            if bpp == 24 or bpp == 32:
+                step = bpp // 8
+                b, g, r = row[x * step:x * step + 3]
+                pixels.append((r << 16) | (g << 8) | b)
+            else:
+                bit = x * bpp
+                index = (row[bit // 8] >> (8 - bpp - bit % 8)) & ((1 << bpp) - 1)
+                pixels.append(palette[index])
+        rows.append(pixels)
+    if height > 0:
+        rows.reverse()
+    return rows
+
+
+# Center crops or pads the rows to size x size, padding with 'fill'.
+def fit(rows, size, fill):
+    height = len(rows)
+    width = len(rows[0])
+    top = (height - size) // 2
+    left = (width - size) // 2
+    out = []
+    for y in range(size):
+        sy = y + top
+        for x in range(size):
+            sx = x + left
+            out.append(rows[sy][sx] if 0 <= sy < height and 0 <= sx < width else fill)
+    return out
+
+
+def _distance(a, b):
+    return sum((((a >> s) & 0xFF) - ((b >> s) & 0xFF)) ** 2 for s in (16, 8, 0))
+
+
+# Maps 0xRRGGBB pixels to palette indexes, 'transparent' becoming index 0.
+def quantize(pixels, transparent):
+    counts = {}
+    for color in pixels:
+        if color != transparent:
+            counts[color] = counts.get(color, 0) + 1
+    kept = sorted(counts, key=lambda c: -counts[c])[:MAX_COLORS - 1]
+    colors = [0x000000] + kept
+
+    lookup = {transparent: 0}
+    for color in counts:
+        if color in kept:
+            lookup[color] = kept.index(color) + 1
+        else:
+            lookup[color] = min(range(1, len(colors)), key=lambda i: _distance(color, colors[i]))
+    return colors, [lookup[color] for color in pixels]
+
+
+def convert_bmp(bmp_path, logo_path, size=LOGO_SIZE):
+    rows = read_bmp(bmp_path)
+    transparent = rows[0][0]
+    colors, pattern = quantize(fit(rows, size, transparent), transparent)
+    write_logo(logo_path, size, size, colors, pattern)
+    return colors, pattern
+
+
+def dump(path):
+    width, height, colors, pattern = read_logo(path)
+    print(f"{path}: {width}x{height}, {len(colors)} colors")
+    for i, color in enumerate(colors):
+        print(f"  {i:x}: {'transparent' if i == 0 else f'0x{color:06X}'}")
+    for y in range(height):
+        print("  " + "".join(".123456789abcdef"[v] for v in pattern[y * width:(y + 1) * width]))
+
+
+def main(argv):
+    if len(argv) == 4 and argv[1] == "bmp":
+        colors, pattern = convert_bmp(argv[2], argv[3])
+        print(f"wrote {argv[3]}: {len(colors)} colors, {len(pack(pattern, LOGO_SIZE))} pattern bytes")
+    elif len(argv) == 3 and argv[1] == "dump":
+        dump(argv[2])
+    else:
+        print(__doc__)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,91 @@
+"""
+Memory report for team logo storage
+=======================================================================================
+
+Logos used to be flat tuples in logos.py, held in RAM from import onward. They now live
+in asset files and only the resident ones are loaded. This measures the heap held by the
+30 patterns kept as the packed bytes stored in the assets against the same patterns
+expanded into the old tuples.
+
+On the board copy this file next to code.py and run `import mem_report` from the REPL;
+the numbers are gc.mem_free() deltas. On the host they are sys.getsizeof totals of the
+pattern objects, where a tuple slot is 8 bytes instead of the board's 4.
+
+Author(s): Michael Ladderbush
+"""
+
+import gc
+import os
+import sys
+
+try:
+    mem_free = gc.mem_free
+except AttributeError:
+    mem_free = None
+    _root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, os.path.join(_root, "lib"))
+
+    import fake_display
+
+    fake_display.install()
+
+import logo_assets
+
+if mem_free is None:
+    logo_assets.LOGO_DIRS = (os.path.join(_root, "logos"),)
+
+LOGO_NAMES = (
+    "hawks", "celtics", "nets", "hornets", "bulls", "cavaliers", "mavericks", "nuggets",
+    "pistons", "warriors", "rockets", "pacers", "clippers", "lakers", "grizzlies", "heat",
+    "bucks", "timberwolves", "pelicans", "knicks", "thunder", "magic", "sixers", "suns",
+    "trail_blazers", "kings", "spurs", "raptors", "jazz", "wizards",
+)
+
+
+def _start():
+    gc.collect()
+    return mem_free() if mem_free is not None else 0
+
+
+# Heap taken since _start(). Without gc.mem_free the size of 'objects' is used instead.
+def _used(start, objects):
+    gc.collect()
+    if mem_free is not None:
+        return start - mem_free()
+    return sum(sys.getsizeof(o) for o in objects)
+
+
+# Reads a logo's packed pattern without building a palette.
+def _packed(name):
+    f = logo_assets.open_logo(name)
+    try:
+        data = f.read()
+    finally:
+        f.close()
+    return data[8 + 3 * data[7]:]
+
+
+def _expand(packed):
+    pattern = []
+    for run in packed:
+        pattern.extend([run & 0x0F] * ((run >> 4) + 1))
+    return tuple(pattern)
+
+
+def run():
+    start = _start()
+    packed = [_packed(name) for name in LOGO_NAMES]
+    packed_bytes = _used(start, packed)
+
+    start = _start()
+    tuples = [_expand(p) for p in packed]
+    tuple_bytes = _used(start, tuples)
+
+    print("patterns:           ", len(packed))
+    print("packed:             ", packed_bytes, "bytes")
+    print("tuples:             ", tuple_bytes, "bytes")
+    print("saved:              ", tuple_bytes - packed_bytes, "bytes")
+    return tuples
+
+
+run()
@@ -0,0 +1,367 @@
+"""
+Record-and-replay stand-in for the NBA scoreboard feed
+=======================================================================================
+
+Serves a timeline of todaysScoreboard_00.json snapshots from localhost so polling and
+rendering can be run through a whole game in minutes. Point the board (or the simulator)
+at it by setting SCOREBOARD_URL in settings.toml, e.g.
+
+    SCOREBOARD_URL = "http://192.168.1.165:5000/todaysScoreboard_00.json"
+
+A timeline is a JSON lines file of {"t": seconds from the start, "body": scoreboard}. It
+can come from:
+
+    record      polling the live feed:  replay_server.py record out.jsonl [interval]
+    simulate    a generated game from a capture's first game (or --team), with the clock
+                running and stopping, scores, periods, halftime and the final
+    a capture   a single snapshot such as lib/Notepad.json or ApiExample.json, served as is
+
+The server plays the timeline at --speed times real time, answers If-None-Match with 304
+like the CDN, keeps connections alive, and can inject faults:
+
+    --latency MS        delay before every response (plus up to --jitter MS)
+    --error-rate P      answer 503 with probability P
+    --truncate-rate P   cut the body short and drop the connection with probability P
+
+GET /fake_clock_init restarts the timeline and /fake_clock serves it, for the
+TEST_SCOREBOARD_URL pair in API_Connection. GET /status shows where playback is.
+
+Usage:
+    python tools/replay_server.py serve [timeline.jsonl | capture.json] [options]
+    python tools/replay_server.py simulate out.jsonl [capture.json] [--team BOS] [--seed N]
+    python tools/replay_server.py record out.jsonl [interval secs]
+
+Author(s): Michael Ladderbush
+"""
+
+import argparse
+import ast
+import copy
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CAPTURE = os.path.join(ROOT, "lib", "Notepad.json")
+LIVE_URL = "https://cdn.nba.com/static/json/liveData/scoreboard/todaysScoreboard_00.json"
+SCOREBOARD_PATHS = ("/todaysScoreboard_00.json", "/static/json/liveData/scoreboard/todaysScoreboard_00.json",
+                    "/fake_clock")
+
+# Simulated game shape, in seconds.
+PERIOD_SECS = 12 * 60
+PREGAME_SECS = 120
+PERIOD_BREAK_SECS = 130
+HALFTIME_SECS = 900
+SNAPSHOT_SECS = 5
+
+
+# Reads a scoreboard capture: plain JSON, or a serial console log with the dict printed on it
+# (as ApiExample.json is).
+def load_capture(path):
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    try:
+        return json.loads(text)
+    except ValueError:
+        start = text.find("{")
+        return ast.literal_eval(text[start:].strip().splitlines()[0])
+
+
+def load_timeline(path):
+    if not path.endswith(".jsonl"):
+        return [(0.0, load_capture(path))]
+    timeline = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                timeline.append((float(entry["t"]), entry["body"]))
+    timeline.sort(key=lambda e: e[0])
+    return timeline
+
+
+def save_timeline(path, timeline):
+    with open(path, "w", encoding="utf-8") as f:
+        for t, body in timeline:
+            f.write(json.dumps({"t": t, "body": body}, separators=(",", ":")) + "\n")
+
+
+def clock_str(secs):
+    return "PT%02dM%05.2fS" % (int(secs) // 60, secs - int(secs) // 60 * 60)
+
+
+def status_text(period, secs):
+    if secs <= 0:
+        return "End of %s" % ("Q%d" % period if period <= 4 else "OT")
+    return "Q%d %d:%02d" % (period, int(secs) // 60, int(secs) % 60)
+
+
+def meta_time(start, t):
+    stamp = time.gmtime(start + t)
+    return time.strftime("%Y-%m-%d %H:%M:%S", stamp) + ".%04d" % int((t % 1) * 10000)
+
+
+# Generates a timeline for one game of 'capture': a short pregame, four periods with the
+# clock running in bursts and stopping for fouls and timeouts, breaks, halftime, and the
+# final. Overtime is played until the game is not tied.
+def simulate(capture, team=None, seed=1):
+    rng = random.Random(seed)
+    games = capture["scoreboard"]["games"]
+    index = 0
+    if team:
+        for i, game in enumerate(games):
+            if team.upper() in (game["homeTeam"]["teamTricode"], game["awayTeam"]["teamTricode"]):
+                index = i
+                break
+        else:
+            raise SystemExit("no game for " + team + " in the capture")
+
+    start = time.time()
+    timeline = []
+    scores = [0, 0]
+    state = {"status": 1, "period": 0, "clock": 0.0, "text": games[index].get("gameStatusText", "")}
+
+    def snapshot(t):
+        body = copy.deepcopy(capture)
+        game = body["scoreboard"]["games"][index]
+        game["gameStatus"] = state["status"]
+        game["gameStatusText"] = state["text"]
+        game["period"] = state["period"]
+        game["gameClock"] = clock_str(state["clock"]) if state["status"] == 2 else ""
+        game["homeTeam"]["score"] = scores[0]
+        game["awayTeam"]["score"] = scores[1]
+        body["meta"]["time"] = meta_time(start, t)
+        timeline.append((round(t, 2), body))
+
+    t = 0.0
+    while t < PREGAME_SECS:
+        snapshot(t)
+        t += SNAPSHOT_SECS
+
+    period = 0
+    while period < 4 or scores[0] == scores[1]:
+        period += 1
+        state.update(status=2, period=period, clock=float(PERIOD_SECS if period <= 4 else 300))
+        running = True
+        burst = rng.uniform(20, 90)
+        while state["clock"] > 0:
+            state["text"] = status_text(period, state["clock"])
+            snapshot(t)
+            t += SNAPSHOT_SECS
+            if running:
+                state["clock"] = max(0.0, state["clock"] - SNAPSHOT_SECS)
+                burst -= SNAPSHOT_SECS
+                if rng.random() < 0.15:
+                    scores[rng.randrange(2)] += 3 if rng.random() < 0.35 else 2
+                if burst <= 0:
+                    running = False
+                    burst = rng.uniform(10, 75)
+            else:
+                burst -= SNAPSHOT_SECS
+                if rng.random() < 0.1:
+                    scores[rng.randrange(2)] += 1
+                if burst <= 0:
+                    running = True
+                    burst = rng.uniform(20, 90)
+        state["text"] = status_text(period, 0)
+        pause = HALFTIME_SECS if period == 2 else PERIOD_BREAK_SECS
+        if period >= 4 and scores[0] != scores[1]:
+            break
+        if period == 2:
+            state["text"] = "Half"
+        end = t + pause
+        while t < end:
+            snapshot(t)
+            t += SNAPSHOT_SECS
+
+    state.update(status=3, clock=0.0, text="Final" if period <= 4 else "Final/OT%d" % (period - 4))
+    snapshot(t)
+    return timeline
+
+
+class replay:
+    def __init__(self, timeline, speed=1.0):
+        self.bodies = [json.dumps(body, separators=(",", ":")).encode() for _, body in timeline]
+        self.times = [t for t, _ in timeline]
+        self.speed = speed
+        self.lock = threading.Lock()
+        self.restart()
+
+    def restart(self):
+        with self.lock:
+            self.started = time.monotonic()
+
+    def position(self):
+        return (time.monotonic() - self.started) * self.speed
+
+    # Index of the snapshot to serve now.
+    def current(self):
+        t = self.position()
+        low, high = 0, len(self.times)
+        while low < high:
+            mid = (low + high) // 2
+            if self.times[mid] <= t:
+                low = mid + 1
+            else:
+                high = mid
+        return max(low - 1, 0)
+
+
+def make_handler(player, options):
+    rng = random.Random(options.seed)
+    stats = {"requests": 0, "not_modified": 0, "errors": 0, "truncated": 0}
+
+    class handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            if options.verbose:
+                sys.stderr.write("%s %s\n" % (self.address_string(), fmt % args))
+
+        def send_text(self, code, text, content_type="text/plain"):
+            body = text.encode()
+            self.send_response(code)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/fake_clock_init":
+                player.restart()
+                self.send_text(200, "OK")
+                return
+            if path == "/status":
+                index = player.current()
+                self.send_text(200, json.dumps({"position": round(player.position(), 1), "snapshot": index,
+                                                "snapshots": len(player.bodies), "stats": stats}),
+                               "application/json")
+                return
+            if path not in SCOREBOARD_PATHS:
+                self.send_text(404, "not found")
+                return
+
+            stats["requests"] += 1
+            delay = options.latency + rng.uniform(0, options.jitter)
+            if delay:
+                time.sleep(delay / 1000.0)
+            if rng.random() < options.error_rate:
+                stats["errors"] += 1
+                self.send_text(503, "Service Unavailable")
+                return
+
+            index = player.current()
+            etag = '"%d"' % index
+            if self.headers.get("If-None-Match") == etag:
+                stats["not_modified"] += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            body = player.bodies[index]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "max-age=0")
+            self.end_headers()
+            if rng.random() < options.truncate_rate:
+                stats["truncated"] += 1
+                self.wfile.write(body[:rng.randrange(1, len(body))])
+                self.close_connection = True
+                return
+            self.wfile.write(body)
+
+    return handler
+
+
+def serve(options):
+    source = options.timeline or DEFAULT_CAPTURE
+    timeline = load_timeline(source)
+    if options.simulate:
+        timeline = simulate(timeline[0][1], options.team, options.seed)
+    player = replay(timeline, options.speed)
+    server = ThreadingHTTPServer((options.host, options.port), make_handler(player, options))
+    length = timeline[-1][0] / options.speed
+    print("serving %d snapshots (%.0f s at %gx) on http://%s:%d/todaysScoreboard_00.json"
+          % (len(timeline), length, options.speed, options.host, options.port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def record(path, interval):
+    timeline = []
+    start = time.monotonic()
+    last = None
+    print("recording", LIVE_URL, "every", interval, "s to", path, "(Ctrl-C to stop)")
+    try:
+        while True:
+            try:
+                with urllib.request.urlopen(LIVE_URL, timeout=10) as response:
+                    body = json.loads(response.read())
+            except (OSError, ValueError) as e:
+                print("fetch failed:", e)
+            else:
+                if body != last:
+                    timeline.append((round(time.monotonic() - start, 2), body))
+                    last = body
+                    save_timeline(path, timeline)
+                    print(len(timeline), "snapshots")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Replay recorded NBA scoreboard timelines.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("serve")
+    p.add_argument("timeline", nargs="?", help=".jsonl timeline or a single capture (default lib/Notepad.json)")
+    p.add_argument("--host", default="0.0.0.0")
+    p.add_argument("--port", type=int, default=5000)
+    p.add_argument("--speed", type=float, default=1.0)
+    p.add_argument("--simulate", action="store_true", help="generate a game from the capture")
+    p.add_argument("--team", help="tricode of the game to simulate")
+    p.add_argument("--latency", type=float, default=0.0, help="ms")
+    p.add_argument("--jitter", type=float, default=0.0, help="ms")
+    p.add_argument("--error-rate", type=float, default=0.0)
+    p.add_argument("--truncate-rate", type=float, default=0.0)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--verbose", action="store_true")
+
+    p = commands.add_parser("simulate")
+    p.add_argument("out")
+    p.add_argument("capture", nargs="?", default=DEFAULT_CAPTURE)
+    p.add_argument("--team")
+    p.add_argument("--seed", type=int, default=1)
+
+    p = commands.add_parser("record")
+    p.add_argument("out")
+    p.add_argument("interval", nargs="?", type=float, default=10.0)
+
+    options = parser.parse_args(argv[1:])
+    if options.command == "serve":
+        serve(options)
+    elif options.command == "simulate":
+        timeline = simulate(load_capture(options.capture), options.team, options.seed)
+        save_timeline(options.out, timeline)
+        print("wrote %d snapshots covering %.0f s to %s" % (len(timeline), timeline[-1][0], options.out))
+    else:
+        record(options.out, options.interval)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,515 @@
+"""
+Full-app simulator that runs code.py under CPython against fake hardware
+=======================================================================================
+
+Runs the unmodified code.py on a virtual clock through a simulated game night:
+
+    display         tools/fake_display (displayio, rgbmatrix, framebufferio, board)
+    network         wifi, socketpool and ssl stand-ins whose sockets talk to an in-process
+                    feed, so adafruit_requests, adafruit_connection_manager and
+                    http_session run for real. cdn.nba.com serves a replay_server.simulate()
+                    game and api.balldontlie.io a schedule with that game on it.
+    control         an adafruit_httpserver stand-in that replays scripted requests
+                    (/on, then /team?name=...) at set times
+    time            time.monotonic, monotonic_ns and sleep run on a virtual clock. The
+                    asyncio loop jumps it straight to its next timer when idle, so hours
+                    pass in minutes; blocking calls (TLS connect, transfer) advance it by
+                    CONNECT_SECS, LATENCY_SECS and BYTES_PER_SEC
+    microcontroller reset() ends the run
+
+Code takes no virtual time to run, so the report's iteration times are host CPU time, not
+board time. They still show which loop iterations are heavy.
+
+Every REPORT_SECS of virtual time it prints the score on the board, frames drawn, display
+refreshes, polls issued, event-loop iteration times and the heap (tracemalloc), and a
+summary at the end. code.py's own output goes to --log.
+
+Usage:
+    python tools/simulator.py [--team BOS] [--hours 3] [--log sim.log] [--png-every MIN]
+
+Author(s): Michael Ladderbush
+"""
+
+import argparse
+import asyncio
+import calendar
+import contextlib
+import errno
+import json
+import math
+import os
+import selectors
+import sys
+import time
+import tracemalloc
+import types
+
+import fake_display
+import replay_server
+
+ROOT = fake_display.ROOT
+CAPTURE = os.path.join(ROOT, "lib", "Notepad.json")
+
+REPORT_SECS = 15 * 60
+CONNECT_SECS = 0.35
+LATENCY_SECS = 0.08
+BYTES_PER_SEC = 250000
+KEEPALIVE_SECS = 60
+
+# Control requests made after boot, in virtual seconds.
+def control_script(team):
+    return [(1.0, "/on", {}), (3.0, "/team", {"name": team})]
+
+
+class simulation_done(Exception):
+    pass
+
+
+class virtual_clock:
+    def __init__(self):
+        self.now_ns = 0
+
+    def monotonic(self):
+        return self.now_ns / 1e9
+
+    def monotonic_ns(self):
+        return self.now_ns
+
+    def sleep(self, secs):
+        self.advance(secs)
+
+    def advance(self, secs):
+        # Rounded up, so a timer waited for is always reached.
+        if secs > 0:
+            self.now_ns += math.ceil(secs * 1e9)
+
+
+# Fixed-bucket histogram of durations in ms.
+class histogram:
+    BOUNDS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        i = 0
+        while i < len(self.BOUNDS) and ms > self.BOUNDS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    # Upper bucket bound below which 'q' of the samples fall.
+    def quantile(self, q):
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= q * self.count:
+                return self.BOUNDS[i] if i < len(self.BOUNDS) else self.max
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return "-"
+        return "mean %.3f ms, p50 <=%g ms, p99 <=%g ms, max %.2f ms" % (
+            self.total / self.count, self.quantile(0.5), self.quantile(0.99), self.max)
+
+
+# Answers HTTP requests from the simulated sockets.
+class feed:
+    def __init__(self, team):
+        capture = replay_server.load_capture(CAPTURE)
+        self.timeline = replay_server.simulate(capture, team)
+        self.player = replay_server.replay(self.timeline)
+        game = next(g for g in capture["scoreboard"]["games"]
+                    if team.upper() in (g["homeTeam"]["teamTricode"], g["awayTeam"]["teamTricode"]))
+        self.game = game
+        self.requests = {}
+
+    def handle(self, host, path, headers):
+        self.requests[host] = self.requests.get(host, 0) + 1
+        if host == "cdn.nba.com":
+            index = self.player.current()
+            etag = '"%d"' % index
+            if headers.get("if-none-match") == etag:
+                return 304, {"ETag": etag}, b""
+            return 200, {"ETag": etag, "Content-Type": "application/json"}, self.player.bodies[index]
+        if host == "api.balldontlie.io":
+            return 200, {"Content-Type": "application/json"}, self.schedule()
+        return 404, {}, b"not found"
+
+    # The simulated game and one two days later, as balldontlie lists them.
+    def schedule(self):
+        import teams
+
+        home = teams.find_team(self.game["homeTeam"]["teamTricode"])
+        away = teams.find_team(self.game["awayTeam"]["teamTricode"])
+        tip_off = self.game["gameTimeUTC"]
+        later = time.strftime("%Y-%m-%dT%H:%M:%S.000Z",
+                              time.gmtime(utc_epoch(tip_off) + 2 * 86400))
+        games = []
+        for when, h, a in ((tip_off.replace("Z", ".000Z"), home, away), (later, away, home)):
+            games.append({"date": when[:10], "datetime": when,
+                          "home_team": {"id": h.bdl_id, "full_name": h.full_name},
+                          "visitor_team": {"id": a.bdl_id, "full_name": a.full_name}})
+        return json.dumps({"data": games, "meta": {}}).encode()
+
+
+# Seconds since the epoch for an ISO UTC time string.
+def utc_epoch(utc_str):
+    return calendar.timegm(time.strptime(utc_str[:19], "%Y-%m-%dT%H:%M:%S"))
+
+
+class sim_socket:
+    def __init__(self, sim):
+        self.sim = sim
+        self.host = None
+        self.out = bytearray()
+        self.pending = bytearray()
+        self.closed = False
+        self.last_used = 0.0
+
+    def settimeout(self, timeout):
+        pass
+
+    def connect(self, address):
+        self.host = address[0]
+        self.sim.stats["connects"] += 1
+        self.sim.clock.advance(CONNECT_SECS)
+        self.last_used = self.sim.clock.monotonic()
+
+    # The server hangs up on connections idle for KEEPALIVE_SECS.
+    def check_idle(self):
+        if self.sim.clock.monotonic() - self.last_used > KEEPALIVE_SECS:
+            self.closed = True
+            self.pending = bytearray()
+
+    def send(self, data):
+        if self.closed:
+            raise OSError(errno.EPIPE, "closed")
+        self.check_idle()
+        self.out += data
+        end = self.out.find(b"\r\n\r\n")
+        if end >= 0 and not self.closed:
+            self.respond(bytes(self.out[:end]).decode())
+            del self.out[:end + 4]
+        return len(data)
+
+    def respond(self, head):
+        lines = head.split("\r\n")
+        method, target, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        status, extra, body = self.sim.feed.handle(self.host, target, headers)
+        self.sim.stats["requests"] += 1
+        reason = {200: "OK", 304: "Not Modified", 404: "Not Found"}.get(status, "")
+        out = ["HTTP/1.1 %d %s" % (status, reason), "Content-Length: %d" % len(body)]
+        out += ["%s: %s" % item for item in extra.items()]
+        self.pending += ("\r\n".join(out) + "\r\n\r\n").encode() + body
+        self.sim.clock.advance(LATENCY_SECS)
+
+    def recv_into(self, buf, nbytes=0):
+        n = min(nbytes or len(buf), len(buf), len(self.pending))
+        if n == 0:
+            if self.closed:
+                return 0
+            raise OSError(errno.ETIMEDOUT, "timed out")
+        buf[:n] = self.pending[:n]
+        del self.pending[:n]
+        self.sim.clock.advance(n / BYTES_PER_SEC)
+        self.last_used = self.sim.clock.monotonic()
+        return n
+
+    def recv(self, n):
+        buf = bytearray(n)
+        got = self.recv_into(buf, n)
+        return bytes(buf[:got])
+
+    def close(self):
+        self.closed = True
+
+
+class sim_selector(selectors.SelectSelector):
+    def __init__(self, sim):
+        super().__init__()
+        self.sim = sim
+
+    # Nothing real is waited on: an idle loop jumps the clock to its next timer.
+    def select(self, timeout=None):
+        sim = self.sim
+        if timeout is None:
+            raise simulation_done("event loop has nothing scheduled")
+        sim.clock.advance(timeout)
+        if not sim.finished and sim.clock.monotonic() >= sim.end_secs:
+            sim.finished = True
+            raise simulation_done("end of the simulated night")
+        return []
+
+
+class sim_loop(asyncio.SelectorEventLoop):
+    def __init__(self, sim):
+        super().__init__(sim_selector(sim))
+        self.sim = sim
+
+    def _run_once(self):
+        start = time.perf_counter()
+        super()._run_once()
+        self.sim.after_iteration((time.perf_counter() - start) * 1000)
+
+
+class sim_policy(asyncio.DefaultEventLoopPolicy):
+    def __init__(self, sim):
+        super().__init__()
+        self.sim = sim
+
+    def new_event_loop(self):
+        return sim_loop(self.sim)
+
+
+class simulation:
+    def __init__(self, options):
+        self.options = options
+        self.clock = virtual_clock()
+        self.end_secs = options.hours * 3600
+        self.finished = False
+        self.stats = {"connects": 0, "requests": 0, "iterations": 0, "refreshes": 0}
+        self.iterations = histogram()
+        self.window = histogram()
+        self.next_report = REPORT_SECS
+        self.reported_at = 0.0
+        self.next_png = options.png_every * 60 if options.png_every else None
+        self.last_writes = 0
+        self.heap_peak = 0
+        self.code = {}
+        self.script = control_script(options.team)
+        self.routes = {}
+
+    # Registers the stand-in modules and patches the time module.
+    def install(self):
+        fake_display.install()
+        time.monotonic = self.clock.monotonic
+        time.monotonic_ns = self.clock.monotonic_ns
+        time.sleep = self.clock.sleep
+        os.environ["TZ"] = "UTC"
+        time.tzset()
+
+        sim = self
+        modules = {}
+
+        def module(name, **attrs):
+            m = types.ModuleType(name)
+            m.__dict__.update(attrs)
+            modules[name] = m
+            return m
+
+        class radio:
+            ipv4_address = "10.0.0.2"
+
+            def connect(self, ssid, password):
+                pass
+
+        module("wifi", radio=radio())
+
+        def reset():
+            raise simulation_done("microcontroller.reset()")
+
+        module("microcontroller", reset=reset)
+        class key_events:
+            def get(self):
+                return None
+
+        class keys:
+            def __init__(self, pins, value_when_pressed=False, pull=True):
+                self.events = key_events()
+
+        module("keypad", Keys=keys)
+        module("digitalio")
+
+        class socket_pool:
+            AF_INET = 2
+            SOCK_STREAM = 1
+            SOCK_DGRAM = 2
+
+            def __init__(self, radio):
+                pass
+
+            def getaddrinfo(self, host, port, family=0, socktype=0, proto=0, flags=0):
+                return [(self.AF_INET, self.SOCK_STREAM, 0, "", (host, port))]
+
+            def socket(self, family=AF_INET, type=SOCK_STREAM, proto=0):
+                return sim_socket(sim)
+
+        module("socketpool", SocketPool=socket_pool)
+
+        class ssl_context:
+            def wrap_socket(self, sock, server_hostname=None):
+                return sock
+
+        module("ssl", create_default_context=ssl_context)
+
+        # The NTP time is the simulated game's tip-off less the pregame, in local time.
+        tip_off = utc_epoch(self.feed.game["gameTimeUTC"])
+
+        class ntp:
+            def __init__(self, pool, tz_offset=0, socket_timeout=10, server=None):
+                self.tz_offset = tz_offset
+
+            @property
+            def datetime(self):
+                now = tip_off - replay_server.PREGAME_SECS + sim.clock.monotonic()
+                return time.gmtime(now + self.tz_offset * 3600)
+
+        module("adafruit_ntp", NTP=ntp)
+
+        class request:
+            def __init__(self, path, params):
+                self.path = path
+                self.query_params = params
+
+        class response:
+            def __init__(self, request, body="", content_type="text/plain", status=None):
+                self.request = request
+                self.body = body
+
+        class server:
+            def __init__(self, pool, root_path=None, debug=False):
+                pass
+
+            def route(self, path, *methods):
+                def register(handler):
+                    sim.routes[path] = handler
+                    return handler
+                return register
+
+            def start(self, host=None, port=80):
+                pass
+
+            # Handles the scripted control requests that are due.
+            def poll(self):
+                while sim.script and sim.script[0][0] <= sim.clock.monotonic():
+                    _, path, params = sim.script.pop(0)
+                    sim.routes[path](request(path, params))
+
+        module("adafruit_httpserver", Server=server, Request=request, Response=response)
+        self.request_type = request
+
+        typing = module("circuitpython_typing")
+        typing.socket = module("circuitpython_typing.socket", CircuitPythonSocketType=object,
+                               InterfaceType=object, SocketpoolModuleType=object, SocketType=object,
+                               SSLContextType=object)
+        sys.modules.update(modules)
+
+        import logo_assets
+
+        logo_assets.LOGO_DIRS = (os.path.join(ROOT, "logos"),)
+
+    def after_iteration(self, ms):
+        self.stats["iterations"] += 1
+        self.iterations.add(ms)
+        self.window.add(ms)
+
+        # auto_refresh: the display recomposites whatever was drawn.
+        writes = fake_display.stats["pixel_writes"]
+        if writes != self.last_writes and "logo_bitmaps" in sys.modules:
+            self.last_writes = writes
+            fake_display.display().refresh()
+            self.stats["refreshes"] += 1
+
+        now = self.clock.monotonic()
+        if self.next_png is not None and now >= self.next_png:
+            path = os.path.join(self.options.png_dir, "sim_%05d.png" % int(now))
+            fake_display.save_png(path)
+            self.next_png += self.options.png_every * 60
+        if now >= self.next_report:
+            self.report(now)
+            self.next_report += REPORT_SECS
+
+    def heap(self):
+        current, peak = tracemalloc.get_traced_memory()
+        self.heap_peak = max(self.heap_peak, peak)
+        return current
+
+    def report(self, now):
+        state = self.code.get("state")
+        board = "-"
+        if state is not None and state.display_home is not None and state.frame is not None:
+            board = "%s %s-%s %s Q%s %s" % (state.team.tricode, state.display_home, state.display_away,
+                                           state.frame.opponent, state.display_period,
+                                           "-" if state.display_secs is None else "%d:%02d" % divmod(state.display_secs, 60))
+        elif state is not None and state.next_game is not None:
+            board = "next: " + " ".join(str(part) for part in state.next_game)
+        scene = self.code.get("board_scene")
+        api = sys.modules.get("API_Connection")
+        print("%5.0f min  %-28s frames %7d  refreshes %7d  polls %4d  connects %3d  loop %s  heap %d KB" % (
+            now / 60, board, scene.frames if scene else 0, self.stats["refreshes"],
+            api.fetch_stats["requests"] if api else 0, self.stats["connects"], self.window.summary(),
+            self.heap() // 1024), file=sys.__stdout__, flush=True)
+        self.window = histogram()
+        self.reported_at = now
+
+    def run(self):
+        self.feed = feed(self.options.team)
+        self.install()
+        # The game starts with the virtual clock.
+        self.feed.player.restart()
+        asyncio.set_event_loop_policy(sim_policy(self))
+        tracemalloc.start()
+        sys.argv = [os.path.join(ROOT, "code.py")]
+        source = open(sys.argv[0]).read()
+        reason = "code.py returned"
+        with open(self.options.log, "w") as log, contextlib.redirect_stdout(log):
+            self.code = {"__name__": "__main__", "__file__": sys.argv[0]}
+            try:
+                exec(compile(source, sys.argv[0], "exec"), self.code)
+            except simulation_done as e:
+                reason = str(e)
+        self.summary(reason)
+
+    def summary(self, reason):
+        now = self.clock.monotonic()
+        if now > self.reported_at:
+            self.report(now)
+        api = sys.modules.get("API_Connection")
+        scene = self.code.get("board_scene")
+        render_stats = self.code.get("render_stats", {})
+        print("", file=sys.__stdout__)
+        print("stopped after %.1f virtual hours: %s" % (now / 3600, reason), file=sys.__stdout__)
+        print("loop iterations:   %d (%s)" % (self.stats["iterations"], self.iterations.summary()), file=sys.__stdout__)
+        print("frames drawn:      %d" % (scene.frames if scene else 0), file=sys.__stdout__)
+        print("display refreshes: %d, %d px composited" % (self.stats["refreshes"], fake_display.stats["refreshed_pixels"]),
+              file=sys.__stdout__)
+        if api is not None:
+            print("scoreboard polls:  %d (%d not modified, %d body bytes)" % (
+                api.fetch_stats["requests"], api.fetch_stats["parses_skipped"], api.fetch_stats["body_bytes"]),
+                file=sys.__stdout__)
+        print("feed requests:     %s, %d connects" % (self.feed.requests, self.stats["connects"]), file=sys.__stdout__)
+        if render_stats:
+            print("max display gap:   %.3f s" % render_stats["max_gap"], file=sys.__stdout__)
+        print("heap:              %d KB now, %d KB peak" % (self.heap() // 1024, self.heap_peak // 1024), file=sys.__stdout__)
+        if "/metrics" in self.routes:
+            served = self.routes["/metrics"](self.request_type("/metrics", {}))
+            for name, stage in json.loads(served.body)["stages"].items():
+                if stage["n"]:
+                    print("/metrics %-11s n %6d  mean %8.0f us  max %8d us" % (
+                        name, stage["n"], stage["sum_us"] / stage["n"], stage["max_us"]), file=sys.__stdout__)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Run code.py on a simulated game night.")
+    parser.add_argument("--team", default="BOS", help="tricode of a team playing in lib/Notepad.json")
+    parser.add_argument("--hours", type=float, default=3.0, help="virtual hours to run")
+    parser.add_argument("--log", default=os.devnull, help="where code.py's output goes")
+    parser.add_argument("--png-every", type=float, default=0, help="save the frame every N virtual minutes")
+    parser.add_argument("--png-dir", default=".")
+    options = parser.parse_args(argv[1:])
+    simulation(options).run()
+
+
+if __name__ == "__main__":
+    main(sys.argv)